@@ -0,0 +1,282 @@
+import datetime
+import os
+from array import array
+from typing import Iterable, Iterator, Sequence
+from candles.types import Candle, RSI, Timeframe
+from candles.utils import dateobj_to_timestamp, timestamp_to_datetime
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.dataset as ds
+except ImportError:
+    pa = pc = ds = None
+
+
+PARTITION_COLUMNS = ("symbol", "timeframe", "date")
+FORMATS = {"parquet": "parquet", "ipc": "arrow"}
+
+# typecodes of the arrow types that can be copied into an array without conversion
+_TYPECODES = {"int64": "q", "double": "d"}
+
+
+def _require_pyarrow():
+    if pa is None:
+        raise ImportError(
+            "Reading and writing archives requires pyarrow. Install it with `pip install candles[arrow]`."
+        )
+
+
+def _partitioning():
+    return ds.partitioning(
+        pa.schema([(name, pa.string()) for name in PARTITION_COLUMNS]),
+        flavor="hive"
+    )
+
+
+def _check_format(format: str):
+    if format not in FORMATS:
+        raise ValueError(f"format must be one of {sorted(FORMATS)}. Received {format}.")
+
+
+def candles_to_table(candles: Iterable[Candle]) -> "pa.Table":
+    """
+    Candles as an arrow table with one column per Candle field except timeframe,
+    which is a partition of the archive.
+    """
+    _require_pyarrow()
+    candles = list(candles)
+    return pa.table({
+        "timestamp": pa.array([candle.timestamp for candle in candles], pa.int64()),
+        "base_timeframe": pa.array([str(candle.base_timeframe) for candle in candles], pa.string()),
+        "complete": pa.array([candle.complete for candle in candles], pa.bool_()),
+        "open": pa.array([candle.open for candle in candles], pa.float64()),
+        "close": pa.array([candle.close for candle in candles], pa.float64()),
+        "high": pa.array([candle.high for candle in candles], pa.float64()),
+        "low": pa.array([candle.low for candle in candles], pa.float64()),
+    })
+
+
+def rsi_to_table(rsis: Iterable[RSI]) -> "pa.Table":
+    """
+    RSI values as an arrow table with one column per RSI field except timeframe.
+    """
+    _require_pyarrow()
+    rsis = list(rsis)
+    return pa.table({
+        "timestamp": pa.array([rsi.timestamp for rsi in rsis], pa.int64()),
+        "base_timeframe": pa.array([str(rsi.base_timeframe) for rsi in rsis], pa.string()),
+        "complete": pa.array([rsi.complete for rsi in rsis], pa.bool_()),
+        "value": pa.array([rsi.value for rsi in rsis], pa.float64()),
+        "price": pa.array([rsi.price for rsi in rsis], pa.float64()),
+        "avg_gain": pa.array([rsi.avg_gain for rsi in rsis], pa.float64()),
+        "avg_loss": pa.array([rsi.avg_loss for rsi in rsis], pa.float64()),
+        "length": pa.array([rsi.length for rsi in rsis], pa.int64()),
+        "max_length": pa.array([rsi.max_length for rsi in rsis], pa.int64()),
+    })
+
+
+def series_to_table(timestamps: Sequence[int], columns: dict[str, Sequence[float]]) -> "pa.Table":
+    """
+    Columns of values aligned with timestamps as an arrow table, e.g. the output of
+    IndicatorKernel.compute.
+    """
+    _require_pyarrow()
+    for name, values in columns.items():
+        if len(values) != len(timestamps):
+            raise ValueError(
+                f"Column {name} has {len(values)} values for {len(timestamps)} timestamps."
+            )
+    return pa.table({
+        "timestamp": pa.array(timestamps, pa.int64()),
+        **{name: pa.array(values, pa.float64()) for name, values in columns.items()}
+    })
+
+
+def write_dataset(
+    table: "pa.Table",
+    root: str,
+    symbol: str,
+    timeframe: Timeframe,
+    format: str = "parquet"
+):
+    """
+    Write a series table into an archive partitioned by symbol, timeframe and UTC date,
+    as root/symbol=<symbol>/timeframe=<timeframe>/date=<YYYY-MM-DD>/<file>.
+
+    Each date partition holds one file. Writing rows into a date that already has rows
+    merges them by timestamp and rewrites the day's file: rows of the table replace
+    archived rows with the same timestamp, e.g. a partial candle sent again at the start
+    of the next live batch, and every other archived row of the day is kept.
+
+    Args:
+        table (pa.Table): A table with an int64 timestamp column, e.g. from candles_to_table.
+        root (str): Root directory of the archive.
+        symbol (str): The symbol of the series.
+        timeframe (Timeframe): The timeframe of the series.
+        format (str): "parquet" or "ipc" (Arrow IPC files).
+    """
+    _require_pyarrow()
+    _check_format(format)
+    if len(table) == 0:
+        return
+    dates = pc.strftime(
+        table["timestamp"].cast(pa.timestamp("ms", tz="UTC")),
+        format="%Y-%m-%d"
+    )
+    table = (
+        table
+        .append_column("symbol", pa.array([str(symbol)] * len(table), pa.string()))
+        .append_column("timeframe", pa.array([str(timeframe)] * len(table), pa.string()))
+        .append_column("date", dates)
+    )
+    archived = _read_partitions(root, symbol, timeframe, pc.unique(dates), format)
+    if archived is not None:
+        kept = archived.filter(pc.invert(pc.is_in(archived["timestamp"], value_set=table["timestamp"])))
+        table = pa.concat_tables(
+            [kept.select([name for name in table.column_names if name in kept.column_names]), table],
+            promote_options="default"
+        ).sort_by("timestamp")
+    ds.write_dataset(
+        table,
+        root,
+        format=format,
+        partitioning=_partitioning(),
+        basename_template=f"part-{{i}}.{FORMATS[format]}",
+        existing_data_behavior="delete_matching"
+    )
+
+
+def _read_partitions(
+    root: str,
+    symbol: str,
+    timeframe: Timeframe,
+    dates: "pa.Array",
+    format: str
+) -> "pa.Table | None":
+    """
+    Every archived row of the given date partitions, or None when there are none.
+    """
+    if not os.path.isdir(root):
+        return None
+    dataset = ds.dataset(root, format=format, partitioning=_partitioning())
+    condition = (
+        (ds.field("symbol") == str(symbol))
+        & (ds.field("timeframe") == str(timeframe))
+        & ds.field("date").isin(dates)
+    )
+    archived = dataset.to_table(filter=condition)
+    return archived if len(archived) else None
+
+
+def read_dataset(
+    root: str,
+    symbol: str,
+    timeframe: Timeframe,
+    start: int | datetime.datetime | str | None = None,
+    end: int | datetime.datetime | str | None = None,
+    columns: Sequence[str] | None = None,
+    format: str = "parquet"
+) -> "pa.Table":
+    """
+    Read a series from an archive written by write_dataset.
+
+    The symbol, timeframe and date range prune whole partitions before any file is
+    opened, the timestamp range is pushed down to parquet row group statistics, and
+    only the requested columns are decoded.
+
+    Args:
+        root (str): Root directory of the archive.
+        symbol (str): The symbol of the series.
+        timeframe (Timeframe): The timeframe of the series.
+        start (int | datetime.datetime | str | None): First timestamp to read, inclusive.
+        end (int | datetime.datetime | str | None): Last timestamp to read, exclusive.
+        columns (Sequence[str] | None): Columns to read, all series columns by default.
+            timestamp is always read.
+        format (str): "parquet" or "ipc".
+
+    Returns:
+        pa.Table: The matching rows, sorted by timestamp.
+    """
+    _require_pyarrow()
+    _check_format(format)
+    dataset = ds.dataset(root, format=format, partitioning=_partitioning())
+    condition = (ds.field("symbol") == str(symbol)) & (ds.field("timeframe") == str(timeframe))
+    if start is not None:
+        start = dateobj_to_timestamp(start)
+        condition &= (ds.field("date") >= _date(start)) & (ds.field("timestamp") >= start)
+    if end is not None:
+        end = dateobj_to_timestamp(end)
+        condition &= (ds.field("date") <= _date(end - 1)) & (ds.field("timestamp") < end)
+    if columns is None:
+        columns = [name for name in dataset.schema.names if name not in PARTITION_COLUMNS]
+    columns = ["timestamp", *(name for name in columns if name != "timestamp")]
+    return dataset.to_table(columns=columns, filter=condition).sort_by("timestamp")
+
+
+def _date(timestamp: int) -> str:
+    return timestamp_to_datetime(timestamp).strftime("%Y-%m-%d")
+
+
+def column_to_array(column: "pa.ChunkedArray") -> array | list:
+    """
+    An arrow column as an array, copying the buffers of int64 and float64 columns
+    directly. Other types are returned as a list.
+    """
+    typecode = _TYPECODES.get(str(column.type))
+    if typecode is None or column.null_count:
+        return column.to_pylist()
+    result = array(typecode)
+    width = result.itemsize
+    for chunk in column.chunks:
+        data = memoryview(chunk.buffers()[1])
+        result.frombytes(data[chunk.offset * width:(chunk.offset + len(chunk)) * width])
+    return result
+
+
+def table_to_columns(table: "pa.Table") -> dict[str, array | list]:
+    return {name: column_to_array(table[name]) for name in table.column_names}
+
+
+def table_to_candles(table: "pa.Table", timeframe: Timeframe) -> Iterator[Candle]:
+    """
+    Candles from a table read with read_dataset. Missing complete and base_timeframe
+    columns default to complete candles of timeframe.
+    """
+    columns = table_to_columns(table)
+    n = len(table)
+    base_timeframes = columns.get("base_timeframe", [timeframe] * n)
+    completes = columns.get("complete", [True] * n)
+    for timestamp, base_timeframe, complete, open, close, high, low in zip(
+        columns["timestamp"], base_timeframes, completes,
+        columns["open"], columns["close"], columns["high"], columns["low"]
+    ):
+        yield Candle(
+            base_timeframe=Timeframe(base_timeframe),
+            timeframe=timeframe,
+            timestamp=timestamp,
+            complete=complete,
+            open=open,
+            close=close,
+            high=high,
+            low=low
+        )
+
+
+def table_to_rsi(table: "pa.Table", timeframe: Timeframe) -> Iterator[RSI]:
+    """
+    RSI values from a table read with read_dataset.
+    """
+    columns = table_to_columns(table)
+    fields = ("value", "price", "avg_gain", "avg_loss", "length", "max_length")
+    n = len(table)
+    base_timeframes = columns.get("base_timeframe", [timeframe] * n)
+    completes = columns.get("complete", [True] * n)
+    for i, timestamp in enumerate(columns["timestamp"]):
+        yield RSI(
+            base_timeframe=Timeframe(base_timeframes[i]),
+            timeframe=timeframe,
+            timestamp=timestamp,
+            complete=completes[i],
+            **{field: columns[field][i] for field in fields if field in columns}
+        )
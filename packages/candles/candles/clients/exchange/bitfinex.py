@@ -1,6 +1,9 @@
 import requests
 from enum import Enum
+from typing import Generator
 from candles.clients.exchange import exchangebase
+from candles.columns import CandleColumns
+from candles.responses import decode_bitfinex_candles
 from candles.types import Timeframe, Candle
 
 
@@ -29,6 +32,11 @@ class Client(exchangebase.Client):
         symbol: Symbol,
         update_method: UpdateMethod = UpdateMethod.hist
     ):
+        if timeframe.is_subminute:
+            raise ValueError(
+                f"Bitfinex serves candles of 1m and longer. Received {timeframe}, "
+                "aggregate trades with candles.trades for shorter timeframes."
+            )
         self.timeframe = timeframe
         self.symbol = symbol
         self.update_method = update_method
@@ -43,21 +51,25 @@ class Client(exchangebase.Client):
             update_method=self.update_method
         )
 
-    def fetch_raw_candles(self, start: int, end: int):
+    def fetch_raw_columns(self, start: int, end: int) -> CandleColumns:
+        """
+        Fetches candlestick data for a specified time range as one columnar batch.
+
+        Args:
+            start (int): The start timestamp in milliseconds.
+            end (int): The end timestamp in milliseconds.
+
+        Returns:
+            CandleColumns: The candles of the response, in one array per field.
+        """
         payload = {
             'start': start,
             'end': end,
             'sort': 1,
             'limit': self.req_limit_per_min,
         }
-        data = requests.get(self.url, params=payload).json()
-        for row in data:
-            yield Candle(
-                base_timeframe=self.timeframe,
-                timeframe=self.timeframe,
-                timestamp=row[0],
-                open=row[1],
-                close=row[2],
-                high=row[3],
-                low=row[4],
-            )
+        response = requests.get(self.url, params=payload)
+        return decode_bitfinex_candles(response.content, self.timeframe)
+
+    def fetch_raw_candles(self, start: int, end: int) -> Generator[Candle, None, None]:
+        yield from self.fetch_raw_columns(start, end).candles()
@@ -0,0 +1,129 @@
+import operator
+from array import array
+from dataclasses import dataclass
+from itertools import accumulate
+from typing import Iterable, Sequence
+from candles.columns import CandleColumns
+from candles.fixed import from_ticks, to_ticks
+from candles.types import Candle, Timeframe
+
+
+# smallest array typecodes first, used to pack integer columns
+_INT_TYPECODES = ("b", "h", "i", "q")
+_TO_BITS = bytes.maketrans(b"\x00\x01", b"01")
+_FROM_BITS = bytes.maketrans(b"01", b"\x00\x01")
+
+
+def _pack(values: Sequence[int]) -> array:
+    """values in the smallest signed integer array that holds them."""
+    lo, hi = (min(values), max(values)) if values else (0, 0)
+    for typecode in _INT_TYPECODES:
+        bits = array(typecode).itemsize * 8
+        if -(1 << (bits - 1)) <= lo and hi < 1 << (bits - 1):
+            return array(typecode, values)
+    raise ValueError(f"Values must fit in 64 bits. Received range [{lo}, {hi}].")
+
+
+@dataclass(frozen=True)
+class EncodedCandles:
+    """
+    A candle series in compact form.
+
+    Timestamps are stored as runs of evenly spaced bars: the index and timestamp where
+    each run starts, so a gap-free series takes a single run. Prices are integer ticks
+    of 10^-decimals: closes as deltas from the previous close, opens as the gap from
+    the previous close, and highs and lows as their distance beyond the body. Each is
+    packed into the smallest integer type that holds it. Complete flags are a bitmap.
+    """
+    timeframe: Timeframe
+    base_timeframe: Timeframe
+    decimals: int
+    count: int
+    run_starts: array
+    run_timestamps: array
+    first_close: int
+    close: array
+    open: array
+    high: array
+    low: array
+    complete: bytes
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the encoded data, excluding fixed object overhead."""
+        arrays = (self.run_starts, self.run_timestamps, self.close, self.open, self.high, self.low)
+        return sum(len(values) * values.itemsize for values in arrays) + len(self.complete)
+
+
+def encode_candles(candles: CandleColumns | Iterable[Candle], decimals: int) -> EncodedCandles:
+    """
+    Encode a candle series, whose prices must lie on the 10^-decimals tick grid.
+
+    Args:
+        candles (CandleColumns | Iterable[Candle]): The candle series.
+        decimals (int): Number of decimal places of the prices.
+
+    Returns:
+        EncodedCandles: The encoded series. decode_candles gives back the exact prices.
+    """
+    if not isinstance(candles, CandleColumns):
+        candles = CandleColumns.from_candles(candles)
+    ticks = {field: list(to_ticks(getattr(candles, field), decimals)) for field in CandleColumns.FIELDS}
+
+    n = len(candles)
+    close, open, high, low = ticks["close"], ticks["open"], ticks["high"], ticks["low"]
+    prev_close = close[:1] + close[:-1]
+    body_high = list(map(max, open, close))
+    body_low = list(map(min, open, close))
+
+    timestamps = candles.timestamps
+    interval = candles.timeframe.ms
+    run_starts = [i for i in range(n) if i == 0 or timestamps[i] - timestamps[i - 1] != interval]
+
+    bits = bytes(array("b", candles.complete)).translate(_TO_BITS)[::-1]
+    return EncodedCandles(
+        timeframe=candles.timeframe,
+        base_timeframe=candles.base_timeframe,
+        decimals=decimals,
+        count=n,
+        run_starts=_pack(run_starts),
+        run_timestamps=array("q", [timestamps[i] for i in run_starts]),
+        first_close=close[0] if n else 0,
+        close=_pack(list(map(operator.sub, close, prev_close))),
+        open=_pack(list(map(operator.sub, open, prev_close))),
+        high=_pack(list(map(operator.sub, high, body_high))),
+        low=_pack(list(map(operator.sub, body_low, low))),
+        complete=int(bits, 2).to_bytes((n + 7) // 8, "little") if n else b""
+    )
+
+
+def decode_candles(encoded: EncodedCandles) -> CandleColumns:
+    """
+    Decode an encoded candle series. Every step runs over whole columns.
+    """
+    n = encoded.count
+    interval = encoded.timeframe.ms
+    timestamps = array("q")
+    bounds = list(encoded.run_starts) + [n]
+    for (begin, end), start in zip(zip(bounds, bounds[1:]), encoded.run_timestamps):
+        timestamps.extend(range(start, start + (end - begin) * interval, interval))
+
+    close = list(accumulate(encoded.close, initial=encoded.first_close))[1:]
+    prev_close = close[:1] + close[:-1]
+    open = list(map(operator.add, prev_close, encoded.open))
+    high = list(map(operator.add, map(max, open, close), encoded.high))
+    low = list(map(operator.sub, map(min, open, close), encoded.low))
+
+    decimals = encoded.decimals
+    prices = {
+        field: from_ticks(ticks, decimals)
+        for field, ticks in (("open", open), ("close", close), ("high", high), ("low", low))
+    }
+    bits = format(int.from_bytes(encoded.complete, "little"), f"0{n}b")[::-1] if n else ""
+    return CandleColumns(
+        encoded.timeframe,
+        timestamps,
+        complete=array("b", bits.encode().translate(_FROM_BITS)),
+        base_timeframe=encoded.base_timeframe,
+        **prices
+    )
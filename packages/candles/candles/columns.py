@@ -0,0 +1,94 @@
+from array import array
+from typing import Iterable, Iterator, Sequence
+from candles.types import Candle, Timeframe
+
+
+class CandleColumns:
+    """
+    A candle series stored column-wise, one array per Candle field, for batch
+    processing without a Candle object per bar. candles() is a view yielding the
+    equivalent Candle objects.
+    """
+
+    FIELDS = ("open", "close", "high", "low")
+
+    def __init__(
+        self,
+        timeframe: Timeframe,
+        timestamps: Sequence[int],
+        open: Sequence[float],
+        close: Sequence[float],
+        high: Sequence[float],
+        low: Sequence[float],
+        complete: Sequence[bool] | None = None,
+        base_timeframe: Timeframe | None = None
+    ):
+        self.timeframe = timeframe
+        self.base_timeframe = timeframe if base_timeframe is None else base_timeframe
+        self.timestamps = timestamps if isinstance(timestamps, array) else array("q", timestamps)
+        self.open = open if isinstance(open, array) else array("d", open)
+        self.close = close if isinstance(close, array) else array("d", close)
+        self.high = high if isinstance(high, array) else array("d", high)
+        self.low = low if isinstance(low, array) else array("d", low)
+        if complete is None:
+            complete = array("b", [1]) * len(self.timestamps)
+        self.complete = complete if isinstance(complete, array) else array("b", complete)
+        for name in (*self.FIELDS, "complete"):
+            if len(getattr(self, name)) != len(self.timestamps):
+                raise ValueError(
+                    f"{name} has {len(getattr(self, name))} values for {len(self.timestamps)} timestamps."
+                )
+
+    @classmethod
+    def from_candles(cls, candles: Iterable[Candle]) -> "CandleColumns":
+        candles = list(candles)
+        if not candles:
+            raise ValueError("Cannot infer the timeframe of an empty candle series.")
+        timeframes = {(candle.timeframe, candle.base_timeframe) for candle in candles}
+        if len(timeframes) > 1:
+            raise ValueError(
+                f"All candles must have the same timeframe and base timeframe. "
+                f"Received {sorted((str(tf), str(base)) for tf, base in timeframes)}."
+            )
+        timeframe, base_timeframe = timeframes.pop()
+        return cls(
+            timeframe,
+            [candle.timestamp for candle in candles],
+            [candle.open for candle in candles],
+            [candle.close for candle in candles],
+            [candle.high for candle in candles],
+            [candle.low for candle in candles],
+            complete=[candle.complete for candle in candles],
+            base_timeframe=base_timeframe
+        )
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, CandleColumns):
+            return NotImplemented
+        return (
+            self.timeframe == other.timeframe
+            and self.base_timeframe == other.base_timeframe
+            and all(
+                getattr(self, name) == getattr(other, name)
+                for name in ("timestamps", *self.FIELDS, "complete")
+            )
+        )
+
+    def candles(self) -> Iterator[Candle]:
+        base_timeframe, timeframe = self.base_timeframe, self.timeframe
+        for timestamp, complete, open, close, high, low in zip(
+            self.timestamps, self.complete, self.open, self.close, self.high, self.low
+        ):
+            yield Candle(
+                base_timeframe=base_timeframe,
+                timeframe=timeframe,
+                timestamp=timestamp,
+                complete=bool(complete),
+                open=open,
+                close=close,
+                high=high,
+                low=low
+            )
@@ -0,0 +1,103 @@
+import math
+import operator
+from array import array
+from itertools import repeat
+from typing import Iterable
+from candles.columns import CandleColumns
+from candles.types import Candle
+
+
+# range of the array('q') ticks are stored in
+_MIN_TICKS = -(1 << 63)
+_MAX_TICKS = (1 << 63) - 1
+
+
+def to_ticks(values: Iterable[float], decimals: int, exact: bool = True) -> array:
+    """
+    Convert values to integer ticks of 10^-decimals over a whole column.
+
+    Args:
+        values (Iterable[float]): Values, on the tick grid unless exact is False.
+        decimals (int): Number of decimal places of the ticks.
+        exact (bool): Require every value to lie on the tick grid. Otherwise values
+            are rounded to the nearest tick.
+
+    Returns:
+        array: The ticks as array('q'). from_ticks gives back the exact values of
+            values on the grid.
+
+    Raises:
+        ValueError: If a value is not finite, its ticks do not fit in 64 bits, or
+            exact is set and it is not on the tick grid.
+    """
+    if decimals < 0:
+        raise ValueError(f"decimals must be at least 0. Received {decimals}.")
+    values = values if isinstance(values, (list, array)) else list(values)
+    scale = 10 ** decimals
+    try:
+        ticks = array("q", map(round, map(operator.mul, values, repeat(scale))))
+    except (ValueError, OverflowError):
+        ticks = None
+    if ticks is None or (exact and list(map(operator.truediv, ticks, repeat(scale))) != list(values)):
+        grid = f" and on the tick grid of {decimals} decimals" if exact else ""
+        raise ValueError(
+            f"Values must be finite, within the 64-bit tick range{grid}. "
+            f"Received {_first_invalid(values, scale, exact)}."
+        )
+    return ticks
+
+
+def _first_invalid(values: Iterable[float], scale: int, exact: bool) -> float:
+    for value in values:
+        if not math.isfinite(value):
+            return value
+        ticks = round(value * scale)
+        if not _MIN_TICKS <= ticks <= _MAX_TICKS or (exact and ticks / scale != value):
+            return value
+    raise AssertionError("to_ticks rejected values that are all valid.")
+
+
+def from_ticks(ticks: Iterable[int], decimals: int) -> array:
+    """
+    Convert integer ticks of 10^-decimals to prices over a whole column, as array('d').
+    """
+    return array("d", map(operator.truediv, ticks, repeat(10 ** decimals)))
+
+
+def to_fixed(candles: CandleColumns, decimals: int) -> CandleColumns:
+    """
+    Candle columns with prices as integer ticks of 10^-decimals.
+
+    Merging and comparing fixed-point candles only uses integer arithmetic, so
+    merge_candles gives exact and reproducible results on them.
+    """
+    return CandleColumns(
+        candles.timeframe,
+        candles.timestamps,
+        complete=candles.complete,
+        base_timeframe=candles.base_timeframe,
+        **{field: to_ticks(getattr(candles, field), decimals) for field in CandleColumns.FIELDS}
+    )
+
+
+def from_fixed(candles: CandleColumns, decimals: int) -> CandleColumns:
+    """
+    Candle columns with fixed-point prices converted back to floats.
+    """
+    return CandleColumns(
+        candles.timeframe,
+        candles.timestamps,
+        complete=candles.complete,
+        base_timeframe=candles.base_timeframe,
+        **{field: from_ticks(getattr(candles, field), decimals) for field in CandleColumns.FIELDS}
+    )
+
+
+def candle_to_fixed(candle: Candle, decimals: int) -> Candle:
+    open, close, high, low = to_ticks((candle.open, candle.close, candle.high, candle.low), decimals)
+    return candle.copy(open=open, close=close, high=high, low=low)
+
+
+def candle_from_fixed(candle: Candle, decimals: int) -> Candle:
+    open, close, high, low = from_ticks((candle.open, candle.close, candle.high, candle.low), decimals)
+    return candle.copy(open=open, close=close, high=high, low=low)
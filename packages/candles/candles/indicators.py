@@ -0,0 +1,412 @@
+import math
+from array import array
+from dataclasses import dataclass
+from typing import Callable, Iterable, Sequence
+from candles.types import Candle
+from candles.operations import rsi_from_averages
+from candles.rolling import RollingSum, RollingVariance, RollingWindow
+
+
+NAN = float("nan")
+
+# slots holding the inputs of every step
+HIGH, LOW, CLOSE = 0, 1, 2
+
+
+class _Op:
+    """
+    One step of an indicator computation. Ops read their inputs from and write their
+    outputs to a shared list of slots, and keep whatever state they need between bars.
+    """
+
+    def step(self, slots: list[float]):
+        raise NotImplementedError
+
+    def preview(self, slots: list[float]):
+        """
+        Write the outputs step would write, without advancing the state. Ops without
+        state just step.
+        """
+        self.step(slots)
+
+
+class _PrevClose(_Op):
+    def __init__(self, out: int):
+        self.out = out
+        self.prev = NAN
+
+    def step(self, slots):
+        slots[self.out] = self.prev
+        self.prev = slots[CLOSE]
+
+    def preview(self, slots):
+        slots[self.out] = self.prev
+
+
+class _Change(_Op):
+    def __init__(self, prev_close: int, out: int):
+        self.prev_close = prev_close
+        self.out = out
+
+    def step(self, slots):
+        slots[self.out] = slots[CLOSE] - slots[self.prev_close]
+
+
+class _TrueRange(_Op):
+    def __init__(self, prev_close: int, out: int):
+        self.prev_close = prev_close
+        self.out = out
+
+    def step(self, slots):
+        high, low, prev_close = slots[HIGH], slots[LOW], slots[self.prev_close]
+        if prev_close != prev_close:
+            slots[self.out] = high - low
+        else:
+            slots[self.out] = max(high - low, abs(high - prev_close), abs(low - prev_close))
+
+
+class _Rolling(_Op):
+    """
+    A rolling statistic of src from candles.rolling, NaN until its window is full.
+    """
+
+    def __init__(self, src: int, statistic: RollingWindow, out: int):
+        self.src = src
+        self.statistic = statistic
+        self.out = out
+
+    def step(self, slots):
+        slots[self.out] = self.statistic.update(slots[self.src])
+
+    def preview(self, slots):
+        slots[self.out] = self.statistic.update(slots[self.src], complete=False)
+
+
+class _Smoothing(_Op):
+    """
+    Exponential smoothing of src with the given alpha, seeded with the mean of its
+    first length values. NaN inputs before the seed are skipped.
+    """
+
+    def __init__(self, src: int, length: int, alpha: float, out: int):
+        self.src = src
+        self.length = length
+        self.alpha = alpha
+        self.out = out
+        self.count = 0
+        self.value = NAN
+
+    def step(self, slots):
+        x = slots[self.src]
+        if self.count < self.length:
+            if x == x:
+                self.count += 1
+                self.value = x if self.count == 1 else self.value + x
+                if self.count == self.length:
+                    self.value /= self.length
+            slots[self.out] = self.value if self.count == self.length else NAN
+        else:
+            self.value += self.alpha * (x - self.value)
+            slots[self.out] = self.value
+
+    def preview(self, slots):
+        x = slots[self.src]
+        if self.count == self.length:
+            slots[self.out] = self.value + self.alpha * (x - self.value)
+        elif x == x and self.count + 1 == self.length:
+            slots[self.out] = (x if self.count == 0 else self.value + x) / self.length
+        else:
+            slots[self.out] = NAN
+
+
+class _RSI(_Op):
+    """
+    RSI with the same smoothing as operations.calculate_rsi: the averaging length grows
+    by one per bar up to max_length. Values are not rounded.
+    """
+
+    def __init__(self, change: int, max_length: int, out: int):
+        self.change = change
+        self.max_length = max_length
+        self.out = out
+        self.length = 0
+        self.avg_gain = 0.0
+        self.avg_loss = 0.0
+        self.value = 0.0
+
+    def _averages(self, change: float) -> tuple[float, float]:
+        length = self.length
+        gain = change if change > 0 else 0
+        loss = -change if change < 0 else 0
+        return (
+            (self.avg_gain * (length - 1) + gain) / length,
+            (self.avg_loss * (length - 1) + loss) / length
+        )
+
+    def step(self, slots):
+        change = slots[self.change]
+        if change == change:
+            self.avg_gain, self.avg_loss = self._averages(change)
+            self.value = rsi_from_averages(self.avg_gain, self.avg_loss)
+        if self.length < self.max_length:
+            self.length += 1
+        slots[self.out] = self.value
+
+    def preview(self, slots):
+        change = slots[self.change]
+        slots[self.out] = rsi_from_averages(*self._averages(change)) if change == change else self.value
+
+
+class _Scale(_Op):
+    def __init__(self, src: int, factor: float, out: int):
+        self.src = src
+        self.factor = factor
+        self.out = out
+
+    def step(self, slots):
+        slots[self.out] = slots[self.src] * self.factor
+
+
+class _Diff(_Op):
+    def __init__(self, a: int, b: int, out: int):
+        self.a = a
+        self.b = b
+        self.out = out
+
+    def step(self, slots):
+        slots[self.out] = slots[self.a] - slots[self.b]
+
+
+class _Bands(_Op):
+    def __init__(self, total: int, variance: int, length: int, k: float, out: tuple[int, int, int]):
+        self.total = total
+        self.variance = variance
+        self.length = length
+        self.k = k
+        self.out = out
+
+    def step(self, slots):
+        middle_slot, upper_slot, lower_slot = self.out
+        mean = slots[self.total] / self.length
+        variance = slots[self.variance]
+        width = self.k * math.sqrt(variance) if variance == variance else NAN
+        slots[middle_slot] = mean
+        slots[upper_slot] = mean + width
+        slots[lower_slot] = mean - width
+
+
+class _Builder:
+    """
+    Collects the ops needed by a set of indicators. Ops are keyed by what they compute,
+    so intermediates shared by several indicators are only computed once per bar.
+    """
+
+    def __init__(self):
+        self.slot_count = 3
+        self.ops: list[_Op] = []
+        self._slots_by_key: dict[tuple, int | tuple[int, ...]] = {}
+
+    def add(self, key: tuple, factory: Callable[..., _Op], outputs: int = 1) -> int | tuple[int, ...]:
+        if key in self._slots_by_key:
+            return self._slots_by_key[key]
+        slots = tuple(range(self.slot_count, self.slot_count + outputs))
+        self.slot_count += outputs
+        out = slots[0] if outputs == 1 else slots
+        self.ops.append(factory(out))
+        self._slots_by_key[key] = out
+        return out
+
+    def prev_close(self) -> int:
+        return self.add(("prev_close",), _PrevClose)
+
+    def change(self) -> int:
+        prev_close = self.prev_close()
+        return self.add(("change",), lambda out: _Change(prev_close, out))
+
+    def true_range(self) -> int:
+        prev_close = self.prev_close()
+        return self.add(("true_range",), lambda out: _TrueRange(prev_close, out))
+
+    def rolling_sum(self, src: int, length: int) -> int:
+        return self.add(("rolling_sum", src, length), lambda out: _Rolling(src, RollingSum(length), out))
+
+    def rolling_variance(self, src: int, length: int) -> int:
+        return self.add(
+            ("rolling_variance", src, length),
+            lambda out: _Rolling(src, RollingVariance(length), out)
+        )
+
+    def ema(self, src: int, length: int) -> int:
+        return self.add(("ema", src, length), lambda out: _Smoothing(src, length, 2 / (length + 1), out))
+
+    def wilder(self, src: int, length: int) -> int:
+        return self.add(("wilder", src, length), lambda out: _Smoothing(src, length, 1 / length, out))
+
+
+@dataclass(frozen=True)
+class SMASpec:
+    """Simple moving average of the close."""
+    length: int = 20
+
+    def build(self, builder: _Builder) -> dict[str, int]:
+        total = builder.rolling_sum(CLOSE, self.length)
+        return {"": builder.add(("sma", self.length), lambda out: _Scale(total, 1 / self.length, out))}
+
+
+@dataclass(frozen=True)
+class EMASpec:
+    """Exponential moving average of the close, seeded with the SMA of its first length closes."""
+    length: int = 20
+
+    def build(self, builder: _Builder) -> dict[str, int]:
+        return {"": builder.ema(CLOSE, self.length)}
+
+
+@dataclass(frozen=True)
+class MACDSpec:
+    """MACD line, its signal line and their difference (histogram)."""
+    fast: int = 12
+    slow: int = 26
+    signal: int = 9
+
+    def build(self, builder: _Builder) -> dict[str, int]:
+        fast = builder.ema(CLOSE, self.fast)
+        slow = builder.ema(CLOSE, self.slow)
+        line = builder.add(("diff", fast, slow), lambda out: _Diff(fast, slow, out))
+        signal = builder.ema(line, self.signal)
+        histogram = builder.add(("diff", line, signal), lambda out: _Diff(line, signal, out))
+        return {"macd": line, "signal": signal, "histogram": histogram}
+
+
+@dataclass(frozen=True)
+class BollingerSpec:
+    """Bollinger bands: SMA of the close plus and minus k population standard deviations."""
+    length: int = 20
+    k: float = 2.0
+
+    def build(self, builder: _Builder) -> dict[str, int]:
+        total = builder.rolling_sum(CLOSE, self.length)
+        variance = builder.rolling_variance(CLOSE, self.length)
+        middle, upper, lower = builder.add(
+            ("bollinger", self.length, self.k),
+            lambda out: _Bands(total, variance, self.length, self.k, out),
+            outputs=3
+        )
+        return {"middle": middle, "upper": upper, "lower": lower}
+
+
+@dataclass(frozen=True)
+class ATRSpec:
+    """Average true range with Wilder smoothing."""
+    length: int = 14
+
+    def build(self, builder: _Builder) -> dict[str, int]:
+        return {"": builder.wilder(builder.true_range(), self.length)}
+
+
+@dataclass(frozen=True)
+class RSISpec:
+    """RSI of the close, matching operations.calculate_rsi without its rounding."""
+    max_length: int = 14
+
+    def build(self, builder: _Builder) -> dict[str, int]:
+        change = builder.change()
+        return {"": builder.add(("rsi", self.max_length), lambda out: _RSI(change, self.max_length, out))}
+
+
+IndicatorSpec = SMASpec | EMASpec | MACDSpec | BollingerSpec | ATRSpec | RSISpec
+
+
+class IndicatorKernel:
+    """
+    Computes a set of indicators over a candle series in a single pass.
+
+    Every bar runs one list of ops shared by all the indicators, so intermediates like
+    price changes, true range, rolling sums and EMAs are computed once no matter how
+    many indicators use them. Outputs are named after the keys of indicators;
+    indicators with several outputs are named "<key>.<output>", e.g. "macd.signal".
+    Values are NaN until an indicator has seen enough bars.
+
+    update is the streaming API and compute the batch API. Both run the same ops and
+    continue from the kernel's current state, so any mix of the two gives the same
+    values as either one alone.
+    """
+
+    def __init__(self, indicators: dict[str, IndicatorSpec]):
+        builder = _Builder()
+        self.indicators = dict(indicators)
+        self._outputs: dict[str, int] = {}
+        for name, spec in self.indicators.items():
+            for output, slot in spec.build(builder).items():
+                self._outputs[f"{name}.{output}" if output else name] = slot
+        self._ops = builder.ops
+        self._slots = [NAN] * builder.slot_count
+
+    @property
+    def outputs(self) -> list[str]:
+        return list(self._outputs)
+
+    def update(self, candle: Candle) -> dict[str, float]:
+        """
+        Advance the indicators by one candle and return their values. Incomplete
+        candles are previewed without advancing the state, the way calculate_rsi
+        treats them.
+        """
+        slots = self._slots
+        slots[HIGH], slots[LOW], slots[CLOSE] = candle.high, candle.low, candle.close
+        if candle.complete:
+            for op in self._ops:
+                op.step(slots)
+        else:
+            for op in self._ops:
+                op.preview(slots)
+        return {name: slots[slot] for name, slot in self._outputs.items()}
+
+    def compute(
+        self,
+        high: Sequence[float],
+        low: Sequence[float],
+        close: Sequence[float]
+    ) -> dict[str, array]:
+        """
+        Advance the indicators over columns of complete bars.
+
+        Args:
+            high (Sequence[float]): High of every bar.
+            low (Sequence[float]): Low of every bar.
+            close (Sequence[float]): Close of every bar.
+
+        Returns:
+            dict[str, array]: One array('d') of values per output, aligned with the bars.
+        """
+        if not len(high) == len(low) == len(close):
+            raise ValueError(
+                f"Columns must have equal lengths. Received high={len(high)}, "
+                f"low={len(low)}, close={len(close)}."
+            )
+        ops = self._ops
+        slots = self._slots
+        outputs = list(self._outputs.items())
+        columns = {name: array("d") for name, _ in outputs}
+        appends = [(columns[name].append, slot) for name, slot in outputs]
+        for bar in zip(high, low, close):
+            slots[HIGH], slots[LOW], slots[CLOSE] = bar
+            for op in ops:
+                op.step(slots)
+            for append, slot in appends:
+                append(slots[slot])
+        return columns
+
+    def compute_candles(self, candles: Iterable[Candle]) -> dict[str, array]:
+        """
+        Batch API over Candle objects, which must be complete.
+        """
+        candles = list(candles)
+        for candle in candles:
+            if not candle.complete:
+                raise ValueError(f"compute_candles requires complete candles. Received {candle}.")
+        return self.compute(
+            [candle.high for candle in candles],
+            [candle.low for candle in candles],
+            [candle.close for candle in candles]
+        )
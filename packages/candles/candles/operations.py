@@ -1,3 +1,5 @@
+from array import array
+from typing import Iterable, Sequence
 from candles.types import Candle, Timeframe, RSI
 from candles.utils import round_down_to_nearest_interval, time_passed_interval_start, morph_prev_base_timeseries_obj
 
@@ -51,6 +53,13 @@ def merge_candles(
     return merged
 
 
+def rsi_from_averages(avg_gain: float, avg_loss: float) -> float:
+    """
+    RSI value for the given average gain and average loss.
+    """
+    return 100 - 100 / (1 + avg_gain / avg_loss if avg_loss != 0 else 1)
+
+
 def calculate_rsi(
     candle: Candle,
     prev_rsi: RSI | None = None
@@ -74,7 +83,7 @@ def calculate_rsi(
         loss = -price_change if price_change < 0 else 0
         avg_gain = (prev_rsi.avg_gain * (prev_rsi.length - 1) + gain) / prev_rsi.length
         avg_loss = (prev_rsi.avg_loss * (prev_rsi.length - 1) + loss) / prev_rsi.length
-        rsi_value = 100 - 100 / (1 + avg_gain / avg_loss if avg_loss != 0 else 1)
+        rsi_value = rsi_from_averages(avg_gain, avg_loss)
  
     if candle.complete:
         rsi = prev_rsi.copy(
@@ -96,3 +105,67 @@ def calculate_rsi(
         )
 
     return rsi
+
+
+def rsi_sweep(close: Sequence[float], lengths: Sequence[int]) -> list[array]:
+    """
+    Compute the RSI of a close series for many max lengths at once.
+
+    Values follow calculate_rsi (unrounded): the averaging length grows by one per bar
+    until it reaches the max length. Gains and losses are computed once for all
+    lengths, and so is the start-up ramp: the first k averages are the same for every
+    max length of at least k, so each length only computes its own steady state.
+
+    Args:
+        close (Sequence[float]): Close of every bar.
+        lengths (Sequence[int]): RSI max lengths, each at least 1.
+
+    Returns:
+        list[array]: One array('d') of RSI values per length, in the order of lengths.
+    """
+    for length in lengths:
+        if length < 1:
+            raise ValueError(f"RSI lengths must be at least 1. Received {length}.")
+    n = len(close)
+    if n == 0:
+        return [array("d") for _ in lengths]
+
+    gains = array("d", [0.0])
+    losses = array("d", [0.0])
+    prev = close[0]
+    for price in close[1:]:
+        change = price - prev
+        gains.append(change if change > 0 else 0)
+        losses.append(-change if change < 0 else 0)
+        prev = price
+
+    longest = min(max(lengths, default=0), n - 1)
+    ramp = array("d", [0.0])
+    ramp_gain = array("d", [0.0])
+    ramp_loss = array("d", [0.0])
+    avg_gain = avg_loss = 0.0
+    for i in range(1, longest + 1):
+        avg_gain = (avg_gain * (i - 1) + gains[i]) / i
+        avg_loss = (avg_loss * (i - 1) + losses[i]) / i
+        ramp_gain.append(avg_gain)
+        ramp_loss.append(avg_loss)
+        ramp.append(rsi_from_averages(avg_gain, avg_loss))
+
+    rows = []
+    for length in lengths:
+        end = min(length, n - 1)
+        row = ramp[:end + 1]
+        avg_gain, avg_loss = ramp_gain[end], ramp_loss[end]
+        for i in range(end + 1, n):
+            avg_gain = (avg_gain * (length - 1) + gains[i]) / length
+            avg_loss = (avg_loss * (length - 1) + losses[i]) / length
+            row.append(rsi_from_averages(avg_gain, avg_loss))
+        rows.append(row)
+    return rows
+
+
+def calculate_rsi_sweep(candles: Iterable[Candle], lengths: Sequence[int]) -> list[array]:
+    """
+    rsi_sweep over the closes of complete candles, a (length x time) result.
+    """
+    return rsi_sweep([candle.close for candle in candles if candle.complete], lengths)
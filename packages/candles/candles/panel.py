@@ -0,0 +1,210 @@
+from array import array
+from typing import Iterable, Iterator, Sequence
+from candles.types import Candle, Timeframe
+from candles.operations import rsi_from_averages
+from candles.utils import round_down_to_nearest_interval
+
+
+NAN = float("nan")
+
+
+class CandlePanel:
+    """
+    OHLC candles of many symbols aligned on one time axis: a symbols x bars matrix per
+    field, stored as one array('d') row per symbol. A symbol without a bar at some
+    timestamp has NaN in every field there.
+
+    Panel operations work on the whole universe at once. Anything that only depends on
+    the time axis, like which bars fall into which merged interval, is computed once
+    for all symbols.
+    """
+
+    FIELDS = ("open", "high", "low", "close")
+
+    def __init__(
+        self,
+        symbols: Sequence[str],
+        timeframe: Timeframe,
+        timestamps: Sequence[int],
+        open: Sequence[Sequence[float]],
+        high: Sequence[Sequence[float]],
+        low: Sequence[Sequence[float]],
+        close: Sequence[Sequence[float]],
+        base_timeframe: Timeframe | None = None,
+        complete: Sequence[bool] | None = None
+    ):
+        self.symbols = list(symbols)
+        self.timeframe = timeframe
+        self.base_timeframe = timeframe if base_timeframe is None else base_timeframe
+        self.timestamps = array("q", timestamps)
+        self.open = [array("d", row) for row in open]
+        self.high = [array("d", row) for row in high]
+        self.low = [array("d", row) for row in low]
+        self.close = [array("d", row) for row in close]
+        self.complete = array("b", [True] * len(self.timestamps) if complete is None else complete)
+        self._index = {symbol: i for i, symbol in enumerate(self.symbols)}
+        for field in self.FIELDS:
+            rows = getattr(self, field)
+            if len(rows) != len(self.symbols) or any(len(row) != len(self.timestamps) for row in rows):
+                raise ValueError(
+                    f"{field} must have one row per symbol and one column per timestamp, "
+                    f"a {len(self.symbols)} x {len(self.timestamps)} matrix."
+                )
+
+    @classmethod
+    def from_series(cls, series: dict[str, Iterable[Candle]]) -> "CandlePanel":
+        """
+        Build a panel from one candle series per symbol. The time axis is the union of
+        all timestamps; symbols without a candle at a timestamp get NaN there.
+        """
+        series = {symbol: list(candles) for symbol, candles in series.items()}
+        timeframes = {candle.timeframe for candles in series.values() for candle in candles}
+        if len(timeframes) > 1:
+            raise ValueError(f"All candles must have the same timeframe. Received {sorted(map(str, timeframes))}.")
+        if not timeframes:
+            raise ValueError("Cannot build a panel without candles.")
+        timeframe = timeframes.pop()
+        timestamps = sorted({candle.timestamp for candles in series.values() for candle in candles})
+        column = {timestamp: i for i, timestamp in enumerate(timestamps)}
+        fields = {field: [] for field in cls.FIELDS}
+        for candles in series.values():
+            rows = {field: array("d", [NAN]) * len(timestamps) for field in cls.FIELDS}
+            for candle in candles:
+                i = column[candle.timestamp]
+                for field in cls.FIELDS:
+                    rows[field][i] = getattr(candle, field)
+            for field in cls.FIELDS:
+                fields[field].append(rows[field])
+        base_timeframe = min(
+            (candle.base_timeframe for candles in series.values() for candle in candles),
+            key=lambda tf: tf.ms
+        )
+        return cls(series.keys(), timeframe, timestamps, base_timeframe=base_timeframe, **fields)
+
+    def row(self, symbol: str) -> int:
+        return self._index[symbol]
+
+    def missing(self, symbol: str) -> array:
+        """Mask of the bars symbol has no candle for."""
+        return array("b", [value != value for value in self.close[self.row(symbol)]])
+
+    def candles(self, symbol: str) -> Iterator[Candle]:
+        """Yield the candles of symbol, skipping missing bars."""
+        i = self.row(symbol)
+        open, high, low, close = self.open[i], self.high[i], self.low[i], self.close[i]
+        for j, timestamp in enumerate(self.timestamps):
+            if close[j] == close[j]:
+                yield Candle(
+                    base_timeframe=self.base_timeframe,
+                    timeframe=self.timeframe,
+                    timestamp=timestamp,
+                    complete=bool(self.complete[j]),
+                    open=open[j],
+                    close=close[j],
+                    high=high[j],
+                    low=low[j]
+                )
+
+
+def merge_panel(panel: CandlePanel, timeframe: Timeframe) -> CandlePanel:
+    """
+    Merge every symbol of a panel into a larger timeframe in one call.
+
+    Each merged bar takes the first open, highest high, lowest low and last close of the
+    bars of its interval that the symbol has, and is NaN if the symbol has none of them.
+    As in merge_candles, a merged bar is stamped with the timestamp of the last bar of
+    its interval in the panel, and is complete when that is the interval's final bar.
+
+    Args:
+        panel (CandlePanel): The panel to merge.
+        timeframe (Timeframe): The target timeframe.
+
+    Returns:
+        CandlePanel: One bar per interval covered by the panel's timestamps.
+    """
+    if timeframe.ms < panel.timeframe.ms:
+        raise ValueError(
+            f"Cannot merge panel with timeframe {panel.timeframe} into smaller timeframe {timeframe}"
+        )
+    # group the time axis once, shared by every symbol
+    starts = []
+    bounds = []
+    for j, timestamp in enumerate(panel.timestamps):
+        start = round_down_to_nearest_interval(timestamp, timeframe.ms)
+        if not starts or starts[-1] != start:
+            starts.append(start)
+            bounds.append(j)
+    bounds.append(len(panel.timestamps))
+    groups = list(zip(bounds, bounds[1:]))
+    timestamps = [panel.timestamps[end - 1] for _, end in groups]
+    complete = [
+        timestamp + panel.timeframe.ms == start + timeframe.ms
+        for timestamp, start in zip(timestamps, starts)
+    ]
+
+    merged = {field: [] for field in CandlePanel.FIELDS}
+    for i in range(len(panel.symbols)):
+        open, high, low, close = panel.open[i], panel.high[i], panel.low[i], panel.close[i]
+        rows = {field: array("d") for field in CandlePanel.FIELDS}
+        for begin, end in groups:
+            present = [j for j in range(begin, end) if close[j] == close[j]]
+            if not present:
+                for row in rows.values():
+                    row.append(NAN)
+                continue
+            rows["open"].append(open[present[0]])
+            rows["high"].append(max(high[j] for j in present))
+            rows["low"].append(min(low[j] for j in present))
+            rows["close"].append(close[present[-1]])
+        for field in CandlePanel.FIELDS:
+            merged[field].append(rows[field])
+
+    return CandlePanel(
+        panel.symbols,
+        timeframe,
+        timestamps,
+        base_timeframe=panel.base_timeframe,
+        complete=complete,
+        **merged
+    )
+
+
+def panel_rsi(panel: CandlePanel, max_length: int = 14) -> list[array]:
+    """
+    RSI of every symbol of a panel, a symbols x bars matrix with the same smoothing as
+    calculate_rsi (unrounded). Missing bars are skipped: their RSI is NaN and the next
+    bar's price change is taken from the symbol's last close.
+
+    Incomplete bars are treated as calculate_rsi treats them: their RSI is computed
+    from the averages of the last complete bar, which they do not advance, so the next
+    bar's price change is taken from the last complete close.
+    """
+    if max_length < 1:
+        raise ValueError(f"RSI lengths must be at least 1. Received {max_length}.")
+    complete = panel.complete
+    result = []
+    for close in panel.close:
+        row = array("d", [NAN]) * len(close)
+        prev_close = NAN
+        length = 0
+        avg_gain = avg_loss = 0.0
+        for j, price in enumerate(close):
+            if price != price:
+                continue
+            if prev_close == prev_close:
+                change = price - prev_close
+                gain = change if change > 0 else 0
+                loss = -change if change < 0 else 0
+                bar_gain = (avg_gain * (length - 1) + gain) / length
+                bar_loss = (avg_loss * (length - 1) + loss) / length
+                row[j] = rsi_from_averages(bar_gain, bar_loss)
+            else:
+                bar_gain, bar_loss = avg_gain, avg_loss
+                row[j] = 0.0
+            if complete[j]:
+                prev_close = price
+                avg_gain, avg_loss = bar_gain, bar_loss
+                if length < max_length:
+                    length += 1
+        result.append(row)
+    return result
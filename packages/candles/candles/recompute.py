@@ -0,0 +1,104 @@
+from bisect import bisect_left
+from typing import Iterable
+from candles.types import Candle, Timeframe, RSI
+from candles.operations import merge_candles, calculate_rsi
+from candles.utils import round_down_to_nearest_interval, validate_candle
+
+
+class CandleChain:
+    """
+    A merge_candles -> calculate_rsi chain over a base candle series that can absorb
+    revisions of past candles without recomputing from scratch.
+
+    Every base candle keeps the merged candle and RSI the chain produced for it. Those
+    outputs double as checkpoints: a merged bar only depends on the base candles of its
+    own interval, so the output just before an interval's first base candle is the
+    state to replay a revision from. A revision therefore replays the revised candle's
+    interval, and then the RSI suffix until it converges back to the stored values.
+    """
+
+    def __init__(self, timeframe: Timeframe, rsi_max_length: int = 14):
+        self.timeframe = timeframe
+        self.rsi_max_length = rsi_max_length
+        self.candles: list[Candle] = []
+        self.merged: list[Candle] = []
+        self.rsi: list[RSI] = []
+        self._timestamps: list[int] = []
+
+    def _initial_rsi(self, merged: Candle) -> RSI:
+        return RSI(
+            base_timeframe=merged.base_timeframe,
+            timeframe=merged.timeframe,
+            timestamp=merged.timestamp - merged.timeframe.ms,
+            max_length=self.rsi_max_length
+        )
+
+    def _step(self, i: int) -> tuple[Candle, RSI]:
+        candle = self.candles[i]
+        merged = merge_candles(candle, self.timeframe, self.merged[i - 1] if i > 0 else None)
+        rsi = calculate_rsi(merged, self.rsi[i - 1] if i > 0 else self._initial_rsi(merged))
+        return merged, rsi
+
+    def append(self, candle: Candle) -> tuple[Candle, RSI]:
+        """
+        Add the next base candle and return its merged candle and RSI.
+        """
+        validate_candle(candle, self.candles[-1] if self.candles else None)
+        self.candles.append(candle)
+        self._timestamps.append(candle.timestamp)
+        merged, rsi = self._step(len(self.candles) - 1)
+        self.merged.append(merged)
+        self.rsi.append(rsi)
+        return merged, rsi
+
+    def extend(self, candles: Iterable[Candle]):
+        for candle in candles:
+            self.append(candle)
+
+    def checkpoint(self, timestamp: int) -> int:
+        """
+        Index of the first base candle of the merged interval containing timestamp,
+        the point a revision at timestamp is replayed from.
+        """
+        start = round_down_to_nearest_interval(timestamp, self.timeframe.ms)
+        return bisect_left(self._timestamps, start)
+
+    def revise(self, candle: Candle) -> range:
+        """
+        Replace the base candle with the same timestamp and recompute what depends on it.
+
+        The merged candles of the revised candle's interval are replayed from its
+        checkpoint. RSI is replayed from the same point and stops as soon as it matches
+        the stored value again after the interval, e.g. right away when only the high or
+        low was revised.
+
+        Args:
+            candle (Candle): The corrected candle.
+
+        Returns:
+            range: Indices of the base candles whose outputs were recomputed.
+        """
+        i = bisect_left(self._timestamps, candle.timestamp)
+        if i == len(self._timestamps) or self._timestamps[i] != candle.timestamp:
+            raise ValueError(f"No candle to revise at timestamp {candle.timestamp}. Received {candle}.")
+        if candle.timeframe != self.candles[i].timeframe or candle.base_timeframe != self.candles[i].base_timeframe:
+            raise ValueError(
+                f"A revision must keep the timeframes of the candle it replaces. "
+                f"Received {candle} for {self.candles[i]}."
+            )
+        self.candles[i] = candle
+        start = self.checkpoint(candle.timestamp)
+        interval_end = self.checkpoint(candle.timestamp + self.timeframe.ms)
+
+        j = start
+        for j in range(start, len(self.candles)):
+            if j < interval_end:
+                merged, rsi = self._step(j)
+                self.merged[j] = merged
+            else:
+                # merged bars after the interval are unaffected, only RSI carries over
+                rsi = calculate_rsi(self.merged[j], self.rsi[j - 1])
+                if rsi == self.rsi[j]:
+                    return range(start, j)
+            self.rsi[j] = rsi
+        return range(start, j + 1)
@@ -0,0 +1,42 @@
+import json
+from array import array
+from candles.columns import CandleColumns
+from candles.types import Timeframe
+
+try:
+    from orjson import loads
+except ImportError:
+    loads = json.loads
+
+
+def decode_bitfinex_candles(body: bytes, timeframe: Timeframe) -> CandleColumns:
+    """
+    Decode a Bitfinex candles response body straight into columns.
+
+    The body is parsed with orjson when it is installed, and its rows of
+    [MTS, OPEN, CLOSE, HIGH, LOW, VOLUME] are transposed into one array per field
+    without building a Candle per row.
+
+    Args:
+        body (bytes): The raw response body.
+        timeframe (Timeframe): The timeframe of the candles.
+
+    Returns:
+        CandleColumns: The decoded candles.
+    Raises:
+        ValueError: If the body is an error response or anything other than a list of rows.
+    """
+    rows = loads(body)
+    if not isinstance(rows, list) or (rows and rows[0] == "error"):
+        raise ValueError(f"Bitfinex returned an error. Received {rows}.")
+    if not rows:
+        return CandleColumns(timeframe, [], [], [], [], [])
+    timestamps, open, close, high, low = list(zip(*rows))[:5]
+    return CandleColumns(
+        timeframe,
+        array("q", timestamps),
+        array("d", open),
+        array("d", close),
+        array("d", high),
+        array("d", low)
+    )
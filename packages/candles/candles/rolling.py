@@ -0,0 +1,252 @@
+import math
+from array import array
+from bisect import bisect_left, insort
+from collections import deque
+from typing import Iterable
+
+
+NAN = float("nan")
+
+
+class RollingWindow:
+    """
+    Base class for statistics over the last window values of a stream.
+
+    update follows the complete/partial bar model of merge_candles: a complete value is
+    committed to the window, a partial one (complete=False) is only previewed, so the
+    statistic is what it would be if the value completed as is, and the next update
+    replaces it. Statistics are NaN until window values are in the window.
+
+    apply is the batch form: it runs update over a whole column of complete values and
+    returns the statistic after each one, so both forms give the same results.
+    """
+
+    def __init__(self, window: int):
+        if window < 1:
+            raise ValueError(f"window must be at least 1. Received {window}.")
+        self.window = window
+        self.count = 0
+
+    def update(self, value: float, complete: bool = True) -> float:
+        if complete:
+            self._push(value)
+            self.count += 1
+            return self.value if self.count >= self.window else NAN
+        if self.count + 1 < self.window:
+            return NAN
+        return self._preview(value)
+
+    def apply(self, values: Iterable[float]) -> array:
+        update = self.update
+        return array("d", [update(value) for value in values])
+
+    @property
+    def value(self) -> float:
+        raise NotImplementedError
+
+    def _push(self, value: float):
+        raise NotImplementedError
+
+    def _preview(self, value: float) -> float:
+        raise NotImplementedError
+
+
+class RollingMax(RollingWindow):
+    """
+    Rolling maximum using a monotonic deque, O(1) amortized per value.
+
+    The deque holds (index, value) pairs with decreasing values, so its front is the
+    maximum of the window and every value is pushed and popped at most once.
+    """
+
+    def __init__(self, window: int):
+        super().__init__(window)
+        self._deque: deque[tuple[int, float]] = deque()
+
+    def _push(self, value):
+        entries = self._deque
+        while entries and entries[-1][1] <= value:
+            entries.pop()
+        entries.append((self.count, value))
+        if entries[0][0] <= self.count - self.window:
+            entries.popleft()
+
+    @property
+    def value(self) -> float:
+        return self._deque[0][1]
+
+    def _preview(self, value):
+        first_kept = self.count + 1 - self.window
+        for index, kept in self._deque:
+            if index >= first_kept:
+                return kept if kept > value else value
+        return value
+
+
+class RollingMin(RollingMax):
+    """
+    Rolling minimum, a RollingMax over negated values.
+    """
+
+    def _push(self, value):
+        super()._push(-value)
+
+    @property
+    def value(self) -> float:
+        return -super().value
+
+    def _preview(self, value):
+        return -super()._preview(-value)
+
+
+class _RingWindow(RollingWindow):
+    """
+    RollingWindow that keeps the values of the window in a ring buffer.
+    """
+
+    def __init__(self, window: int):
+        super().__init__(window)
+        self._ring = array("d", [0.0]) * window
+
+    def _evicted(self) -> float | None:
+        """The value the next push drops from the window, None while it is not full."""
+        return self._ring[self.count % self.window] if self.count >= self.window else None
+
+    def _store(self, value: float):
+        self._ring[self.count % self.window] = value
+
+
+class RollingSum(_RingWindow):
+    """
+    Rolling sum over a ring buffer, O(1) per value. The sum is recomputed exactly each
+    time the ring wraps around to stop rounding drift.
+    """
+
+    def __init__(self, window: int):
+        super().__init__(window)
+        self.total = 0.0
+
+    def _push(self, value):
+        evicted = self._evicted()
+        self.total += value - (evicted or 0.0)
+        self._store(value)
+        if (self.count + 1) % self.window == 0:
+            self.total = math.fsum(self._ring)
+
+    @property
+    def value(self) -> float:
+        return self.total
+
+    def _preview(self, value):
+        return self.total + value - (self._evicted() or 0.0)
+
+
+class RollingMean(RollingSum):
+    @property
+    def value(self) -> float:
+        return self.total / self.window
+
+    def _preview(self, value):
+        return super()._preview(value) / self.window
+
+
+class RollingVariance(_RingWindow):
+    """
+    Rolling mean and variance with a sliding Welford update, O(1) per value and stable
+    for values far from zero. ddof=1 gives the sample variance.
+    """
+
+    def __init__(self, window: int, ddof: int = 0):
+        super().__init__(window)
+        if not 0 <= ddof < window:
+            raise ValueError(f"ddof must be in [0, window). Received {ddof}.")
+        self.ddof = ddof
+        self.mean = 0.0
+        self._m2 = 0.0
+
+    @staticmethod
+    def _slide(n: int, mean: float, m2: float, value: float, evicted: float | None):
+        if evicted is not None and n == 1:
+            mean, m2, n = 0.0, 0.0, 0
+        elif evicted is not None:
+            delta = evicted - mean
+            mean -= delta / (n - 1)
+            m2 -= delta * (evicted - mean)
+            n -= 1
+        n += 1
+        delta = value - mean
+        mean += delta / n
+        m2 += delta * (value - mean)
+        return mean, m2
+
+    def _size(self) -> int:
+        return min(self.count, self.window)
+
+    def _push(self, value):
+        evicted = self._evicted()
+        self.mean, self._m2 = self._slide(self._size(), self.mean, self._m2, value, evicted)
+        self._store(value)
+
+    @property
+    def value(self) -> float:
+        return max(self._m2, 0.0) / (self.window - self.ddof)
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.value) if self.count >= self.window else NAN
+
+    def _preview(self, value):
+        _, m2 = self._slide(self._size(), self.mean, self._m2, value, self._evicted())
+        return max(m2, 0.0) / (self.window - self.ddof)
+
+
+class RollingQuantile(_RingWindow):
+    """
+    Exact rolling quantile, linearly interpolated between the two nearest values.
+
+    This is not a sketch: the window is also kept as a sorted list, so an update is
+    O(window), a binary search plus a block move of up to window values, and reading
+    a quantile is O(1). That is cheap for windows counted in bars. Values must be
+    finite, since NaN cannot be located in the sorted window to evict it.
+    """
+
+    def __init__(self, window: int, q: float = 0.5):
+        super().__init__(window)
+        if not 0 <= q <= 1:
+            raise ValueError(f"q must be in [0, 1]. Received {q}.")
+        self.q = q
+        self._sorted: list[float] = []
+
+    def update(self, value: float, complete: bool = True) -> float:
+        if not math.isfinite(value):
+            raise ValueError(f"RollingQuantile values must be finite. Received {value}.")
+        return super().update(value, complete)
+
+    def _push(self, value):
+        evicted = self._evicted()
+        if evicted is not None:
+            del self._sorted[bisect_left(self._sorted, evicted)]
+        insort(self._sorted, value)
+        self._store(value)
+
+    @property
+    def value(self) -> float:
+        values = self._sorted
+        position = self.q * (len(values) - 1)
+        lower = int(position)
+        if lower == len(values) - 1:
+            return values[lower]
+        return values[lower] + (values[lower + 1] - values[lower]) * (position - lower)
+
+    def _preview(self, value):
+        evicted = self._evicted()
+        values = self._sorted
+        if evicted is not None:
+            del values[bisect_left(values, evicted)]
+        insort(values, value)
+        try:
+            return self.value
+        finally:
+            del values[bisect_left(values, value)]
+            if evicted is not None:
+                insort(values, evicted)
@@ -0,0 +1,348 @@
+import operator
+from array import array
+from bisect import bisect_left
+from dataclasses import dataclass
+from enum import Enum
+from itertools import accumulate
+from typing import Iterator, Sequence
+from candles.types import Candle, Timeframe
+from candles.utils import round_down_to_nearest_interval
+
+
+class BarType(str, Enum):
+    """
+    What an activity bar samples: a fixed number of trades, of traded amount, or of
+    traded notional (price x amount).
+    """
+    TICK = "tick"
+    VOLUME = "volume"
+    DOLLAR = "dollar"
+
+    def __str__(self):
+        return self.value
+
+
+@dataclass(frozen=True, slots=True)
+class TradeBar:
+    """
+    OHLC bar aggregated from trades. Time bars are stamped with the start of their
+    interval, activity bars with the timestamp of their first trade. volume is the
+    traded amount regardless of side.
+    """
+    timestamp: int
+    end_timestamp: int
+    open: float
+    close: float
+    high: float
+    low: float
+    volume: float
+    trades: int
+    complete: bool = True
+
+    def to_candle(self, timeframe: Timeframe) -> Candle:
+        return Candle(
+            base_timeframe=timeframe,
+            timeframe=timeframe,
+            timestamp=self.timestamp,
+            complete=self.complete,
+            open=self.open,
+            close=self.close,
+            high=self.high,
+            low=self.low
+        )
+
+
+class _BarBuilder:
+    """
+    OHLCV state of the bar being built, shared by the streaming aggregators.
+    """
+
+    def __init__(self):
+        self.trades = 0
+
+    def start(self, timestamp: int, price: float, amount: float):
+        self.timestamp = self.end_timestamp = timestamp
+        self.open = self.high = self.low = self.close = price
+        self.volume = abs(amount)
+        self.trades = 1
+
+    def add(self, timestamp: int, price: float, amount: float):
+        self.end_timestamp = timestamp
+        self.close = price
+        if price > self.high:
+            self.high = price
+        if price < self.low:
+            self.low = price
+        self.volume += abs(amount)
+        self.trades += 1
+
+    def bar(self, complete: bool) -> TradeBar:
+        return TradeBar(
+            self.timestamp, self.end_timestamp, self.open, self.close,
+            self.high, self.low, self.volume, self.trades, complete
+        )
+
+
+def _gap_bars(bar: TradeBar, timestamp: int, interval: int) -> Iterator[TradeBar]:
+    """
+    Bars for the intervals without trades between bar and timestamp: flat at the
+    close of bar, with no volume, so merging them never carries the range of an
+    earlier bar into a later interval.
+    """
+    close = bar.close
+    for t in range(bar.timestamp + interval, timestamp, interval):
+        yield TradeBar(t, t, close, close, close, close, 0.0, 0)
+
+
+class TimeBarAggregator:
+    """
+    Streams trades into time bars of a timeframe.
+
+    update returns the bars a trade completes; the bar still forming is available as
+    current, an incomplete bar, so its candle fits the complete/partial model of
+    merge_candles. Intervals without trades get flat bars at the last close.
+    """
+
+    def __init__(self, timeframe: Timeframe):
+        self.timeframe = timeframe
+        self._bar = _BarBuilder()
+
+    @property
+    def current(self) -> TradeBar | None:
+        return self._bar.bar(complete=False) if self._bar.trades else None
+
+    def update(self, timestamp: int, price: float, amount: float) -> list[TradeBar]:
+        bar = self._bar
+        interval = self.timeframe.ms
+        if not bar.trades:
+            bar.start(timestamp, price, amount)
+            bar.timestamp = round_down_to_nearest_interval(timestamp, interval)
+            return []
+        if timestamp < bar.end_timestamp:
+            raise ValueError(
+                f"Trades must be in time order. Received {timestamp} after {bar.end_timestamp}."
+            )
+        if timestamp < bar.timestamp + interval:
+            bar.add(timestamp, price, amount)
+            return []
+        completed = [bar.bar(complete=True)]
+        start = round_down_to_nearest_interval(timestamp, interval)
+        completed.extend(_gap_bars(completed[0], start, interval))
+        bar.start(timestamp, price, amount)
+        bar.timestamp = start
+        return completed
+
+
+class ActivityBarAggregator:
+    """
+    Streams trades into activity bars. A bar completes with the trade that brings its
+    trade count, volume or notional to at least threshold; trades are never split.
+    """
+
+    def __init__(self, bar_type: BarType, threshold: float):
+        if threshold <= 0:
+            raise ValueError(f"threshold must be positive. Received {threshold}.")
+        self.bar_type = bar_type
+        self.threshold = threshold
+        self._bar = _BarBuilder()
+        # measured cumulatively, like the batch path, so both close bars on the same trades
+        self._total = 0.0
+        self._target = threshold
+
+    @property
+    def current(self) -> TradeBar | None:
+        return self._bar.bar(complete=False) if self._bar.trades else None
+
+    def update(self, timestamp: int, price: float, amount: float) -> TradeBar | None:
+        bar = self._bar
+        if not bar.trades:
+            bar.start(timestamp, price, amount)
+        elif timestamp < bar.end_timestamp:
+            raise ValueError(
+                f"Trades must be in time order. Received {timestamp} after {bar.end_timestamp}."
+            )
+        else:
+            bar.add(timestamp, price, amount)
+        if self.bar_type == BarType.TICK:
+            self._total += 1
+        elif self.bar_type == BarType.VOLUME:
+            self._total += abs(amount)
+        else:
+            self._total += price * abs(amount)
+        if self._total < self._target:
+            return None
+        self._target = self._total + self.threshold
+        completed = bar.bar(complete=True)
+        bar.trades = 0
+        return completed
+
+
+class TradeBars:
+    """
+    Columnar bars produced by the batch aggregators, one array per field. The last bar
+    is incomplete since later trades could still belong to it.
+    """
+
+    def __init__(self, timeframe: Timeframe | None = None):
+        self.timeframe = timeframe
+        self.timestamps = array("q")
+        self.end_timestamps = array("q")
+        self.open = array("d")
+        self.close = array("d")
+        self.high = array("d")
+        self.low = array("d")
+        self.volume = array("d")
+        self.trades = array("q")
+        self.complete = array("b")
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def _append(self, bar: TradeBar):
+        self.timestamps.append(bar.timestamp)
+        self.end_timestamps.append(bar.end_timestamp)
+        self.open.append(bar.open)
+        self.close.append(bar.close)
+        self.high.append(bar.high)
+        self.low.append(bar.low)
+        self.volume.append(bar.volume)
+        self.trades.append(bar.trades)
+        self.complete.append(bar.complete)
+
+    def bars(self) -> Iterator[TradeBar]:
+        for row in zip(
+            self.timestamps, self.end_timestamps, self.open, self.close, self.high,
+            self.low, self.volume, self.trades, self.complete
+        ):
+            yield TradeBar(*row[:-1], complete=bool(row[-1]))
+
+    def candles(self) -> Iterator[Candle]:
+        """
+        The bars as candles, ready for merge_candles. Only time bars have a timeframe.
+        """
+        if self.timeframe is None:
+            raise ValueError("Only time bars can be viewed as candles.")
+        for bar in self.bars():
+            yield bar.to_candle(self.timeframe)
+
+
+def _check_trades(timestamps: Sequence[int], prices: Sequence[float], amounts: Sequence[float]):
+    if not len(timestamps) == len(prices) == len(amounts):
+        raise ValueError(
+            f"Columns must have equal lengths. Received timestamps={len(timestamps)}, "
+            f"prices={len(prices)}, amounts={len(amounts)}."
+        )
+    if not all(map(operator.le, timestamps, timestamps[1:])):
+        raise ValueError("Trades must be in time order.")
+
+
+def _slice_bar(
+    timestamps: Sequence[int],
+    prices: Sequence[float],
+    amounts: Sequence[float],
+    begin: int,
+    end: int,
+    timestamp: int,
+    complete: bool
+) -> TradeBar:
+    window = prices[begin:end]
+    return TradeBar(
+        timestamp=timestamp,
+        end_timestamp=timestamps[end - 1],
+        open=window[0],
+        close=window[-1],
+        high=max(window),
+        low=min(window),
+        volume=sum(map(abs, amounts[begin:end])),
+        trades=end - begin,
+        complete=complete
+    )
+
+
+def aggregate_time_bars(
+    timestamps: Sequence[int],
+    prices: Sequence[float],
+    amounts: Sequence[float],
+    timeframe: Timeframe
+) -> TradeBars:
+    """
+    Aggregate columns of trades into time bars, the batch form of TimeBarAggregator.
+
+    Bar boundaries are found by binary search over the timestamps and each bar is
+    reduced with slice-wide min/max/sum, so the Python-level work is per bar rather
+    than per trade.
+
+    Args:
+        timestamps (Sequence[int]): Trade timestamps in ms, in time order.
+        prices (Sequence[float]): Trade prices.
+        amounts (Sequence[float]): Trade amounts, negative for sells.
+        timeframe (Timeframe): The timeframe of the bars.
+
+    Returns:
+        TradeBars: One bar per interval from the first to the last trade.
+    """
+    _check_trades(timestamps, prices, amounts)
+    bars = TradeBars(timeframe)
+    interval = timeframe.ms
+    n = len(timestamps)
+    begin = 0
+    prev = None
+    while begin < n:
+        start = round_down_to_nearest_interval(timestamps[begin], interval)
+        end = bisect_left(timestamps, start + interval, begin)
+        if prev is not None:
+            for gap in _gap_bars(prev, start, interval):
+                bars._append(gap)
+        prev = _slice_bar(timestamps, prices, amounts, begin, end, start, complete=end < n)
+        bars._append(prev)
+        begin = end
+    return bars
+
+
+def aggregate_activity_bars(
+    timestamps: Sequence[int],
+    prices: Sequence[float],
+    amounts: Sequence[float],
+    bar_type: BarType,
+    threshold: float
+) -> TradeBars:
+    """
+    Aggregate columns of trades into activity bars, the batch form of
+    ActivityBarAggregator.
+
+    The running trade count, volume or notional is accumulated once for all trades, and
+    each bar ends at the first trade where it reaches the bar's target, found by binary
+    search.
+
+    Args:
+        timestamps (Sequence[int]): Trade timestamps in ms, in time order.
+        prices (Sequence[float]): Trade prices.
+        amounts (Sequence[float]): Trade amounts, negative for sells.
+        bar_type (BarType): What the bars sample.
+        threshold (float): Trade count, volume or notional per bar.
+
+    Returns:
+        TradeBars: The bars, the last one incomplete if it did not reach threshold.
+    """
+    if threshold <= 0:
+        raise ValueError(f"threshold must be positive. Received {threshold}.")
+    _check_trades(timestamps, prices, amounts)
+    if bar_type == BarType.TICK:
+        totals = array("d", range(1, len(timestamps) + 1))
+    elif bar_type == BarType.VOLUME:
+        totals = array("d", accumulate(map(abs, amounts)))
+    else:
+        totals = array("d", accumulate(map(operator.mul, prices, map(abs, amounts))))
+
+    bars = TradeBars()
+    n = len(timestamps)
+    begin = 0
+    target = threshold
+    while begin < n:
+        end = bisect_left(totals, target, begin) + 1
+        complete = end <= n
+        end = min(end, n)
+        bars._append(_slice_bar(timestamps, prices, amounts, begin, end, timestamps[begin], complete))
+        target = totals[end - 1] + threshold
+        begin = end
+    return bars
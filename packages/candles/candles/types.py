@@ -5,6 +5,7 @@ from typing_extensions import Self
 
 
 class TimeframeUnit(Enum):
+    SECOND = ("s", 1_000)
     MINUTE = ("m", 60_000)
     HOUR = ("h", 3_600_000)
     DAY = ("D", 86_400_000)
@@ -16,6 +17,10 @@ class TimeframeUnit(Enum):
 
 
 class Timeframe(str, Enum):
+    _1s = "1s"
+    _5s = "5s"
+    _15s = "15s"
+    _30s = "30s"
     _1m = "1m"
     _5m = "5m"
     _15m = "15m"
@@ -43,9 +48,17 @@ class Timeframe(str, Enum):
     def ms(self) -> int:
         return self.length * self.unit.ms
     
+    @property
+    def is_subminute(self) -> bool:
+        """Second timeframes, which come from aggregated trades rather than exchange candles."""
+        return self.unit == TimeframeUnit.SECOND
+
     @classmethod
-    def get_min_timeframe(cls) -> 'Timeframe':
-        return min(cls, key=lambda tf: tf.ms)
+    def get_min_timeframe(cls, include_subminute: bool = False) -> 'Timeframe':
+        return min(
+            (tf for tf in cls if include_subminute or not tf.is_subminute),
+            key=lambda tf: tf.ms
+        )
 
 
 @dataclass(frozen=True)
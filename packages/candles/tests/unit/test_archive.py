@@ -0,0 +1,123 @@
+import dataclasses
+from array import array
+import pytest
+from candles.types import Candle, Timeframe
+from candles.operations import calculate_rsi
+
+pa = pytest.importorskip("pyarrow")
+
+from candles.archive import (
+    candles_to_table,
+    read_dataset,
+    rsi_to_table,
+    series_to_table,
+    column_to_array,
+    table_to_candles,
+    table_to_columns,
+    table_to_rsi,
+    write_dataset
+)
+
+
+START = 1750377600000
+DAY = 86_400_000
+
+
+def make_candles(count: int) -> list[Candle]:
+    candles = []
+    for i in range(count):
+        close = 100 + (i * 7919) % 13 - 6
+        candles.append(Candle(
+            base_timeframe=Timeframe._1h,
+            timeframe=Timeframe._1h,
+            timestamp=START + i * Timeframe._1h.ms,
+            complete=i < count - 1,
+            open=close - 1,
+            close=close,
+            high=close + 2,
+            low=close - 3
+        ))
+    return candles
+
+
+@pytest.fixture
+def candles():
+    return make_candles(24 * 5)
+
+
+@pytest.mark.parametrize("format", ["parquet", "ipc"])
+def test_candles_round_trip(tmp_path, candles, format):
+    write_dataset(candles_to_table(candles), str(tmp_path), "BTCUSD", Timeframe._1h, format=format)
+    write_dataset(candles_to_table(candles[:10]), str(tmp_path), "ETHUSD", Timeframe._1h, format=format)
+
+    table = read_dataset(str(tmp_path), "BTCUSD", Timeframe._1h, format=format)
+    assert list(table_to_candles(table, Timeframe._1h)) == candles
+
+
+def test_partitioned_by_symbol_timeframe_and_date(tmp_path, candles):
+    write_dataset(candles_to_table(candles), str(tmp_path), "BTCUSD", Timeframe._1h)
+    dates = sorted(path.name for path in (tmp_path / "symbol=BTCUSD" / "timeframe=1h").iterdir())
+    assert dates == ["date=2025-06-20", "date=2025-06-21", "date=2025-06-22", "date=2025-06-23", "date=2025-06-24"]
+
+
+def test_read_time_range_and_columns(tmp_path, candles):
+    write_dataset(candles_to_table(candles), str(tmp_path), "BTCUSD", Timeframe._1h)
+
+    table = read_dataset(
+        str(tmp_path), "BTCUSD", Timeframe._1h,
+        start=START + DAY + 3 * Timeframe._1h.ms,
+        end=START + 2 * DAY,
+        columns=["close"]
+    )
+    assert table.column_names == ["timestamp", "close"]
+    columns = table_to_columns(table)
+    assert list(columns["timestamp"]) == [candle.timestamp for candle in candles[27:48]]
+    assert list(columns["close"]) == [candle.close for candle in candles[27:48]]
+
+
+def test_rewrite_replaces_rows(tmp_path, candles):
+    for _ in range(2):
+        write_dataset(candles_to_table(candles), str(tmp_path), "BTCUSD", Timeframe._1h)
+    assert len(read_dataset(str(tmp_path), "BTCUSD", Timeframe._1h)) == len(candles)
+
+
+@pytest.mark.parametrize("format", ["parquet", "ipc"])
+def test_overlapping_batches_keep_one_row_per_timestamp(tmp_path, candles, format):
+    # live archiving sends the last, partial candle again at the start of the next batch
+    write_dataset(candles_to_table(candles[:30]), str(tmp_path), "BTCUSD", Timeframe._1h, format=format)
+    closed = dataclasses.replace(candles[29], complete=True, close=candles[29].close + 1)
+    batch = [closed, *candles[30:40]]
+    write_dataset(candles_to_table(batch), str(tmp_path), "BTCUSD", Timeframe._1h, format=format)
+
+    table = read_dataset(str(tmp_path), "BTCUSD", Timeframe._1h, format=format)
+    assert list(table_to_candles(table, Timeframe._1h)) == [*candles[:29], *batch]
+    files = list((tmp_path / "symbol=BTCUSD" / "timeframe=1h" / "date=2025-06-21").iterdir())
+    assert len(files) == 1
+
+
+def test_rsi_and_indicator_series(tmp_path, candles):
+    rsis = []
+    prev_rsi = None
+    for candle in candles:
+        prev_rsi = calculate_rsi(candle, prev_rsi)
+        rsis.append(prev_rsi)
+    write_dataset(rsi_to_table(rsis), str(tmp_path / "rsi"), "BTCUSD", Timeframe._1h)
+    table = read_dataset(str(tmp_path / "rsi"), "BTCUSD", Timeframe._1h)
+    assert list(table_to_rsi(table, Timeframe._1h)) == rsis
+
+    timestamps = [candle.timestamp for candle in candles]
+    sma = [float(i) for i in range(len(candles))]
+    write_dataset(series_to_table(timestamps, {"sma.20": sma}), str(tmp_path / "sma"), "BTCUSD", Timeframe._1h)
+    columns = table_to_columns(read_dataset(str(tmp_path / "sma"), "BTCUSD", Timeframe._1h))
+    assert list(columns["sma.20"]) == sma
+
+
+def test_column_to_array_copies_sliced_chunks():
+    values = pa.array(range(10), pa.int64())
+    column = pa.chunked_array([values.slice(3, 4), values.slice(0, 2), values.slice(9)])
+    assert column_to_array(column) == array("q", [3, 4, 5, 6, 0, 1, 9])
+
+    prices = pa.chunked_array([pa.array([0.5, 1.5, 2.5, 3.5]).slice(1, 2)])
+    assert column_to_array(prices) == array("d", [1.5, 2.5])
+
+    assert column_to_array(pa.chunked_array([pa.array([1, None, 3])])) == [1, None, 3]
@@ -0,0 +1,12 @@
+import pytest
+from candles.clients.exchange.bitfinex import Client, Symbol
+from candles.types import Timeframe
+
+
+def test_client_rejects_subminute_timeframes():
+    with pytest.raises(ValueError, match="1s"):
+        Client(Timeframe._1s, Symbol.BTCUSD)
+
+
+def test_client_accepts_minute_timeframes():
+    assert Client(Timeframe._1m, Symbol.BTCUSD).url.startswith("https://api-pub.bitfinex.com/v2/candles/trade:1m:tBTCUSD/")
@@ -0,0 +1,68 @@
+import pytest
+from candles.codec import decode_candles, encode_candles
+from candles.columns import CandleColumns
+from candles.types import Candle, Timeframe
+
+
+START = 1750377600000
+
+
+def make_candles(count: int, gaps: set[int] = frozenset()) -> list[Candle]:
+    candles = []
+    timestamp = START
+    for i in range(count):
+        close = round(104000 + (i * 7919) % 400 - 200 + 0.1 * (i % 10), 1)
+        candles.append(Candle(
+            base_timeframe=Timeframe._1m,
+            timeframe=Timeframe._1m,
+            timestamp=timestamp,
+            complete=i < count - 1,
+            open=round(close - 3.5, 1),
+            close=close,
+            high=round(close + 12.3, 1),
+            low=round(close - 20.7, 1)
+        ))
+        timestamp += Timeframe._1m.ms * (3 if i in gaps else 1)
+    return candles
+
+
+@pytest.mark.parametrize("gaps", [frozenset(), {0, 17, 18, 250}])
+def test_round_trip(gaps):
+    candles = make_candles(500, gaps)
+    encoded = encode_candles(candles, decimals=1)
+    decoded = decode_candles(encoded)
+    assert decoded == CandleColumns.from_candles(candles)
+    assert list(decoded.candles()) == candles
+    assert len(encoded.run_timestamps) == 1 + len(gaps)
+
+
+def test_encoded_size():
+    candles = make_candles(10_000)
+    encoded = encode_candles(candles, decimals=1)
+    columns = CandleColumns.from_candles(candles)
+    raw = 8 * 5 * len(columns) + len(columns)
+    # timestamps take one run and prices fit in 16 bits
+    assert encoded.nbytes < raw / 3
+    assert encoded.close.typecode == "h"
+
+
+def test_complete_bitmap():
+    candles = make_candles(21)
+    candles[4] = candles[4].copy(complete=False)
+    decoded = decode_candles(encode_candles(candles, decimals=1))
+    assert list(decoded.complete) == [candle.complete for candle in candles]
+
+
+def test_empty_series():
+    columns = CandleColumns(Timeframe._1h, [], [], [], [], [])
+    assert decode_candles(encode_candles(columns, decimals=2)) == columns
+
+
+def test_prices_off_the_tick_grid():
+    candles = make_candles(5)
+    candles[2] = candles[2].copy(close=104000.25)
+    with pytest.raises(ValueError, match="104000.25"):
+        encode_candles(candles, decimals=1)
+    candles[2] = candles[2].copy(close=float("nan"))
+    with pytest.raises(ValueError):
+        encode_candles(candles, decimals=1)
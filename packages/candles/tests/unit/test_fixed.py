@@ -0,0 +1,69 @@
+import pytest
+from candles.columns import CandleColumns
+from candles.fixed import candle_from_fixed, candle_to_fixed, from_fixed, from_ticks, to_fixed, to_ticks
+from candles.operations import merge_candles
+from candles.types import Candle, Timeframe
+
+
+START = 1750377600000
+
+
+def make_candles(count: int) -> list[Candle]:
+    candles = []
+    for i in range(count):
+        close = round(0.1 * ((i * 7919) % 400) + 3.3, 1)
+        candles.append(Candle(
+            base_timeframe=Timeframe._1m,
+            timeframe=Timeframe._1m,
+            timestamp=START + i * Timeframe._1m.ms,
+            open=round(close - 0.7, 1),
+            close=close,
+            high=round(close + 0.3, 1),
+            low=round(close - 1.1, 1)
+        ))
+    return candles
+
+
+def test_ticks_round_trip():
+    prices = [0.1, 0.2, 0.3, 104790.5, 0.0, -2.7]
+    ticks = to_ticks(prices, 1)
+    assert list(ticks) == [1, 2, 3, 1047905, 0, -27]
+    assert list(from_ticks(ticks, 1)) == prices
+
+
+def test_off_grid_prices():
+    with pytest.raises(ValueError, match="0.25"):
+        to_ticks([0.1, 0.25], 1)
+    with pytest.raises(ValueError):
+        to_ticks([float("inf")], 1)
+
+
+def test_out_of_range_ticks():
+    # on the grid, but 1e22 ticks do not fit in 64 bits
+    with pytest.raises(ValueError, match="1e\\+20"):
+        to_ticks([1.0, 1e20], 2)
+    with pytest.raises(ValueError, match="1e\\+20"):
+        to_ticks([1e20], 2, exact=False)
+
+
+def test_rounded_ticks():
+    assert list(to_ticks([0.26, -0.24], 1, exact=False)) == [3, -2]
+
+
+def test_columns_round_trip():
+    columns = CandleColumns.from_candles(make_candles(100))
+    fixed = to_fixed(columns, 1)
+    assert fixed.close.typecode == "q"
+    assert from_fixed(fixed, 1) == columns
+
+
+def test_integer_merge_matches_float_merge():
+    candles = make_candles(60)
+    merged = merged_fixed = None
+    for candle in candles:
+        merged = merge_candles(candle, Timeframe._15m, merged)
+        merged_fixed = merge_candles(candle_to_fixed(candle, 1), Timeframe._15m, merged_fixed)
+        assert all(isinstance(value, int) for value in (
+            merged_fixed.open, merged_fixed.close, merged_fixed.high, merged_fixed.low
+        ))
+        assert candle_from_fixed(merged_fixed, 1) == merged
@@ -0,0 +1,147 @@
+import math
+import pytest
+from candles.indicators import (
+    IndicatorKernel, SMASpec, EMASpec, MACDSpec, BollingerSpec, ATRSpec, RSISpec
+)
+from candles.operations import calculate_rsi
+from candles.types import Candle, Timeframe
+
+
+def make_candles(count: int) -> list[Candle]:
+    candles = []
+    close = 100.0
+    for i in range(count):
+        open = close
+        close = open + ((i * 7919) % 13 - 6) * 0.5
+        candles.append(Candle(
+            base_timeframe=Timeframe._1h,
+            timeframe=Timeframe._1h,
+            timestamp=1750377600000 + i * Timeframe._1h.ms,
+            open=open,
+            close=close,
+            high=max(open, close) + (i % 3),
+            low=min(open, close) - (i % 4)
+        ))
+    return candles
+
+
+CANDLES = make_candles(60)
+
+
+INDICATORS = {
+    "sma": SMASpec(5),
+    "ema": EMASpec(12),
+    "macd": MACDSpec(12, 26, 9),
+    "bb": BollingerSpec(5, 2.0),
+    "atr": ATRSpec(14),
+    "rsi": RSISpec(14),
+}
+
+
+def same(a: float, b: float) -> bool:
+    return (math.isnan(a) and math.isnan(b)) or a == b
+
+
+def test_streaming_matches_batch():
+    streaming = IndicatorKernel(INDICATORS)
+    rows = [streaming.update(candle) for candle in CANDLES]
+
+    batch = IndicatorKernel(INDICATORS).compute_candles(CANDLES)
+
+    for name in streaming.outputs:
+        assert all(same(row[name], value) for row, value in zip(rows, batch[name])), name
+
+
+def test_batch_then_streaming_continues_state():
+    kernel = IndicatorKernel(INDICATORS)
+    kernel.compute_candles(CANDLES[:30])
+    rows = [kernel.update(candle) for candle in CANDLES[30:]]
+
+    batch = IndicatorKernel(INDICATORS).compute_candles(CANDLES)
+
+    assert all(same(row["macd.histogram"], value) for row, value in zip(rows, batch["macd.histogram"][30:]))
+
+
+def test_shared_intermediates_are_computed_once():
+    alone = IndicatorKernel({"macd": MACDSpec(12, 26, 9)})
+    shared = IndicatorKernel({"macd": MACDSpec(12, 26, 9), "ema": EMASpec(12), "slow": EMASpec(26)})
+
+    assert len(shared._ops) == len(alone._ops)
+
+
+def test_rsi_matches_calculate_rsi():
+    values = IndicatorKernel({"rsi": RSISpec(14)}).compute_candles(CANDLES)["rsi"]
+
+    prev_rsi = None
+    for candle, value in zip(CANDLES, values):
+        prev_rsi = calculate_rsi(candle, prev_rsi)
+        assert round(value, 2) == prev_rsi.value
+
+
+def test_moving_averages():
+    close = [float(candle.close) for candle in CANDLES]
+    columns = IndicatorKernel({"sma": SMASpec(5), "ema": EMASpec(5), "bb": BollingerSpec(5, 2.0)}).compute(
+        close, close, close
+    )
+
+    assert math.isnan(columns["sma"][3])
+    assert columns["sma"][10] == pytest.approx(sum(close[6:11]) / 5)
+    assert columns["ema"][4] == pytest.approx(sum(close[:5]) / 5)
+    assert columns["ema"][5] == pytest.approx(columns["ema"][4] + (close[5] - columns["ema"][4]) / 3)
+    window = close[6:11]
+    mean = sum(window) / 5
+    std = math.sqrt(sum((x - mean) ** 2 for x in window) / 5)
+    assert columns["bb.upper"][10] == pytest.approx(mean + 2 * std)
+    assert columns["bb.lower"][10] == pytest.approx(mean - 2 * std)
+
+
+def test_atr_uses_true_range():
+    columns = IndicatorKernel({"atr": ATRSpec(2)}).compute(
+        high=[10, 12, 11], low=[8, 11, 7], close=[9, 11.5, 8]
+    )
+
+    # true ranges 2, 3 (gap from the previous close), 4.5
+    assert math.isnan(columns["atr"][0])
+    assert list(columns["atr"][1:]) == [2.5, 2.5 + (4.5 - 2.5) / 2]
+
+
+def test_incomplete_candle_does_not_advance_state():
+    kernel = IndicatorKernel(INDICATORS)
+    for candle in CANDLES[:-1]:
+        kernel.update(candle)
+    preview = kernel.update(CANDLES[-1].copy(complete=False, close=CANDLES[-1].close + 500))
+    final = kernel.update(CANDLES[-1])
+
+    expected = IndicatorKernel(INDICATORS).compute_candles(CANDLES)
+    assert preview["ema"] != final["ema"]
+    assert final["ema"] == expected["ema"][-1]
+
+
+@pytest.mark.parametrize("count", [1, 5, 13, 30, 60])
+def test_incomplete_candle_previews_completed_values(count):
+    """Test a preview gives what the candle would give if it completed as is"""
+    kernel = IndicatorKernel(INDICATORS)
+    for candle in CANDLES[:count - 1]:
+        kernel.update(candle)
+    revised = CANDLES[count - 1].copy(close=CANDLES[count - 1].close + 3)
+    preview = kernel.update(revised.copy(complete=False))
+
+    expected = IndicatorKernel(INDICATORS).compute_candles([*CANDLES[:count - 1], revised])
+    for name in kernel.outputs:
+        assert same(preview[name], expected[name][-1]), name
+
+
+def test_bollinger_is_stable_at_price_scale():
+    close = [1e9 + (i * 7919) % 13 * 0.01 for i in range(200)]
+    columns = IndicatorKernel({"bb": BollingerSpec(20, 2.0)}).compute(close, close, close)
+
+    window = close[-20:]
+    mean = math.fsum(window) / 20
+    std = math.sqrt(math.fsum((x - mean) ** 2 for x in window) / 20)
+    # E[x^2] - mean^2 cancels to zero here, the bands themselves are rounded to the price scale
+    assert (columns["bb.upper"][-1] - columns["bb.lower"][-1]) / 4 == pytest.approx(std, rel=1e-5)
+
+
+def test_mismatched_columns_raise():
+    with pytest.raises(ValueError, match="equal lengths"):
+        IndicatorKernel({"sma": SMASpec(5)}).compute([1.0], [1.0], [1.0, 2.0])
@@ -0,0 +1,107 @@
+import math
+import pytest
+from candles.operations import calculate_rsi, merge_candles, rsi_sweep
+from candles.panel import CandlePanel, merge_panel, panel_rsi
+from candles.types import Candle, RSI, Timeframe
+
+
+START = 1750377600000
+
+
+def make_candles(count: int, seed: int, skip: set[int] = frozenset()) -> list[Candle]:
+    candles = []
+    for i in range(count):
+        close = 100 + seed + ((i * 7919 + seed) % 11 - 5)
+        if i in skip:
+            continue
+        candles.append(Candle(
+            base_timeframe=Timeframe._5m,
+            timeframe=Timeframe._5m,
+            timestamp=START + i * Timeframe._5m.ms,
+            open=close - 1,
+            close=close,
+            high=close + 2,
+            low=close - 3
+        ))
+    return candles
+
+
+@pytest.fixture
+def panel():
+    return CandlePanel.from_series({
+        "BTCUSD": make_candles(24, 0),
+        "ETHUSD": make_candles(24, 7, skip={3, 4, 5, 13}),
+    })
+
+
+def test_from_series_aligns_and_masks_missing_bars(panel: CandlePanel):
+    assert len(panel.timestamps) == 24
+    assert list(panel.missing("ETHUSD")).count(True) == 4
+    assert math.isnan(panel.close[panel.row("ETHUSD")][3])
+    assert list(panel.candles("ETHUSD")) == make_candles(24, 7, skip={3, 4, 5, 13})
+
+
+def test_merge_panel_matches_merge_candles(panel: CandlePanel):
+    merged = merge_panel(panel, Timeframe._15m)
+
+    prev = None
+    expected = []
+    for candle in make_candles(24, 0):
+        prev = merge_candles(candle, Timeframe._15m, prev)
+        if prev.complete:
+            expected.append(prev)
+    actual = [candle for candle in merged.candles("BTCUSD")]
+    assert [(c.timestamp, c.open, c.high, c.low, c.close) for c in actual] == [
+        (c.timestamp, c.open, c.high, c.low, c.close) for c in expected
+    ]
+    assert all(merged.complete)
+
+
+def test_merge_panel_handles_missing_bars(panel: CandlePanel):
+    merged = merge_panel(panel, Timeframe._15m)
+    eth = merged.row("ETHUSD")
+
+    # bars 3-5 are all missing, bar 13 is missing from the interval of bars 12-14
+    assert math.isnan(merged.close[eth][1])
+    bars = make_candles(24, 7)
+    assert merged.close[eth][4] == bars[14].close
+    assert merged.high[eth][4] == max(bars[12].high, bars[14].high)
+
+
+def test_panel_rsi_skips_missing_bars(panel: CandlePanel):
+    rsi = panel_rsi(panel, 14)
+    eth = panel.row("ETHUSD")
+
+    assert list(rsi[panel.row("BTCUSD")]) == list(rsi_sweep(panel.close[panel.row("BTCUSD")], [14])[0])
+    present = [candle.close for candle in panel.candles("ETHUSD")]
+    assert [value for value in rsi[eth] if not math.isnan(value)] == list(rsi_sweep(present, [14])[0])
+    assert math.isnan(rsi[eth][13])
+
+
+def test_mismatched_rows_raise():
+    with pytest.raises(ValueError, match="matrix"):
+        CandlePanel(["A"], Timeframe._5m, [START], [[1.0]], [[1.0]], [[1.0]], [[1.0, 2.0]])
+
+
+def test_panel_rsi_previews_incomplete_bars():
+    # no symbol has bar 14, the last of its 15m interval, and the last interval only
+    # has its first bar, so both of their merged bars are incomplete
+    merged = merge_panel(CandlePanel.from_series({
+        "BTCUSD": make_candles(22, 0, skip={14}),
+        "ETHUSD": make_candles(22, 7, skip={3, 4, 5, 13, 14}),
+    }), Timeframe._15m)
+    assert [bool(complete) for complete in merged.complete] == [True] * 4 + [False, True, True, False]
+
+    rsi = panel_rsi(merged, 3)
+    for symbol in merged.symbols:
+        row = rsi[merged.row(symbol)]
+        values = [value for value in row if not math.isnan(value)]
+        prev_rsi = None
+        for candle, value in zip(merged.candles(symbol), values, strict=True):
+            prev_rsi = calculate_rsi(candle, prev_rsi or RSI(
+                base_timeframe=candle.base_timeframe,
+                timeframe=candle.timeframe,
+                timestamp=candle.timestamp - candle.timeframe.ms,
+                max_length=3
+            ))
+            assert round(value, 2) == prev_rsi.value
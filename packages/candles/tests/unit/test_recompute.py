@@ -0,0 +1,92 @@
+import pytest
+from candles.operations import merge_candles, calculate_rsi
+from candles.recompute import CandleChain
+from candles.types import Candle, RSI, Timeframe
+
+
+START = 1750377600000
+
+
+def make_candles(count: int) -> list[Candle]:
+    candles = []
+    for i in range(count):
+        close = 100 + (i * 7919) % 13 - 6
+        candles.append(Candle(
+            base_timeframe=Timeframe._15m,
+            timeframe=Timeframe._15m,
+            timestamp=START + i * Timeframe._15m.ms,
+            open=close - 1,
+            close=close,
+            high=close + 2,
+            low=close - 3
+        ))
+    return candles
+
+
+def from_scratch(candles: list[Candle], timeframe: Timeframe) -> tuple[list[Candle], list[RSI]]:
+    merged, rsis = [], []
+    prev_candle = prev_rsi = None
+    for candle in candles:
+        prev_candle = merge_candles(candle, timeframe, prev_candle)
+        prev_rsi = calculate_rsi(prev_candle, prev_rsi)
+        merged.append(prev_candle)
+        rsis.append(prev_rsi)
+    return merged, rsis
+
+
+@pytest.fixture
+def candles():
+    return make_candles(60)
+
+
+def test_append_matches_chained_calls(candles):
+    chain = CandleChain(Timeframe._1h)
+    chain.extend(candles)
+    assert (chain.merged, chain.rsi) == from_scratch(candles, Timeframe._1h)
+
+
+def test_revised_close_replays_interval_and_rsi_suffix(candles):
+    chain = CandleChain(Timeframe._1h)
+    chain.extend(candles)
+    revised = candles[23].copy(close=candles[23].close + 5, high=candles[23].high + 5)
+    recomputed = chain.revise(revised)
+
+    candles[23] = revised
+    assert (chain.merged, chain.rsi) == from_scratch(candles, Timeframe._1h)
+    # replay starts at the checkpoint of the revised candle's hour
+    assert recomputed.start == 20
+    # and continues into the following hours, where the RSI state has changed
+    assert recomputed.stop > 24
+
+
+@pytest.mark.parametrize("revise", [
+    lambda candle: candle.copy(low=candle.low - 10),
+    # the hour's close comes from its last candle
+    lambda candle: candle.copy(close=candle.close + 1),
+])
+def test_revision_that_does_not_touch_rsi_stops_after_interval(candles, revise):
+    chain = CandleChain(Timeframe._1h)
+    chain.extend(candles)
+    revised = revise(candles[33])
+    recomputed = chain.revise(revised)
+
+    candles[33] = revised
+    assert (chain.merged, chain.rsi) == from_scratch(candles, Timeframe._1h)
+    assert recomputed == range(32, 36)
+
+
+def test_revise_last_partial_interval(candles):
+    chain = CandleChain(Timeframe._4h)
+    chain.extend(candles[:50])
+    revised = candles[49].copy(close=candles[49].close - 4)
+    recomputed = chain.revise(revised)
+
+    assert recomputed == range(48, 50)
+    assert chain.rsi[-1] == from_scratch(candles[:49] + [revised], Timeframe._4h)[1][-1]
+
+
+def test_revise_unknown_timestamp(candles):
+    chain = CandleChain(Timeframe._1h)
+    chain.extend(candles[:4])
+    with pytest.raises(ValueError):
+        chain.revise(candles[4])
@@ -0,0 +1,45 @@
+import pytest
+from candles.responses import decode_bitfinex_candles
+from candles.types import Candle, Timeframe
+
+
+BODY = (
+    b"[[1451606400000,429.17,433.98,436.49,426.26,1500.2],"
+    b"[1451692800000,433.89,432.7,435.8,430,2100.75],"
+    b"[1451779200000,432.66,428.39,433.07,421.73,1800]]"
+)
+
+
+def test_decode_bitfinex_candles():
+    columns = decode_bitfinex_candles(BODY, Timeframe._1D)
+
+    assert list(columns.timestamps) == [1451606400000, 1451692800000, 1451779200000]
+    assert list(columns.close) == [433.98, 432.7, 428.39]
+    assert columns.low.typecode == "d"
+    assert list(columns.candles())[1] == Candle(
+        base_timeframe=Timeframe._1D,
+        timeframe=Timeframe._1D,
+        timestamp=1451692800000,
+        open=433.89,
+        close=432.7,
+        high=435.8,
+        low=430,
+        complete=True
+    )
+
+
+def test_decode_empty_response():
+    columns = decode_bitfinex_candles(b"[]", Timeframe._1m)
+    assert len(columns) == 0
+    assert list(columns.candles()) == []
+
+
+def test_decode_error_response():
+    with pytest.raises(ValueError, match="ratelimit"):
+        decode_bitfinex_candles(b'["error",11010,"ratelimit: error"]', Timeframe._1m)
+
+
+@pytest.mark.parametrize("body", [b'{"error": "ERR_RATE_LIMIT"}', b'"Bad Gateway"', b"null"])
+def test_decode_non_list_response(body):
+    with pytest.raises(ValueError, match="Bitfinex returned an error"):
+        decode_bitfinex_candles(body, Timeframe._1m)
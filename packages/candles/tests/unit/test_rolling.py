@@ -0,0 +1,111 @@
+import math
+import statistics
+import pytest
+from candles.rolling import (
+    RollingMax,
+    RollingMean,
+    RollingMin,
+    RollingQuantile,
+    RollingSum,
+    RollingVariance
+)
+
+
+VALUES = [float((i * 7919) % 23 - 11) + 0.25 * (i % 4) for i in range(60)]
+
+
+def quantile(values: list[float], q: float) -> float:
+    values = sorted(values)
+    position = q * (len(values) - 1)
+    lower = int(position)
+    upper = min(lower + 1, len(values) - 1)
+    return values[lower] + (values[upper] - values[lower]) * (position - lower)
+
+
+NAIVE = {
+    "max": (lambda window: RollingMax(window), max),
+    "min": (lambda window: RollingMin(window), min),
+    "sum": (lambda window: RollingSum(window), math.fsum),
+    "mean": (lambda window: RollingMean(window), statistics.fmean),
+    "var": (lambda window: RollingVariance(window), statistics.pvariance),
+    "sample_var": (lambda window: RollingVariance(window, ddof=1), statistics.variance),
+    "median": (lambda window: RollingQuantile(window), statistics.median),
+    "p90": (lambda window: RollingQuantile(window, q=0.9), lambda values: quantile(values, 0.9)),
+}
+
+
+def expected(stat, values: list[float], window: int) -> list[float]:
+    return [
+        stat(values[i + 1 - window:i + 1]) if i + 1 >= window else math.nan
+        for i in range(len(values))
+    ]
+
+
+def assert_close(actual, expected):
+    assert len(actual) == len(expected)
+    for a, e in zip(actual, expected):
+        if math.isnan(e):
+            assert math.isnan(a)
+        else:
+            assert a == pytest.approx(e, abs=1e-9)
+
+
+@pytest.mark.parametrize("name", NAIVE)
+@pytest.mark.parametrize("window", [1, 2, 5, 13])
+def test_apply_matches_naive(name, window):
+    factory, stat = NAIVE[name]
+    if name == "sample_var" and window == 1:
+        return
+    assert_close(factory(window).apply(VALUES), expected(stat, VALUES, window))
+
+
+@pytest.mark.parametrize("name", NAIVE)
+def test_partial_values_are_previewed_without_committing(name):
+    factory, stat = NAIVE[name]
+    window = 5
+    rolling = factory(window)
+    committed = []
+    for value in VALUES:
+        # a forming bar updates a few times before it completes
+        for partial in (value + 3, value - 4):
+            preview = rolling.update(partial, complete=False)
+            assert_close([preview], expected(stat, committed + [partial], window)[-1:])
+        committed.append(value)
+        assert_close([rolling.update(value)], expected(stat, committed, window)[-1:])
+
+
+def test_streaming_matches_batch():
+    streamed = RollingVariance(7)
+    values = [streamed.update(value) for value in VALUES[:20]]
+    values += list(streamed.apply(VALUES[20:]))
+    assert_close(values, list(RollingVariance(7).apply(VALUES)))
+
+
+def test_variance_is_stable_far_from_zero():
+    values = [1e9 + (i % 3) for i in range(100)]
+    rolling = RollingVariance(3)
+    result = rolling.apply(values)
+    assert result[-1] == pytest.approx(2 / 3, rel=1e-6)
+    assert rolling.std == pytest.approx(math.sqrt(2 / 3), rel=1e-6)
+
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError):
+        RollingMax(0)
+    with pytest.raises(ValueError):
+        RollingVariance(3, ddof=3)
+    with pytest.raises(ValueError):
+        RollingQuantile(3, q=1.5)
+
+
+@pytest.mark.parametrize("value", [math.nan, math.inf])
+def test_quantile_rejects_non_finite_values(value):
+    rolling = RollingQuantile(3)
+    rolling.apply([1.0, 2.0, 3.0])
+
+    with pytest.raises(ValueError, match="finite"):
+        rolling.update(value)
+    with pytest.raises(ValueError, match="finite"):
+        rolling.update(value, complete=False)
+    # the window is unchanged, so later values still evict the right elements
+    assert list(rolling.apply([4.0, 5.0, 6.0])) == [3.0, 4.0, 5.0]
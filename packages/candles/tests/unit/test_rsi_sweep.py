@@ -0,0 +1,47 @@
+import pytest
+from candles.indicators import IndicatorKernel, RSISpec
+from candles.operations import calculate_rsi, calculate_rsi_sweep, rsi_sweep
+from candles.types import Candle, Timeframe, RSI
+
+
+CLOSE = [100 + ((i * 7919) % 17 - 8) * 0.75 + i * 0.1 for i in range(80)]
+
+
+def test_sweep_matches_single_length_rsi():
+    lengths = [2, 14, 5, 50, 100]
+    rows = rsi_sweep(CLOSE, lengths)
+
+    assert [len(row) for row in rows] == [len(CLOSE)] * len(lengths)
+    for length, row in zip(lengths, rows):
+        expected = IndicatorKernel({"rsi": RSISpec(length)}).compute(CLOSE, CLOSE, CLOSE)["rsi"]
+        assert row == expected
+
+
+def test_candle_sweep_matches_calculate_rsi():
+    candles = [
+        Candle(
+            base_timeframe=Timeframe._1h,
+            timeframe=Timeframe._1h,
+            timestamp=1750377600000 + i * Timeframe._1h.ms,
+            close=close
+        )
+        for i, close in enumerate(CLOSE)
+    ]
+    rows = calculate_rsi_sweep(candles, [3, 14])
+
+    for length, row in zip([3, 14], rows):
+        prev_rsi = RSI(
+            base_timeframe=Timeframe._1h,
+            timeframe=Timeframe._1h,
+            timestamp=candles[0].timestamp - Timeframe._1h.ms,
+            max_length=length
+        )
+        for candle, value in zip(candles, row):
+            prev_rsi = calculate_rsi(candle, prev_rsi)
+            assert round(value, 2) == prev_rsi.value
+
+
+def test_empty_series_and_invalid_length():
+    assert [list(row) for row in rsi_sweep([], [14, 20])] == [[], []]
+    with pytest.raises(ValueError, match="at least 1"):
+        rsi_sweep(CLOSE, [0])
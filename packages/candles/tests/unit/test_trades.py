@@ -0,0 +1,129 @@
+import pytest
+from candles.operations import merge_candles
+from candles.trades import (
+    ActivityBarAggregator,
+    BarType,
+    TimeBarAggregator,
+    aggregate_activity_bars,
+    aggregate_time_bars
+)
+from candles.types import Timeframe
+
+
+START = 1750377600000
+
+
+def make_trades(count: int) -> tuple[list[int], list[float], list[float]]:
+    timestamps, prices, amounts = [], [], []
+    t = START
+    for i in range(count):
+        # mostly sub-second spacing, with an occasional pause longer than a minute
+        t += 90_000 if i % 97 == 96 else (i * 7919) % 1500
+        timestamps.append(t)
+        prices.append(100 + (i * 31) % 17 - 8 + 0.5 * (i % 3))
+        amounts.append(((i * 13) % 9 - 4) * 0.25 or 0.1)
+    return timestamps, prices, amounts
+
+
+def stream_time_bars(trades, timeframe):
+    aggregator = TimeBarAggregator(timeframe)
+    bars = []
+    for trade in zip(*trades):
+        bars.extend(aggregator.update(*trade))
+    return bars + [aggregator.current]
+
+
+def stream_activity_bars(trades, bar_type, threshold):
+    aggregator = ActivityBarAggregator(bar_type, threshold)
+    bars = [aggregator.update(*trade) for trade in zip(*trades)]
+    bars = [bar for bar in bars if bar is not None]
+    return bars + ([aggregator.current] if aggregator.current else [])
+
+
+@pytest.mark.parametrize("timeframe", [Timeframe._5s, Timeframe._1m])
+def test_time_bars_batch_matches_streaming(timeframe):
+    trades = make_trades(2000)
+    bars = aggregate_time_bars(*trades, timeframe)
+    assert list(bars.bars()) == stream_time_bars(trades, timeframe)
+    assert sum(bars.trades) == 2000
+    assert list(bars.complete) == [True] * (len(bars) - 1) + [False]
+
+
+def test_time_bars_are_ohlc_of_their_interval():
+    timestamps, prices, amounts = make_trades(500)
+    bars = aggregate_time_bars(timestamps, prices, amounts, Timeframe._1m)
+    for bar in bars.bars():
+        inside = [
+            (price, amount) for t, price, amount in zip(timestamps, prices, amounts)
+            if bar.timestamp <= t < bar.timestamp + Timeframe._1m.ms
+        ]
+        if not inside:
+            # intervals without trades are flat at the last close
+            assert bar.trades == 0 and bar.volume == 0
+            assert bar.open == bar.high == bar.low == bar.close == last_close
+            continue
+        assert bar.open == inside[0][0]
+        assert bar.close == inside[-1][0]
+        assert bar.high == max(price for price, _ in inside)
+        assert bar.low == min(price for price, _ in inside)
+        assert bar.volume == pytest.approx(sum(abs(amount) for _, amount in inside))
+        last_close = bar.close
+
+
+@pytest.mark.parametrize("bar_type, threshold", [
+    (BarType.TICK, 50),
+    (BarType.VOLUME, 25.0),
+    (BarType.DOLLAR, 2500.0),
+])
+def test_activity_bars_batch_matches_streaming(bar_type, threshold):
+    trades = make_trades(2000)
+    bars = aggregate_activity_bars(*trades, bar_type, threshold)
+    assert list(bars.bars()) == stream_activity_bars(trades, bar_type, threshold)
+    assert sum(bars.trades) == 2000
+    if bar_type == BarType.TICK:
+        assert set(bars.trades[:-1]) == {50}
+
+
+def test_time_bars_feed_merge_candles():
+    trades = make_trades(20000)
+    minutes = aggregate_time_bars(*trades, Timeframe._1m)
+    direct = {candle.timestamp: candle for candle in aggregate_time_bars(*trades, Timeframe._5m).candles()}
+
+    compared = 0
+    prev_candle = None
+    for candle, count in zip(minutes.candles(), minutes.trades):
+        prev_candle = merge_candles(candle, Timeframe._5m, prev_candle)
+        if candle.timestamp % Timeframe._5m.ms == 0:
+            traded = True
+        traded = traded and count > 0
+        if prev_candle.complete and traded:
+            # merged candles are stamped with their last base candle
+            expected = direct[prev_candle.timestamp + Timeframe._1m.ms - Timeframe._5m.ms]
+            assert (prev_candle.open, prev_candle.close, prev_candle.high, prev_candle.low) == (
+                expected.open, expected.close, expected.high, expected.low
+            )
+            compared += 1
+    assert compared > 10
+
+
+def test_activity_bars_have_no_candle_view():
+    bars = aggregate_activity_bars(*make_trades(10), BarType.TICK, 3)
+    with pytest.raises(ValueError):
+        list(bars.candles())
+
+
+def test_trades_out_of_order():
+    timestamps, prices, amounts = make_trades(10)
+    timestamps[5] = START
+    with pytest.raises(ValueError):
+        aggregate_time_bars(timestamps, prices, amounts, Timeframe._1m)
+    aggregator = TimeBarAggregator(Timeframe._1m)
+    aggregator.update(START + 10, 1.0, 1.0)
+    with pytest.raises(ValueError):
+        aggregator.update(START, 1.0, 1.0)
+
+
+def test_min_timeframe_excludes_subminute():
+    assert Timeframe.get_min_timeframe() == Timeframe._1m
+    assert Timeframe.get_min_timeframe(include_subminute=True) == Timeframe._1s
+    assert Timeframe._30s.is_subminute and not Timeframe._1m.is_subminute
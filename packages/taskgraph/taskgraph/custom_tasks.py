@@ -1,7 +1,8 @@
 import itertools
 from typing import List
 from taskgraph.task import TaskNode, SourceNode
-from taskgraph.decorators import task
+from taskgraph.decorators import task, source
+from taskgraph.replay import replay
 
 # Note: expand_task is less relevant in the new model since sources 
 # naturally distribute to multiple downstream tasks
@@ -17,3 +18,8 @@ def expand_task(task_node: TaskNode, n: int) -> List[TaskNode]:
         "expand_task is deprecated in the new source/task model. "
         "Create multiple task nodes that depend on the same upstream node instead."
     )
+
+
+# Source that replays columnar history (optionally paced) and then continues with a live stream.
+# See taskgraph.replay.replay for the accepted arguments.
+replay_source = source(replay)
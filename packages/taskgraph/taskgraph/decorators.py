@@ -16,7 +16,8 @@ def graph(
     *,
     on_execute_end: Union[Callable[[Graph], None], List[Callable[[Graph], None]]] = None,
     graph_state: dict = None,
-    global_state: dict = None
+    global_state: dict = None,
+    optimize: bool = False
 ) -> Callable[[Callable[P, R]], Callable[P, Graph]]: ...
 
 def graph(
@@ -24,7 +25,8 @@ def graph(
     *,
     on_execute_end: Union[Callable, List[Callable]] = None,
     graph_state: dict = None,
-    global_state: dict = None
+    global_state: dict = None,
+    optimize: bool = False
 ):
     """
     Decorator for graph functions with optional parameters.
@@ -38,6 +40,9 @@ def graph(
         
         @graph(on_execute_end=[hook1, hook2])
         def my_graph(): ...
+
+        @graph(optimize=True)  # build fused execution plans, see Graph.optimize
+        def my_graph(): ...
     """
     def decorator(func: Callable) -> Callable[..., Graph]:
         @functools.wraps(func)
@@ -63,6 +68,8 @@ def graph(
                 func(**kwargs)
             finally:
                 GraphContext.pop()
+            if optimize:
+                g.optimize()
             return g
         return wrapper
     
@@ -94,29 +101,48 @@ def source(fn: Callable[P, R]) -> Callable[P, SourceNode]:
     return wrapper
 
 
-def task(fn: Callable[P, R]) -> Callable[P, TaskNode]:
+@overload
+def task(fn: Callable[P, R]) -> Callable[P, TaskNode]: ...
+
+@overload
+def task(*, pure: bool = False) -> Callable[[Callable[P, R]], Callable[P, TaskNode]]: ...
+
+def task(fn: Callable = None, *, pure: bool = False):
     """
     Decorator for task functions that process individual items.
     Task functions receive single values and return single values.
+
+    Usage:
+        @task
+        def my_task(value): ...
+
+        @task(pure=True)  # no side effects, may be pruned by Graph.optimize when unused
+        def my_task(value): ...
     """
-    @functools.wraps(fn)
-    def wrapper(**kwargs: P.kwargs):
-        current_graph = GraphContext.current()
+    def decorator(func: Callable) -> Callable[..., TaskNode]:
+        @functools.wraps(func)
+        def wrapper(**kwargs):
+            current_graph = GraphContext.current()
 
-        task_id = kwargs.pop("task_id", None)
-        if task_id is None:
-            raise NoTaskIdError(f"Task '{fn.__name__}' requires a 'task_id' argument.")
-        if task_id in [node.task_id for node in current_graph.nodes]:
-            raise DuplicateTaskIdError(f"Duplicate task_id '{task_id}' detected in graph '{current_graph.name}'")
-        
-        name = fn.__name__
-        node = TaskNode(name=name, fn=fn, kwargs=kwargs, task_id=task_id)
-        current_graph.add_node(node)
+            task_id = kwargs.pop("task_id", None)
+            if task_id is None:
+                raise NoTaskIdError(f"Task '{func.__name__}' requires a 'task_id' argument.")
+            if task_id in [node.task_id for node in current_graph.nodes]:
+                raise DuplicateTaskIdError(f"Duplicate task_id '{task_id}' detected in graph '{current_graph.name}'")
+            
+            name = func.__name__
+            node = TaskNode(name=name, fn=func, kwargs=kwargs, task_id=task_id, pure=pure)
+            current_graph.add_node(node)
 
-        # Build dependency relationships
-        for val in kwargs.values():
-            if isinstance(val, (TaskNode, SourceNode)):
-                node.set_upstream(val)
+            # Build dependency relationships
+            for val in kwargs.values():
+                if isinstance(val, (TaskNode, SourceNode)):
+                    node.set_upstream(val)
 
-        return node
-    return wrapper
+            return node
+        return wrapper
+
+    if fn is None:
+        return decorator  # called as @task(...)
+    else:
+        return decorator(fn)  # called as @task
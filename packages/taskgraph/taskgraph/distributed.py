@@ -0,0 +1,266 @@
+import pickle
+import multiprocessing
+import traceback
+from abc import abstractmethod
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Any, Callable, Iterable, List
+from taskgraph.graph import Graph
+
+
+# Out-of-band buffers below this size are cheaper to send inline with the pickle stream
+SHARED_MEMORY_MIN_BYTES = 1 << 20
+
+
+class SerializedValue:
+    """
+    A value pickled with protocol 5. Large out-of-band buffers (objects that reduce to
+    pickle.PickleBuffer, e.g. numpy arrays) are moved into shared
+    memory blocks so only their names cross the process boundary.
+    """
+
+    def __init__(self, data: bytes, buffers: List[bytes | tuple[str, int]]):
+        self.data = data
+        self.buffers = buffers
+
+
+def dumps(obj: Any, min_shared_bytes: int = SHARED_MEMORY_MIN_BYTES) -> SerializedValue:
+    raw_buffers: List[pickle.PickleBuffer] = []
+    data = pickle.dumps(obj, protocol=5, buffer_callback=raw_buffers.append)
+    value = SerializedValue(data, [])
+    try:
+        for buffer in raw_buffers:
+            view = buffer.raw()
+            if view.nbytes < min_shared_bytes:
+                value.buffers.append(bytes(view))
+                continue
+            block = shared_memory.SharedMemory(create=True, size=view.nbytes)
+            value.buffers.append((block.name, view.nbytes))
+            block.buf[:view.nbytes] = view
+            block.close()
+    except BaseException:
+        release(value)
+        raise
+    return value
+
+
+def loads(value: SerializedValue) -> Any:
+    """
+    Rebuild a value produced by dumps. Shared memory blocks are copied out and
+    unlinked, so each SerializedValue can only be loaded once.
+    """
+    buffers = []
+    for buffer in value.buffers:
+        if isinstance(buffer, bytes):
+            buffers.append(buffer)
+            continue
+        name, size = buffer
+        block = shared_memory.SharedMemory(name=name)
+        try:
+            buffers.append(bytearray(block.buf[:size]))
+        finally:
+            block.close()
+            block.unlink()
+    return pickle.loads(value.data, buffers=buffers)
+
+
+def release(value: SerializedValue):
+    """
+    Unlink the shared memory blocks of a value that will not be loaded. Blocks that
+    were already loaded, and so unlinked, are skipped.
+    """
+    for buffer in value.buffers:
+        if isinstance(buffer, bytes):
+            continue
+        try:
+            block = shared_memory.SharedMemory(name=buffer[0])
+        except FileNotFoundError:
+            continue
+        block.close()
+        block.unlink()
+
+
+class Transport:
+    """
+    Moves serialized work items to workers and results back. Subclass this to
+    run partitions somewhere other than local processes (e.g. behind a broker).
+    """
+
+    @abstractmethod
+    def map(self, fn: Callable[[SerializedValue], SerializedValue], payloads: List[SerializedValue]) -> Iterable[SerializedValue]:
+        """
+        Apply fn to each payload on a worker, yielding results in payload order.
+        fn is a module level function so it can be referenced by name on the worker.
+        """
+        raise NotImplementedError(f"{self.map.__name__} is not implemented.")
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class LocalTransport(Transport):
+    """
+    Runs work items on a pool of local worker processes. Needs no external broker;
+    bulk data travels through shared memory rather than the pool's pipes.
+    """
+
+    def __init__(self, processes: int | None = None, start_method: str | None = None):
+        self.processes = processes
+        self.start_method = start_method
+        self._pool: ProcessPoolExecutor | None = None
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.processes,
+                mp_context=multiprocessing.get_context(self.start_method)
+            )
+        return self._pool
+
+    def map(self, fn, payloads):
+        return self._get_pool().map(fn, payloads)
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+
+class _PartitionError:
+    """An exception raised by a partition, shipped back as its result"""
+
+    def __init__(self, error: BaseException):
+        self.error = error
+        self.traceback = "".join(traceback.format_exception(error))
+
+
+def _run_partition(payload: SerializedValue) -> SerializedValue:
+    """
+    Worker entry point: build a graph instance, execute it and ship back its state.
+    Errors are returned rather than raised, so the transport still delivers the
+    results of the other partitions and their shared memory can be released.
+    """
+    try:
+        graph_fn, kwargs, state, source_ids = loads(payload)
+        graph_instance: Graph = graph_fn(**kwargs)
+        if state:
+            graph_instance.update_state(state)
+        graph_instance.execute(source_ids)
+        return dumps(graph_instance.state)
+    except Exception as e:
+        return dumps(_PartitionError(e))
+
+
+class DistributedExecutor:
+    """
+    Executes graphs across worker processes.
+
+    graph_fn is a @graph decorated function defined at module level, so workers can
+    import it and build their own graph instances. Task functions therefore never
+    need to be pickled, only the kwargs, state and results do.
+
+    Usage:
+        with DistributedExecutor(my_graph, LocalTransport(processes=8)) as executor:
+            states = executor.execute_instances([{"symbol": s} for s in symbols])
+    """
+
+    def __init__(self, graph_fn: Callable[..., Graph], transport: Transport | None = None):
+        self.graph_fn = graph_fn
+        self.transport = transport or LocalTransport()
+
+    def close(self):
+        self.transport.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def _map(self, items: List[tuple]) -> List[dict]:
+        payloads: List[SerializedValue] = []
+        results: List[SerializedValue] = []
+        try:
+            for item in items:
+                payloads.append(dumps(item))
+            results.extend(self.transport.map(_run_partition, payloads))
+            values = [loads(result) for result in results]
+        finally:
+            # loading unlinks shared memory, this catches whatever was never loaded
+            for value in (*payloads, *results):
+                release(value)
+        for value in values:
+            if isinstance(value, _PartitionError):
+                value.error.add_note(f"Raised in a worker:\n{value.traceback}")
+                raise value.error
+        return values
+
+    def execute_instances(self, kwargs_list: List[dict], states: List[dict] | None = None) -> List[dict]:
+        """
+        Build and execute one graph instance per kwargs dict (e.g. one per symbol).
+
+        Args:
+            kwargs_list (List[dict]): Keyword arguments passed to graph_fn for each instance.
+            states (List[dict] | None): Optional initial state for each instance, in the
+                same shape as Graph.state.
+
+        Returns:
+            List[dict]: The final Graph.state of each instance, in input order.
+        """
+        states = states or [None] * len(kwargs_list)
+        if len(states) != len(kwargs_list):
+            raise ValueError(f"Expected {len(kwargs_list)} states but received {len(states)}")
+        return self._map([
+            (self.graph_fn, kwargs, state, None)
+            for kwargs, state in zip(kwargs_list, states)
+        ])
+
+    def execute_sources(self, kwargs: dict | None = None, state: dict | None = None, partitions: int | None = None) -> dict:
+        """
+        Execute a single graph with its source subgraphs spread across workers.
+
+        Sources are assigned round robin to partitions. Each task's state is taken from
+        the partition whose sources reach it. global_state keys changed by a partition
+        are merged in partition order, so later partitions win on conflicting keys.
+
+        Returns:
+            dict: The aggregated state, in the same shape as Graph.state.
+        """
+        kwargs = kwargs or {}
+        local_graph = self.graph_fn(**kwargs)
+        if state:
+            local_graph.update_state(state)
+        source_nodes = local_graph._get_source_nodes()
+        if not source_nodes:
+            raise ValueError("Graph has no source nodes. Add at least one @source decorated function.")
+        partitions = min(partitions or len(source_nodes), len(source_nodes))
+        groups = [source_nodes[i::partitions] for i in range(partitions)]
+        results = self._map([
+            (self.graph_fn, kwargs, state, [node.task_id for node in group])
+            for group in groups
+        ])
+
+        initial = local_graph.state
+        aggregated = {
+            "graph_state": dict(initial["graph_state"]),
+            "global_state": dict(initial["global_state"])
+        }
+        for group, result in zip(groups, results):
+            owned_ids = {
+                node.task_id
+                for source_node in group
+                for node in local_graph._topological_sort_from_source(source_node)
+            }
+            for task_id, task_state in result["graph_state"].items():
+                if task_id in owned_ids:
+                    aggregated["graph_state"][task_id] = task_state
+            for key, value in result["global_state"].items():
+                if key not in initial["global_state"] or initial["global_state"][key] != value:
+                    aggregated["global_state"][key] = value
+        return aggregated
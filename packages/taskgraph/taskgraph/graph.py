@@ -5,6 +5,7 @@ from collections import deque
 from taskgraph.context import GraphContext
 from taskgraph.task import TaskNode, SourceNode
 from taskgraph.exceptions import TaskContextError
+from taskgraph.optimizer import ExecutionPlan, optimize
 
 
 class Graph:
@@ -14,6 +15,7 @@ class Graph:
         self.graph_state = graph_state or {}
         self.global_state = global_state or {}
         self._on_execute_end_hooks: List[Callable] = []
+        self._execution_plans: Dict[str, ExecutionPlan] | None = None
 
     @property
     def state(self) -> dict:
@@ -37,6 +39,23 @@ class Graph:
 
     def add_node(self, node: TaskNode):
         self.nodes.append(node)
+        self._execution_plans = None
+
+    @property
+    def optimized(self) -> bool:
+        return self._execution_plans is not None
+
+    def optimize(self) -> "Graph":
+        """
+        Build a fused execution plan for each source node.
+
+        Linear chains of single-input/single-consumer tasks are fused into one step
+        so intermediate values skip the per-node dispatch in _propagate_value, and
+        tasks marked pure whose outputs are never consumed are pruned. The graph
+        topology itself is left untouched. Adding a node discards the plans.
+        """
+        self._execution_plans = optimize(self)
+        return self
 
     def add_on_execute_end_hook(self, hook: Callable):
         """
@@ -117,6 +136,13 @@ class Graph:
         """
         Execute the subgraph starting from a source node, propagating each generated value
         """
+        if self._execution_plans is not None and source_node.task_id in self._execution_plans:
+            plan = self._execution_plans[source_node.task_id]
+            plan.bind(self)
+            for value in source_node.generate():
+                plan.run(value)
+            return
+
         # Get execution order for this source's subgraph
         execution_order = self._topological_sort_from_source(source_node)
         
@@ -178,8 +204,14 @@ class Graph:
         
         return False
 
-    def execute(self):
-        """Execute the graph using the new source-driven model"""
+    def execute(self, source_ids: List[str] | None = None):
+        """
+        Execute the graph using the new source-driven model.
+
+        Args:
+            source_ids (List[str] | None): Only drive the subgraphs of these source task_ids.
+                Defaults to every source in the graph.
+        """
         GraphContext.push(self)
         try:
             # Find all source nodes
@@ -187,6 +219,13 @@ class Graph:
             
             if not source_nodes:
                 raise ValueError("Graph has no source nodes. Add at least one @source decorated function.")
+
+            if source_ids is not None:
+                known_ids = {node.task_id for node in source_nodes}
+                unknown_ids = [task_id for task_id in source_ids if task_id not in known_ids]
+                if unknown_ids:
+                    raise ValueError(f"Unknown source task_ids {unknown_ids} in graph '{self.name}'")
+                source_nodes = [node for node in source_nodes if node.task_id in source_ids]
             
             # Execute each source's subgraph
             for source_node in source_nodes:
@@ -0,0 +1,194 @@
+from typing import Dict, List, Set, TYPE_CHECKING
+from taskgraph.task import TaskNode, SourceNode
+from taskgraph.task_context import _current_task_context
+
+if TYPE_CHECKING:
+    from taskgraph.graph import Graph
+
+
+def _bind_context(graph: "Graph", node: TaskNode) -> dict:
+    return {
+        "task_id": node.task_id,
+        "task_state": graph.graph_state.setdefault(node.task_id, {}),
+        "global_state": graph.global_state
+    }
+
+
+def _execute_node(node: TaskNode, kwargs: dict, context: dict):
+    """Equivalent to TaskNode.execute_single with the task context resolved up front"""
+    token = _current_task_context.set(dict(context))
+    try:
+        return node.fn(**kwargs)
+    except Exception as e:
+        raise RuntimeError(f"Error executing node {node.task_id}: {e}") from e
+    finally:
+        _current_task_context.reset(token)
+
+
+class PlanStep:
+    """
+    A single task with its kwargs split ahead of time into literal values
+    and references to upstream node outputs.
+    """
+
+    def __init__(self, node: TaskNode):
+        self.node = node
+        self.task_id = node.task_id
+        self.literals = {}
+        self.refs = []
+        self.context = None
+        for param_name, param_value in node.kwargs.items():
+            if isinstance(param_value, (TaskNode, SourceNode)):
+                self.refs.append((param_name, param_value.task_id))
+            else:
+                self.literals[param_name] = param_value
+
+    @property
+    def task_ids(self) -> List[str]:
+        return [self.task_id]
+
+    def bind(self, graph: "Graph"):
+        self.context = _bind_context(graph, self.node)
+
+    def resolve(self, node_outputs: dict) -> dict:
+        resolved_kwargs = dict(self.literals)
+        for param_name, upstream_id in self.refs:
+            if upstream_id not in node_outputs:
+                raise RuntimeError(f"Node {self.task_id} depends on {upstream_id} but no output available")
+            resolved_kwargs[param_name] = node_outputs[upstream_id]
+        return resolved_kwargs
+
+    def run(self, node_outputs: dict):
+        node_outputs[self.task_id] = _execute_node(self.node, self.resolve(node_outputs), self.context)
+
+
+class FusedChain(PlanStep):
+    """
+    A linear run of tasks where every member after the head has exactly one upstream
+    node (the previous member) and every member before the tail has exactly one consumer.
+    Values are handed straight from one member to the next, so intermediate outputs
+    never touch the shared output table. Each member still executes inside its own
+    task context, so per-task state behaves exactly as in the unfused graph.
+    """
+
+    def __init__(self, nodes: List[TaskNode]):
+        super().__init__(nodes[0])
+        self.nodes = nodes
+        self.tail_id = nodes[-1].task_id
+        self.links = []
+        for node in nodes[1:]:
+            literals = {}
+            params = []
+            for param_name, param_value in node.kwargs.items():
+                if isinstance(param_value, (TaskNode, SourceNode)):
+                    params.append(param_name)
+                else:
+                    literals[param_name] = param_value
+            self.links.append([node, literals, params, None])
+
+    @property
+    def task_ids(self) -> List[str]:
+        return [node.task_id for node in self.nodes]
+
+    def bind(self, graph: "Graph"):
+        super().bind(graph)
+        for link in self.links:
+            link[3] = _bind_context(graph, link[0])
+
+    def run(self, node_outputs: dict):
+        value = _execute_node(self.node, self.resolve(node_outputs), self.context)
+        for node, literals, params, context in self.links:
+            kwargs = dict(literals)
+            for param_name in params:
+                kwargs[param_name] = value
+            value = _execute_node(node, kwargs, context)
+        node_outputs[self.tail_id] = value
+
+
+class ExecutionPlan:
+    """
+    Precomputed execution order for the subgraph driven by a single source node.
+    """
+
+    def __init__(self, source_node: SourceNode, steps: List[PlanStep], pruned: Set[str]):
+        self.source_node = source_node
+        self.steps = steps
+        self.pruned = pruned
+
+    def bind(self, graph: "Graph"):
+        """
+        Resolve each step's task context against the graph's current state. Called
+        once per execution so graph state replaced between runs is picked up.
+        """
+        for step in self.steps:
+            step.bind(graph)
+
+    def run(self, value):
+        """Propagate a single source value through every step of the plan"""
+        node_outputs = {self.source_node.task_id: value}
+        for step in self.steps:
+            step.run(node_outputs)
+        return node_outputs
+
+
+def find_dead_nodes(graph: "Graph") -> Set[TaskNode]:
+    """
+    Return the nodes that can be skipped. A node is dead when it is marked pure and
+    none of its consumers are live, so pruning cascades up through pure chains.
+    Source nodes are never dead.
+    """
+    dead: Set[TaskNode] = set()
+    changed = True
+    while changed:
+        changed = False
+        for node in graph.nodes:
+            if (
+                node not in dead
+                and node.pure
+                and not isinstance(node, SourceNode)
+                and all(downstream in dead for downstream in node.downstream)
+            ):
+                dead.add(node)
+                changed = True
+    return dead
+
+
+def build_plan(graph: "Graph", source_node: SourceNode, dead: Set[TaskNode]) -> ExecutionPlan:
+    """
+    Build the execution plan for one source, fusing single-input/single-consumer
+    chains and leaving out dead nodes.
+    """
+    order = graph._topological_sort_from_source(source_node)
+    reachable = set(order)
+    pruned = {node.task_id for node in order if node in dead}
+
+    def live_consumers(node: TaskNode) -> List[TaskNode]:
+        return [d for d in node.downstream if d not in dead and d in reachable]
+
+    steps: List[PlanStep] = []
+    placed: Set[TaskNode] = {source_node}
+    for node in order:
+        if node in placed or node in dead:
+            continue
+        chain = [node]
+        placed.add(node)
+        while True:
+            consumers = live_consumers(chain[-1])
+            if len(consumers) != 1:
+                break
+            nxt = consumers[0]
+            if nxt in placed or len(nxt.upstream) != 1:
+                break
+            chain.append(nxt)
+            placed.add(nxt)
+        steps.append(FusedChain(chain) if len(chain) > 1 else PlanStep(node))
+    return ExecutionPlan(source_node, steps, pruned)
+
+
+def optimize(graph: "Graph") -> Dict[str, ExecutionPlan]:
+    """Build an execution plan for every source node in the graph, keyed by source task_id"""
+    dead = find_dead_nodes(graph)
+    return {
+        source_node.task_id: build_plan(graph, source_node, dead)
+        for source_node in graph._get_source_nodes()
+    }
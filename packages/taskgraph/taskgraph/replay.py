@@ -0,0 +1,109 @@
+import time
+from bisect import bisect_left, bisect_right
+from typing import Any, Callable, Iterable, Mapping, Sequence
+
+
+def _default_timestamp(item) -> int:
+    if isinstance(item, Mapping):
+        return item["timestamp"]
+    return item.timestamp
+
+
+class Pacer:
+    """
+    Throttles a replay to a multiple of real time. Timestamps are in milliseconds.
+    A speed of None disables pacing so values are emitted as fast as possible.
+    """
+
+    def __init__(
+        self,
+        speed: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep
+    ):
+        if speed is not None and speed <= 0:
+            raise ValueError(f"speed must be greater than zero. Received {speed}.")
+        self.speed = speed
+        self._clock = clock
+        self._sleep = sleep
+        self._origin: tuple[int, float] | None = None
+
+    def wait(self, timestamp: int):
+        if self.speed is None:
+            return
+        if self._origin is None:
+            self._origin = (timestamp, self._clock())
+            return
+        origin_timestamp, origin_clock = self._origin
+        target = origin_clock + (timestamp - origin_timestamp) / 1000 / self.speed
+        delay = target - self._clock()
+        if delay > 0:
+            self._sleep(delay)
+
+
+def replay(
+    history: Iterable[Mapping[str, Sequence]],
+    live: Iterable | None = None,
+    start: int | None = None,
+    end: int | None = None,
+    speed: float | None = None,
+    timestamp_column: str = "timestamp",
+    row_factory: Callable[..., Any] = dict,
+    live_timestamp: Callable[[Any], int] = _default_timestamp,
+    pacer: Pacer | None = None
+):
+    """
+    Replay historical data, then hand over to a live stream.
+
+    History is read as columnar batches: mappings of column name to equal length
+    sequences, sorted by timestamp_column. The [start, end] window is located with a
+    binary search on the timestamp column, so batches before start are skipped without
+    touching their rows. Each selected row is built with row_factory(**columns).
+
+    Once history is exhausted, items from live are yielded unchanged. Any item at or
+    before the last replayed timestamp is dropped, so the boundary bar (and anything
+    overlapping between consecutive batches) is only processed once.
+
+    Args:
+        history (Iterable[Mapping[str, Sequence]]): Columnar batches of historical rows.
+        live (Iterable | None): Live items to continue with after history.
+        start (int | None): First timestamp to replay (inclusive).
+        end (int | None): Last timestamp to replay (inclusive).
+        speed (float | None): Replay speed as a multiple of real time. None replays
+            history as fast as possible. Live items are never paced.
+        timestamp_column (str): Name of the timestamp column in each batch.
+        row_factory (Callable): Builds a row from its column values, e.g. Candle.
+        live_timestamp (Callable): Extracts the timestamp from a live item.
+        pacer (Pacer | None): Overrides the pacer built from speed.
+
+    Yields:
+        One value per historical row, followed by the live items.
+    """
+    pacer = pacer or Pacer(speed)
+    last_timestamp = None
+
+    for batch in history:
+        timestamps = batch[timestamp_column]
+        if len(timestamps) == 0:
+            continue
+        if end is not None and timestamps[0] > end:
+            break
+        lo = bisect_left(timestamps, start) if start is not None else 0
+        hi = bisect_right(timestamps, end) if end is not None else len(timestamps)
+        if last_timestamp is not None:
+            lo = max(lo, bisect_right(timestamps, last_timestamp))
+        columns = list(batch.items())
+        for i in range(lo, hi):
+            timestamp = timestamps[i]
+            pacer.wait(timestamp)
+            yield row_factory(**{name: values[i] for name, values in columns})
+            last_timestamp = timestamp
+
+    if live is None:
+        return
+    for item in live:
+        timestamp = live_timestamp(item)
+        if last_timestamp is not None and timestamp <= last_timestamp:
+            continue
+        last_timestamp = timestamp
+        yield item
@@ -10,11 +10,13 @@ class TaskState:
 
 
 class TaskNode:
-    def __init__(self, name: str, fn: Callable, kwargs, task_id: str = None):
+    def __init__(self, name: str, fn: Callable, kwargs, task_id: str = None, pure: bool = False):
         self.name = name
         self.task_id = task_id or name
         self.fn = fn
         self.kwargs = kwargs
+        # Pure tasks have no side effects, so the optimizer may drop them when unused
+        self.pure = pure
 
         self.state = TaskState()
 
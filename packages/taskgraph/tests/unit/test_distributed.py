@@ -0,0 +1,124 @@
+import os
+import pickle
+import pytest
+from taskgraph.decorators import task, source, graph
+from taskgraph.distributed import SHARED_MEMORY_MIN_BYTES, DistributedExecutor, LocalTransport, dumps, loads
+from taskgraph.task_context import get_current_task_context, get_global_state_value, set_global_state
+
+
+@source
+def numbers_source(count):
+    for i in range(count):
+        yield i
+
+
+@task
+def accumulate(number):
+    task_state = get_current_task_context()["task_state"]
+    task_state["total"] = task_state.get("total", 0) + number * get_global_state_value("scale")
+    return task_state["total"]
+
+
+@task
+def publish(total, key):
+    set_global_state(key, total)
+
+
+@graph
+def scaled_sum_graph(scale):
+    nums = numbers_source(task_id="numbers", count=5)
+    total = accumulate(task_id="accumulate", number=nums)
+    publish(task_id="publish", total=total, key="total")
+
+
+@graph
+def two_source_graph():
+    for name, count in (("a", 3), ("b", 4)):
+        nums = numbers_source(task_id=f"{name}_numbers", count=count)
+        total = accumulate(task_id=f"{name}_accumulate", number=nums)
+        publish(task_id=f"{name}_publish", total=total, key=f"{name}_total")
+
+
+@task
+def keep_payload(number, payload, fail):
+    if fail:
+        raise ValueError(f"Failed on {number}")
+    get_current_task_context()["task_state"]["payload"] = pickle.PickleBuffer(payload)
+
+
+@graph
+def payload_graph(payload, fail):
+    nums = numbers_source(task_id="numbers", count=1)
+    keep_payload(task_id="keep_payload", number=nums, payload=payload, fail=fail)
+
+
+def shared_memory_segments() -> set:
+    return {name for name in os.listdir("/dev/shm") if name.startswith("psm_")}
+
+
+@pytest.fixture
+def executor():
+    with DistributedExecutor(scaled_sum_graph, LocalTransport(processes=2)) as executor:
+        yield executor
+
+
+class TestSerialization:
+    def test_round_trip_inline(self):
+        """Test small values round trip without shared memory"""
+        value = {"a": [1, 2, 3], "b": bytearray(b"xyz")}
+        serialized = dumps(value)
+
+        assert all(isinstance(buffer, bytes) for buffer in serialized.buffers)
+        assert loads(serialized) == value
+
+    def test_round_trip_shared_memory(self):
+        """Test large out-of-band buffers travel through shared memory"""
+        value = bytearray(b"x" * 1024)
+        serialized = dumps({"payload": pickle.PickleBuffer(value)}, min_shared_bytes=512)
+
+        assert isinstance(serialized.buffers[0], tuple)
+        assert loads(serialized)["payload"] == value
+
+
+class TestDistributedExecutor:
+    def test_execute_instances(self, executor: DistributedExecutor):
+        """Test one graph instance per kwargs dict with results in input order"""
+        states = executor.execute_instances([{"scale": 1}, {"scale": 10}])
+
+        assert [state["graph_state"]["accumulate"]["total"] for state in states] == [10, 100]
+        assert [state["global_state"]["total"] for state in states] == [10, 100]
+
+    def test_execute_instances_with_initial_state(self, executor: DistributedExecutor):
+        """Test initial state is applied to each worker's graph instance"""
+        initial = {"graph_state": {"accumulate": {"total": 5}}, "global_state": {}}
+        states = executor.execute_instances([{"scale": 1}], states=[initial])
+
+        assert states[0]["graph_state"]["accumulate"]["total"] == 15
+
+    def test_execute_instances_state_length_mismatch(self, executor: DistributedExecutor):
+        with pytest.raises(ValueError, match="Expected 2 states"):
+            executor.execute_instances([{"scale": 1}, {"scale": 2}], states=[{}])
+
+    def test_execute_sources(self):
+        """Test source subgraphs run on separate workers and their state is merged"""
+        with DistributedExecutor(two_source_graph, LocalTransport(processes=2)) as executor:
+            state = executor.execute_sources(kwargs={}, state={"global_state": {"scale": 2}})
+
+        assert state["graph_state"]["a_accumulate"]["total"] == 6
+        assert state["graph_state"]["b_accumulate"]["total"] == 12
+        assert state["global_state"]["a_total"] == 6
+        assert state["global_state"]["b_total"] == 12
+
+    @pytest.mark.skipif(not os.path.isdir("/dev/shm"), reason="Needs POSIX shared memory in /dev/shm")
+    def test_failing_task_releases_shared_memory(self):
+        """Test a failing partition leaves no shared memory behind, for its payload or the others' results"""
+        payload = bytearray(SHARED_MEMORY_MIN_BYTES)
+        before = shared_memory_segments()
+        with DistributedExecutor(payload_graph, LocalTransport(processes=2)) as executor:
+            with pytest.raises(RuntimeError, match="Failed on 0"):
+                executor.execute_instances([
+                    {"payload": pickle.PickleBuffer(payload), "fail": fail}
+                    for fail in (False, True, False)
+                ])
+
+        assert shared_memory_segments() == before
@@ -229,3 +229,28 @@ class TestGraph:
         
         with pytest.raises(ValueError, match="Graph has no source nodes"):
             graph.execute()
+
+    def test_execute_subset_of_sources(self):
+        """Test execute only drives the requested sources"""
+        outputs = []
+        graph = Graph("test")
+        source1 = SourceNode("source1", lambda: (yield 1), {}, "s1")
+        source2 = SourceNode("source2", lambda: (yield 2), {}, "s2")
+        task1 = TaskNode("task1", lambda x: outputs.append(x), {"x": source1}, "t1")
+        task2 = TaskNode("task2", lambda x: outputs.append(x), {"x": source2}, "t2")
+        task1.set_upstream(source1)
+        task2.set_upstream(source2)
+        for node in (source1, source2, task1, task2):
+            graph.add_node(node)
+
+        graph.execute(source_ids=["s2"])
+
+        assert outputs == [2]
+
+    def test_execute_unknown_source_raises_error(self):
+        """Test execute rejects unknown source task_ids"""
+        graph = Graph("test")
+        graph.add_node(SourceNode("source", lambda: (yield 1), {}, "s1"))
+
+        with pytest.raises(ValueError, match="Unknown source task_ids"):
+            graph.execute(source_ids=["missing"])
@@ -0,0 +1,170 @@
+import pytest
+from taskgraph.decorators import task, source, graph
+from taskgraph.graph import Graph
+from taskgraph.task import TaskNode, SourceNode
+from taskgraph.optimizer import PlanStep, FusedChain, find_dead_nodes, build_plan
+from taskgraph.task_context import get_current_task_context
+
+
+def _chain_graph():
+    graph = Graph("test")
+    source = SourceNode("source", lambda: (yield 1), {}, "source")
+    task1 = TaskNode("task1", lambda x: x + 1, {}, "task1")
+    task2 = TaskNode("task2", lambda x: x * 2, {}, "task2")
+    task1.kwargs = {"x": source}
+    task2.kwargs = {"x": task1}
+    task1.set_upstream(source)
+    task2.set_upstream(task1)
+    for node in (source, task1, task2):
+        graph.add_node(node)
+    return graph, source, task1, task2
+
+
+class TestOptimizer:
+    def test_linear_chain_is_fused(self):
+        """Test single-input/single-consumer chains become one fused step"""
+        graph, source, task1, task2 = _chain_graph()
+
+        plan = build_plan(graph, source, set())
+
+        assert len(plan.steps) == 1
+        assert isinstance(plan.steps[0], FusedChain)
+        assert plan.steps[0].task_ids == ["task1", "task2"]
+
+    def test_fan_out_is_not_fused(self):
+        """Test a node with two consumers ends its chain"""
+        graph, source, task1, task2 = _chain_graph()
+        task3 = TaskNode("task3", lambda x: x, {"x": task1}, "task3")
+        task3.set_upstream(task1)
+        graph.add_node(task3)
+
+        plan = build_plan(graph, source, set())
+
+        assert [step.task_ids for step in plan.steps][0] == ["task1"]
+        assert all(len(step.task_ids) == 1 for step in plan.steps)
+
+    def test_join_is_not_fused(self):
+        """Test a node with two upstream nodes is not fused into its parent"""
+        graph = Graph("test")
+        source = SourceNode("source", lambda: (yield 1), {}, "source")
+        left = TaskNode("left", lambda x: x, {"x": source}, "left")
+        right = TaskNode("right", lambda x: x, {"x": source}, "right")
+        join = TaskNode("join", lambda a, b: a + b, {"a": left, "b": right}, "join")
+        left.set_upstream(source)
+        right.set_upstream(source)
+        join.set_upstream(left)
+        join.set_upstream(right)
+
+        plan = build_plan(graph, source, set())
+
+        assert all(isinstance(step, PlanStep) and len(step.task_ids) == 1 for step in plan.steps)
+        assert plan.steps[-1].task_ids == ["join"]
+
+    def test_unused_pure_nodes_are_dead(self):
+        """Test pure nodes without live consumers are pruned, cascading upstream"""
+        graph, source, task1, task2 = _chain_graph()
+        task1.pure = True
+        task2.pure = True
+
+        assert find_dead_nodes(graph) == {task1, task2}
+
+    def test_impure_nodes_are_kept(self):
+        """Test unconsumed nodes with side effects are never pruned"""
+        graph, source, task1, task2 = _chain_graph()
+        task1.pure = True
+
+        assert find_dead_nodes(graph) == set()
+
+    def test_add_node_discards_plans(self):
+        """Test adding a node invalidates existing execution plans"""
+        graph, source, task1, task2 = _chain_graph()
+        graph.optimize()
+        assert graph.optimized
+
+        graph.add_node(TaskNode("task3", lambda: None, {}, "task3"))
+
+        assert not graph.optimized
+
+
+def _run_pipeline(optimize: bool):
+    outputs = []
+    dead_calls = []
+
+    @source
+    def numbers_source():
+        for i in range(5):
+            yield i
+
+    @task
+    def accumulate(number):
+        task_state = get_current_task_context()["task_state"]
+        task_state["total"] = task_state.get("total", 0) + number
+        return task_state["total"]
+
+    @task
+    def scale(number, factor):
+        return number * factor
+
+    @task
+    def record(number):
+        outputs.append(number)
+
+    @task(pure=True)
+    def unused(number):
+        # test-only probe of whether the pruned task ran, its output is never consumed
+        dead_calls.append(number)
+        return number * 2
+
+    @task(pure=True)
+    def unused_downstream(number):
+        return number + 1
+
+    def build():
+        nums = numbers_source(task_id="numbers")
+        total = accumulate(task_id="accumulate", number=nums)
+        scaled = scale(task_id="scale", number=total, factor=10)
+        record(task_id="record", number=scaled)
+        unused_downstream(task_id="unused_downstream", number=unused(task_id="unused", number=nums))
+
+    g = graph(optimize=optimize)(build)()
+    g.execute()
+    return g, outputs, dead_calls
+
+
+def test_optimized_graph_matches_unoptimized():
+    """Test fused execution produces the same outputs and task state as unoptimized execution"""
+    unoptimized, expected_outputs, unoptimized_dead_calls = _run_pipeline(optimize=False)
+    optimized, outputs, dead_calls = _run_pipeline(optimize=True)
+
+    assert not unoptimized.optimized and optimized.optimized
+    assert outputs == expected_outputs == [0, 10, 30, 60, 100]
+    assert optimized.graph_state["accumulate"] == unoptimized.graph_state["accumulate"] == {"total": 10}
+
+    # the dead pure chain runs without the optimizer and is pruned with it
+    assert unoptimized_dead_calls == [0, 1, 2, 3, 4]
+    assert dead_calls == []
+    assert optimized._execution_plans["numbers"].pruned == {"unused", "unused_downstream"}
+
+
+def test_optimized_graph_wraps_task_errors():
+    """Test errors inside fused chains name the failing node"""
+    @source
+    def numbers_source():
+        yield 1
+
+    @task
+    def passthrough(number):
+        return number
+
+    @task
+    def fail(number):
+        raise ValueError("boom")
+
+    @graph(optimize=True)
+    def failing_graph():
+        nums = numbers_source(task_id="numbers")
+        value = passthrough(task_id="passthrough", number=nums)
+        fail(task_id="fail", number=value)
+
+    with pytest.raises(RuntimeError, match="Error executing node fail: boom"):
+        failing_graph().execute()
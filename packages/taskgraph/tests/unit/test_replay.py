@@ -0,0 +1,97 @@
+import pytest
+from taskgraph.decorators import task, graph
+from taskgraph.custom_tasks import replay_source
+from taskgraph.replay import replay, Pacer
+
+
+HISTORY = [
+    {"timestamp": [1000, 2000, 3000], "close": [10, 11, 12]},
+    {"timestamp": [3000, 4000, 5000], "close": [12, 13, 14]},
+]
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def clock(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class Column(list):
+    """A column without a truth value, like a numpy array"""
+
+    def __bool__(self):
+        raise ValueError("The truth value of a column is ambiguous.")
+
+
+class TestReplay:
+    def test_replays_history_rows(self):
+        """Test rows are built from columns and batch overlaps are not repeated"""
+        rows = list(replay(HISTORY))
+
+        assert [row["timestamp"] for row in rows] == [1000, 2000, 3000, 4000, 5000]
+        assert rows[0] == {"timestamp": 1000, "close": 10}
+
+    def test_columnar_batches(self):
+        """Test columns are only ever measured with len, and empty batches are skipped"""
+        history = [
+            {"timestamp": Column(), "close": Column()},
+            {"timestamp": Column([1000, 2000]), "close": Column([10, 11])},
+        ]
+        rows = list(replay(history))
+
+        assert [row["timestamp"] for row in rows] == [1000, 2000]
+
+    def test_time_window(self):
+        """Test start and end select an inclusive window"""
+        rows = list(replay(HISTORY, start=2000, end=4000))
+
+        assert [row["timestamp"] for row in rows] == [2000, 3000, 4000]
+
+    def test_row_factory(self):
+        rows = list(replay(HISTORY, row_factory=lambda timestamp, close: (timestamp, close)))
+
+        assert rows[-1] == (5000, 14)
+
+    def test_switches_to_live_without_repeating_boundary(self):
+        """Test live items at or before the last historical bar are dropped"""
+        live = [{"timestamp": 4000}, {"timestamp": 5000}, {"timestamp": 6000}, {"timestamp": 7000}]
+        rows = list(replay(HISTORY, live=live))
+
+        assert [row["timestamp"] for row in rows] == [1000, 2000, 3000, 4000, 5000, 6000, 7000]
+
+    def test_speed_paces_history(self):
+        """Test history is throttled to a multiple of real time"""
+        fake = FakeClock()
+        pacer = Pacer(speed=2, clock=fake.clock, sleep=fake.sleep)
+        list(replay(HISTORY, pacer=pacer))
+
+        assert fake.sleeps == [0.5, 0.5, 0.5, 0.5]
+
+    def test_invalid_speed(self):
+        with pytest.raises(ValueError):
+            Pacer(speed=0)
+
+
+def test_replay_source_in_graph():
+    """Test replay_source drives a graph like any other source"""
+    closes = []
+
+    @task
+    def record(row):
+        closes.append(row["close"])
+
+    @graph
+    def replay_graph():
+        rows = replay_source(task_id="replay", history=HISTORY, live=[{"timestamp": 6000, "close": 15}])
+        record(task_id="record", row=rows)
+
+    replay_graph().execute()
+
+    assert closes == [10, 11, 12, 13, 14, 15]
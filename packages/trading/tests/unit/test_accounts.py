@@ -0,0 +1,42 @@
+import asyncio
+from trading.mock_exchange.accounts import AccountRegistry
+from trading.mock_exchange.engine import TradeEngine
+from trading.types import BalanceType
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_accounts_are_isolated():
+    async def run():
+        registry = AccountRegistry()
+        a = registry.get("a")
+        b = registry.get("b")
+        await a.worker.call(TradeEngine.add_balance, 5.0, BalanceType.EXCHANGE)
+        balances = a.engine.balance[BalanceType.EXCHANGE], b.engine.balance[BalanceType.EXCHANGE]
+        same = registry.get("a") is a
+        await registry.close()
+        return balances, same
+
+    assert asyncio.run(run()) == ((5.0, 0), True)
+
+
+def test_idle_accounts_are_evicted():
+    async def run():
+        clock = FakeClock()
+        registry = AccountRegistry(idle_timeout=10, clock=clock)
+        idle = registry.get("idle")
+        connected = registry.get("connected")
+        connected.connections += 1
+        clock.now = 5
+        registry.get("recent")
+        clock.now = 12
+        evicted = await registry.evict_idle()
+        return evicted, sorted(registry.accounts), idle.worker.running
+
+    assert asyncio.run(run()) == (["idle"], ["connected", "recent"], False)
@@ -0,0 +1,132 @@
+import pytest
+from fastapi.testclient import TestClient
+from trading.mock_exchange.api import app
+
+
+@pytest.fixture
+def client():
+    with TestClient(app) as client:
+        yield client
+
+
+def order(price: float, amount: float = 1.0, order_type: str = "LIMIT", mts: int = 1) -> dict:
+    return {"symbol": "BTCUSD", "amount": amount, "price": price, "order_type": order_type, "mts": mts}
+
+
+def test_submit_order_batch(client: TestClient):
+    response = client.post("/order/submit/batch", json=[order(30000, mts=1), order(29000, mts=2)])
+
+    assert response.status_code == 200
+    assert response.json()["mts"] == 2
+    assert [o["price"] for o in response.json()["data"]] == [30000, 29000]
+    assert len(client.get("/orders").json()) == 2
+
+
+def test_submit_order_batch_reports_failed_index(client: TestClient):
+    client.post("/price/update", json={"symbol": "BTCUSD", "price": 30000})
+    # the stop is already reached, so it fills right away and the empty balance goes negative
+    response = client.post(
+        "/order/submit/batch",
+        json=[order(20000), order(29000, order_type="STOP"), order(21000)]
+    )
+
+    assert response.status_code == 400
+    detail = response.json()
+    assert detail["index"] == 1
+    assert "Balance went below zero" in detail["error"]
+    assert [o["price"] for o in detail["results"]] == [20000]
+    # orders after the failed one are not submitted
+    assert 21000 not in [o["price"] for o in client.get("/orders").json()]
+
+
+def test_cancel_order_batch(client: TestClient):
+    orders = client.post("/order/submit/batch", json=[order(30000), order(29000)]).json()["data"]
+    response = client.post("/orders/cancel/batch", json=[{"id": orders[0]["id"], "mts": 3}, {"id": -1, "mts": 4}])
+
+    assert response.status_code == 200
+    assert response.json()["status"] == "FAILURE"
+    assert response.json()["text"] == "Orders not found: [-1]"
+    assert [o["id"] for o in response.json()["data"]] == [orders[0]["id"]]
+    assert [o["id"] for o in client.get("/orders").json()] == [orders[1]["id"]]
+
+
+def test_update_price_batch(client: TestClient):
+    client.post("/balance/deposit", json={"amount": 100000, "balance_type": "MARGIN"})
+    client.post("/price/update", json={"symbol": "BTCUSD", "price": 31000})
+    client.post("/order/submit", json=order(30000))
+    response = client.post("/price/update/batch", json=[
+        {"symbol": "BTCUSD", "price": 30500, "mts": 2},
+        {"symbol": "BTCUSD", "price": 29500, "mts": 3},
+    ])
+
+    assert response.status_code == 200
+    assert [update["price"] for update in response.json()] == [30500, 29500]
+    assert [len(update["triggered_orders"]) for update in response.json()] == [0, 1]
+
+
+def test_zero_amount_order_executes(client: TestClient):
+    client.post("/price/update", json={"symbol": "BTCUSD", "price": 31000})
+    client.post("/order/submit", json=order(30000, amount=0.0))
+    response = client.post("/price/update", json={"symbol": "BTCUSD", "price": 29000, "mts": 2})
+
+    assert response.status_code == 200
+    assert [o["price"] for o in response.json()["triggered_orders"]] == [30000]
+    assert client.get("/orders").json() == []
+
+
+def test_update_price_batch_reports_failed_index(client: TestClient):
+    client.post("/price/update", json={"symbol": "BTCUSD", "price": 31000})
+    client.post("/order/submit", json=order(30000))
+    # with resting orders, a symbol without a previous price cannot be moved
+    response = client.post("/price/update/batch", json=[
+        {"symbol": "BTCUSD", "price": 30500, "mts": 2},
+        {"symbol": "ETHUSD", "price": 2000, "mts": 3},
+        {"symbol": "BTCUSD", "price": 30400, "mts": 4},
+    ])
+
+    assert response.status_code == 400
+    assert response.json()["index"] == 1
+    assert [update["price"] for update in response.json()["results"]] == [30500]
+
+
+def test_stream(client: TestClient):
+    with client.websocket_connect("/stream") as websocket:
+        websocket.send_json({"op": "price.update", "params": {"symbol": "BTCUSD", "price": 30000}})
+        websocket.send_json({"op": "order.submit", "params": order(29000)})
+        websocket.send_json({"op": "order.fill", "params": {}})
+
+        assert websocket.receive_json()["result"]["price"] == 30000
+        assert websocket.receive_json()["result"]["data"][0]["price"] == 29000
+        assert websocket.receive_json() == {"op": "order.fill", "error": "Unknown op 'order.fill'"}
+
+
+@pytest.mark.parametrize("text", ["[1, 2]", "{not json", '"op"', '{"op": ["price.update"]}'])
+def test_stream_rejects_malformed_messages(client: TestClient, text: str):
+    with client.websocket_connect("/stream") as websocket:
+        websocket.send_text(text)
+        assert "error" in websocket.receive_json()
+
+        # the connection survives the bad message
+        websocket.send_json({"op": "price.update", "params": {"symbol": "BTCUSD", "price": 30000}})
+        assert websocket.receive_json()["result"]["price"] == 30000
+
+
+def test_stream_rejects_invalid_params(client: TestClient):
+    with client.websocket_connect("/stream") as websocket:
+        websocket.send_json({"op": "order.submit", "params": [1]})
+
+        reply = websocket.receive_json()
+        assert reply["op"] == "order.submit"
+        assert "error" in reply
+
+
+def test_notifications_survive_malformed_messages(client: TestClient):
+    with client.websocket_connect("/notifications") as websocket:
+        websocket.send_text("[1, 2]")
+        assert "error" in websocket.receive_json()
+        websocket.send_json({"subscribe": 5})
+        assert "error" in websocket.receive_json()
+        websocket.send_json({"subscribe": ["BTCUSD"]})
+
+        client.post("/price/update", json={"symbol": "BTCUSD", "price": 30000, "mts": 1})
+        assert websocket.receive_json() == {"type": "price", "data": {"mts": 1, "symbol": "BTCUSD", "price": 30000}}
@@ -0,0 +1,42 @@
+import asyncio
+import pytest
+from trading.mock_exchange.engine import TradeEngine
+from trading.mock_exchange.worker import EngineWorker
+from trading.types import BalanceType
+
+
+def test_concurrent_calls_are_serialized():
+    async def run():
+        worker = EngineWorker(TradeEngine())
+        worker.start()
+        await asyncio.gather(*(
+            worker.call(TradeEngine.add_balance, 1.0, BalanceType.EXCHANGE)
+            for _ in range(100)
+        ))
+        await worker.stop()
+        return worker.engine.balance[BalanceType.EXCHANGE]
+
+    assert asyncio.run(run()) == 100.0
+
+
+def test_errors_propagate_to_caller():
+    async def run():
+        worker = EngineWorker(TradeEngine())
+        worker.start()
+        try:
+            with pytest.raises(RuntimeError, match="below zero"):
+                await worker.call(TradeEngine.add_balance, -1.0, BalanceType.EXCHANGE)
+            # the worker keeps serving after a failed operation
+            return await worker.call(lambda engine: engine.balance[BalanceType.MARGIN])
+        finally:
+            await worker.stop()
+
+    assert asyncio.run(run()) == 0
+
+
+def test_call_requires_running_worker():
+    async def run():
+        await EngineWorker(TradeEngine()).call(TradeEngine.get_orders)
+
+    with pytest.raises(RuntimeError, match="not running"):
+        asyncio.run(run())
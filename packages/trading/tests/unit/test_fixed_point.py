@@ -0,0 +1,122 @@
+from fractions import Fraction
+import pytest
+from trading.mock_exchange.engine import EngineEventType, TradeEngine
+from trading.mock_exchange.liquidity import LiquidityModel
+from trading.mock_exchange.simulation import OrderIntent, Simulation
+from trading.types import BalanceType, FixedPoint, Order, OrderStatus, OrderType, Symbol, Fill
+
+
+FIXED = FixedPoint(price_decimals=1, quantity_decimals=8)
+
+
+def record_fills(engine: TradeEngine) -> list[Fill]:
+    fills = []
+    engine.add_listener(lambda event: fills.append(event.fill) if event.type == EngineEventType.FILL else None)
+    return fills
+
+
+def make_order(id, price, quantity, order_type=OrderType.EXCHANGE_LIMIT, mts=1):
+    return Order(
+        id=id,
+        symbol=Symbol.BTCUSD,
+        price=price,
+        quantity=quantity,
+        status=OrderStatus.ACTIVE,
+        order_type=order_type,
+        mts_create=mts,
+        mts_update=mts
+    )
+
+
+def test_conversions_round_trip():
+    prices = [104790.5, 0.1, 0.3]
+    assert list(FIXED.prices(prices)) == [1047905, 1, 3]
+    assert list(FIXED.to_prices(FIXED.prices(prices))) == prices
+    assert FIXED.quantity(0.1) == 10_000_000
+    assert FIXED.balance(1000.0) == 1000 * 10 ** 9
+    assert FIXED.to_balances([FIXED.balance(0.3)])[0] == 0.3
+    with pytest.raises(ValueError, match="0.05"):
+        FIXED.prices([0.05])
+
+
+def test_conversions_reject_values_out_of_range():
+    # 1e20 is on the price grid, but 1e21 ticks do not fit in 64 bits
+    with pytest.raises(ValueError, match="1e\\+20"):
+        FixedPoint(2, 8).prices([1e20])
+    with pytest.raises(ValueError, match="1e\\+20"):
+        FIXED.balances([1e20])
+
+
+def test_settlement_is_exact():
+    balance = FIXED.balance(1000.0)
+    engine = TradeEngine(initial_exchange_balance=balance, fixed_point=FIXED)
+    engine.price[Symbol.BTCUSD] = FIXED.price(0.3)
+    price, quantity = FIXED.price(0.2), FIXED.quantity(0.1)
+    for i in range(0, 200, 2):
+        # buy below the market and sell back above it
+        engine.add_order(make_order(i, price, quantity))
+        engine.apply_price(Symbol.BTCUSD, FIXED.price(0.1), mts=i + 1)
+        engine.add_order(make_order(i + 1, FIXED.price(0.3), -quantity))
+        engine.apply_price(Symbol.BTCUSD, FIXED.price(0.4), mts=i + 2)
+
+    fee = Fraction("0.001")
+    expected = balance
+    for _ in range(100):
+        expected += -price * quantity + round(price * quantity * fee)
+        expected += FIXED.price(0.3) * quantity - round(FIXED.price(0.3) * quantity * fee)
+    assert engine.balance[BalanceType.EXCHANGE] == expected
+    assert isinstance(engine.balance[BalanceType.EXCHANGE], int)
+    assert FIXED.to_balances([expected])[0] == pytest.approx(1000 + 100 * 0.1 * (0.3 - 0.2) * (1 - 0.001))
+
+
+def test_partial_fills_are_whole_units():
+    engine = TradeEngine(
+        initial_exchange_balance=FIXED.balance(1000.0),
+        liquidity=LiquidityModel(participation=0.5),
+        fixed_point=FIXED
+    )
+    engine.price[Symbol.BTCUSD] = 1000
+    fills = record_fills(engine)
+    engine.add_order(make_order(0, 950, 7))
+
+    executed = engine.apply_price(Symbol.BTCUSD, 940, mts=2, volume=5)
+
+    assert [(order.status, order.filled) for order in executed] == [(OrderStatus.PARTIALLY_FILLED, 2)]
+    assert all(isinstance(fill.quantity, int) for fill in fills)
+
+
+def test_rejects_floats():
+    engine = TradeEngine(fixed_point=FIXED)
+    engine.price[Symbol.BTCUSD] = 1000
+    with pytest.raises(ValueError):
+        engine.add_order(make_order(0, 950.5, 7))
+    with pytest.raises(ValueError):
+        engine.apply_price(Symbol.BTCUSD, 999.5, mts=2)
+    with pytest.raises(ValueError):
+        TradeEngine(initial_exchange_balance=1.5, fixed_point=FIXED)
+
+
+def test_simulation_records_integer_columns():
+    float_prices = [100.0, 99.5, 98.7, 101.3, 102.1]
+    intents = [
+        OrderIntent(1, Symbol.BTCUSD, 0.5, 99.0, OrderType.EXCHANGE_LIMIT),
+        OrderIntent(1, Symbol.BTCUSD, -0.5, 101.0, OrderType.EXCHANGE_LIMIT),
+    ]
+    fixed_intents = [
+        OrderIntent(i.mts, i.symbol, FIXED.quantity(i.amount), FIXED.price(i.price), i.order_type)
+        for i in intents
+    ]
+    mts = list(range(1, 6))
+    symbols = [Symbol.BTCUSD] * 5
+
+    reference = Simulation(TradeEngine(initial_exchange_balance=1000)).run(mts, symbols, float_prices, intents)
+    result = Simulation(
+        TradeEngine(initial_exchange_balance=FIXED.balance(1000), fixed_point=FIXED)
+    ).run(mts, symbols, FIXED.prices(float_prices), fixed_intents)
+
+    assert result.fills["price"].typecode == "q"
+    assert list(FIXED.to_prices(result.fills["price"])) == list(reference.fills["price"])
+    assert list(FIXED.to_quantities(result.fills["quantity"])) == list(reference.fills["quantity"])
+    assert list(FIXED.to_balances(result.balances[BalanceType.EXCHANGE])) == pytest.approx(
+        list(reference.balances[BalanceType.EXCHANGE])
+    )
@@ -0,0 +1,36 @@
+from dataclasses import dataclass
+import pytest
+from trading.mock_exchange.intrabar import IntrabarPath, intrabar_prices
+
+
+@dataclass
+class Candle:
+    timestamp: int
+    open: float
+    high: float
+    low: float
+    close: float
+
+
+def test_fixed_paths():
+    candle = Candle(0, open=100, high=110, low=90, close=105)
+
+    assert intrabar_prices(candle, IntrabarPath.OHLC) == [100, 110, 90, 105]
+    assert intrabar_prices(candle, IntrabarPath.OLHC) == [100, 90, 110, 105]
+
+
+@pytest.mark.parametrize("candle, expected", [
+    (Candle(0, open=100, high=102, low=90, close=95), [100, 102, 90, 95]),
+    (Candle(0, open=100, high=110, low=98, close=105), [100, 98, 110, 105]),
+    # equidistant extremes follow the direction of the candle
+    (Candle(0, open=100, high=110, low=90, close=95), [100, 110, 90, 95]),
+    (Candle(0, open=100, high=110, low=90, close=105), [100, 90, 110, 105]),
+])
+def test_nearest_path(candle, expected):
+    assert intrabar_prices(candle, IntrabarPath.NEAREST) == expected
+
+
+def test_duplicate_points_are_dropped():
+    candle = Candle(0, open=100, high=100, low=90, close=90)
+
+    assert intrabar_prices(candle, IntrabarPath.OHLC) == [100, 90]
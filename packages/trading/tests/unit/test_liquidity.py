@@ -0,0 +1,101 @@
+import pytest
+from trading.mock_exchange.engine import EngineEventType, TradeEngine
+from trading.mock_exchange.liquidity import LiquidityModel
+from trading.types import Order, OrderStatus, Symbol, OrderType, BalanceType, Fill
+
+
+@pytest.fixture
+def engine():
+    engine = TradeEngine(
+        initial_exchange_balance=100000,
+        initial_margin_balance=100000,
+        liquidity=LiquidityModel(participation=0.5)
+    )
+    engine.price[Symbol.BTCUSD] = 100
+    return engine
+
+
+@pytest.fixture
+def fills(engine: TradeEngine) -> list[Fill]:
+    return record_fills(engine)
+
+
+def record_fills(engine: TradeEngine) -> list[Fill]:
+    fills = []
+    engine.add_listener(lambda event: fills.append(event.fill) if event.type == EngineEventType.FILL else None)
+    return fills
+
+
+def make_order(id, price, quantity, order_type=OrderType.LIMIT, mts=1):
+    return Order(
+        id=id,
+        symbol=Symbol.BTCUSD,
+        price=price,
+        quantity=quantity,
+        status=OrderStatus.ACTIVE,
+        order_type=order_type,
+        mts_create=mts,
+        mts_update=mts
+    )
+
+
+def test_orders_fill_partially_across_ticks(engine: TradeEngine, fills: list[Fill]):
+    engine.add_order(make_order(0, 95, 3.0))
+
+    first = engine.apply_price(Symbol.BTCUSD, 94, mts=2, volume=4)
+    second = engine.apply_price(Symbol.BTCUSD, 93, mts=3, volume=4)
+
+    assert [(order.status, order.filled) for order in first] == [(OrderStatus.PARTIALLY_FILLED, 2.0)]
+    assert [(order.status, order.filled) for order in second] == [(OrderStatus.EXECUTED, 3.0)]
+    # first fill is a maker fill at the limit, the rest is through the market at the new price
+    assert [(fill.quantity, fill.price, fill.taker) for fill in fills] == [(2.0, 95, False), (1.0, 93, True)]
+    assert engine.orders == {}
+    assert [order.status for order in engine.order_history] == [
+        OrderStatus.ACTIVE, OrderStatus.PARTIALLY_FILLED, OrderStatus.EXECUTED
+    ]
+
+
+def test_best_priced_orders_fill_first(engine: TradeEngine):
+    engine.add_order(make_order(0, 96, 1.0))
+    engine.add_order(make_order(1, 98, 1.0))
+    engine.add_order(make_order(2, 98, 1.0))
+
+    executed = engine.apply_price(Symbol.BTCUSD, 95, mts=2, volume=4)
+
+    assert [order.id for order in executed] == [1, 2]
+    assert list(engine.orders) == [0]
+
+
+def test_marketable_limit_executes_on_submit(engine: TradeEngine, fills: list[Fill]):
+    order = engine.add_order(make_order(0, 105, 1.0, OrderType.EXCHANGE_LIMIT))
+
+    assert order.status == OrderStatus.EXECUTED
+    assert fills[0].price == 100 and fills[0].taker
+    assert engine.balance[BalanceType.EXCHANGE] == pytest.approx(100000 - 100 * (1 - engine.taker_fee))
+    assert order.id not in engine.book
+
+
+def test_market_order_remainder_keeps_filling(engine: TradeEngine, fills: list[Fill]):
+    engine.apply_price(Symbol.BTCUSD, 100, mts=1, volume=2)
+
+    order = engine.add_order(make_order(0, 0, -3.0, OrderType.MARKET, mts=1))
+    assert (order.status, order.filled) == (OrderStatus.PARTIALLY_FILLED, -1.0)
+
+    executed = engine.apply_price(Symbol.BTCUSD, 101, mts=2, volume=10)
+    assert (executed[0].status, executed[0].filled) == (OrderStatus.EXECUTED, -3.0)
+    assert fills[-1].price == 101
+
+
+def test_default_volume_fills_in_full():
+    engine = TradeEngine(initial_margin_balance=100000, liquidity=LiquidityModel())
+    engine.price[Symbol.BTCUSD] = 100
+    engine.add_order(make_order(0, 95, 1000.0))
+
+    executed = engine.apply_price(Symbol.BTCUSD, 90, mts=2)
+
+    assert executed[0].status == OrderStatus.EXECUTED
+
+
+def test_invalid_participation_raises():
+    with pytest.raises(ValueError, match="participation"):
+        LiquidityModel(participation=0)
@@ -1,5 +1,6 @@
+from dataclasses import dataclass
 import pytest
-from trading.mock_exchange.engine import TradeEngine
+from trading.mock_exchange.engine import TradeEngine, EngineEventType
 from trading.types import Order, OrderStatus, Symbol, OrderType, BalanceType
 
 
@@ -96,3 +97,70 @@ def test_invalid_order_type_raises(basic_engine: TradeEngine):
 
     with pytest.raises(ValueError, match="Unkown order type"):
         basic_engine.update_balance_with_order(invalid_order)
+
+
+def test_trigger_only_crossed_orders(basic_engine: TradeEngine, buy_order: Order, sell_order: Order):
+    basic_engine.add_order(buy_order)
+    basic_engine.add_order(sell_order)
+    basic_engine.price[Symbol.BTCUSD] = 35000
+
+    result = basic_engine.update_price(Symbol.BTCUSD, 29000, mts=3)
+
+    assert [order["id"] for order in result["triggered_orders"]] == [buy_order.id]
+    assert sell_order.id in basic_engine.orders
+    assert buy_order.id not in basic_engine.book
+
+
+def test_listeners_receive_events(basic_engine: TradeEngine, buy_order: Order):
+    events = []
+    basic_engine.add_listener(events.append)
+    basic_engine.price[Symbol.BTCUSD] = 31000
+
+    basic_engine.add_order(buy_order)
+    basic_engine.update_price(Symbol.BTCUSD, 29000, mts=3)
+
+    assert [event.type for event in events] == [
+        EngineEventType.SUBMIT, EngineEventType.FILL, EngineEventType.EXECUTE, EngineEventType.PRICE
+    ]
+    assert (events[1].fill.order_id, events[1].fill.price) == (buy_order.id, 30000)
+    assert events[2].orders[0].status == OrderStatus.EXECUTED
+    assert events[3].price == 29000
+
+
+@dataclass
+class Candle:
+    timestamp: int
+    open: float
+    high: float
+    low: float
+    close: float
+
+
+def test_update_candle_triggers_orders_in_range(basic_engine: TradeEngine, buy_order: Order, sell_order: Order):
+    basic_engine.add_order(buy_order)
+    basic_engine.add_order(sell_order)
+    basic_engine.price[Symbol.BTCUSD] = 35000
+
+    result = basic_engine.update_candle(
+        Symbol.BTCUSD, Candle(timestamp=3, open=35000, high=40500, low=29000, close=36000)
+    )
+
+    assert [order["id"] for order in result["triggered_orders"]] == [sell_order.id, buy_order.id]
+    assert result["price"] == 36000
+    assert basic_engine.price[Symbol.BTCUSD] == 36000
+    assert basic_engine.orders == {}
+
+
+def test_first_candle_starts_at_open(basic_engine: TradeEngine, buy_order: Order):
+    events = []
+    basic_engine.add_listener(events.append)
+    basic_engine.add_order(buy_order)
+
+    executed = basic_engine.apply_candle(
+        Symbol.BTCUSD, Candle(timestamp=3, open=31000, high=31500, low=29500, close=30500)
+    )
+
+    assert [order.id for order in executed] == [buy_order.id]
+    assert [event.type for event in events] == [
+        EngineEventType.SUBMIT, EngineEventType.FILL, EngineEventType.EXECUTE, EngineEventType.PRICE
+    ]
@@ -0,0 +1,46 @@
+import asyncio
+from trading.mock_exchange.engine import EngineEvent, EngineEventType
+from trading.mock_exchange.notifications import NotificationHub, to_message
+from trading.types import Fill, OrderType, Symbol
+
+
+def test_publish_filters_by_symbol():
+    async def run():
+        hub = NotificationHub()
+        btc = hub.subscribe({Symbol.BTCUSD})
+        everything = hub.subscribe()
+        hub.publish(EngineEvent(EngineEventType.PRICE, 1, Symbol.BTCUSD, price=100))
+        hub.publish(EngineEvent(EngineEventType.PRICE, 1, Symbol.ETHUSD, price=10))
+        return btc.queue.qsize(), everything.queue.qsize()
+
+    assert asyncio.run(run()) == (1, 2)
+
+
+def test_slow_subscriber_overflows():
+    async def run():
+        hub = NotificationHub()
+        subscription = hub.subscribe(max_pending=1)
+        for mts in range(2):
+            hub.publish(EngineEvent(EngineEventType.PRICE, mts, Symbol.BTCUSD, price=100))
+        return subscription.overflowed
+
+    assert asyncio.run(run())
+
+
+def test_price_message():
+    message = to_message(EngineEvent(EngineEventType.PRICE, 5, Symbol.BTCUSD, price=100))
+
+    assert message == {"type": "price", "data": {"mts": 5, "symbol": Symbol.BTCUSD, "price": 100}}
+
+
+def test_fill_message():
+    fill = Fill(1, Symbol.BTCUSD, OrderType.LIMIT, 5, 0.5, 100, taker=False)
+    message = to_message(EngineEvent(EngineEventType.FILL, 5, Symbol.BTCUSD, fill=fill))
+
+    assert message == {
+        "type": "fill",
+        "data": {
+            "order_id": 1, "symbol": "BTCUSD", "order_type": "LIMIT", "mts": 5,
+            "quantity": 0.5, "price": 100, "taker": False
+        }
+    }
@@ -0,0 +1,75 @@
+from trading.mock_exchange.book import OrderBook
+from trading.types import Order, OrderStatus, Symbol, OrderType
+
+
+def make_order(id, price, quantity=1.0, symbol=Symbol.BTCUSD):
+    return Order(
+        id=id,
+        symbol=symbol,
+        price=price,
+        quantity=quantity,
+        status=OrderStatus.ACTIVE,
+        order_type=OrderType.LIMIT,
+        mts_create=1,
+        mts_update=1
+    )
+
+
+def test_crossed_returns_orders_in_band():
+    book = OrderBook()
+    for id, price in enumerate([100, 200, 300, 400]):
+        book.add(make_order(id, price))
+
+    assert book.crossed(Symbol.BTCUSD, 200, 300) == [1, 2]
+    assert book.crossed(Symbol.BTCUSD, 401, 500) == []
+
+
+def test_crossed_keeps_insertion_order_across_sides():
+    book = OrderBook()
+    book.add(make_order(0, 300, quantity=-1.0))
+    book.add(make_order(1, 200, quantity=1.0))
+    book.add(make_order(2, 250, quantity=-1.0))
+
+    assert book.crossed(Symbol.BTCUSD, 0, 1000) == [0, 1, 2]
+
+
+def test_crossed_filters_symbol():
+    book = OrderBook()
+    book.add(make_order(0, 100, symbol=Symbol.BTCUSD))
+    book.add(make_order(1, 100, symbol=Symbol.ETHUSD))
+
+    assert book.crossed(Symbol.ETHUSD, 100, 100) == [1]
+
+
+def test_remove():
+    book = OrderBook()
+    book.add(make_order(0, 100))
+    book.add(make_order(1, 100))
+    book.remove(0)
+
+    assert 0 not in book
+    assert len(book) == 1
+    assert book.crossed(Symbol.BTCUSD, 100, 100) == [1]
+
+
+def test_marketable_yields_best_price_first():
+    book = OrderBook()
+    for id, price in enumerate([100, 102, 101, 102]):
+        book.add(make_order(id, price, 1.0))
+    for id, price in enumerate([105, 103, 104], start=10):
+        book.add(make_order(id, price, -1.0))
+
+    assert list(book.marketable(Symbol.BTCUSD, True, 101)) == [1, 3, 2]
+    assert list(book.marketable(Symbol.BTCUSD, False, 104)) == [11, 12]
+    assert list(book.marketable(Symbol.ETHUSD, True, 0)) == []
+
+
+def test_reached_yields_triggers_in_path_order():
+    book = OrderBook()
+    for id, price in enumerate([105, 103, 110, 103]):
+        book.add(make_order(id, price, 1.0))
+    for id, price in enumerate([95, 97, 90], start=10):
+        book.add(make_order(id, price, -1.0))
+
+    assert book.reached(Symbol.BTCUSD, True, 105) == [(103, 1), (103, 3), (105, 0)]
+    assert book.reached(Symbol.BTCUSD, False, 95) == [(97, 11), (95, 10)]
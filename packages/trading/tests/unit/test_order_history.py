@@ -0,0 +1,124 @@
+import dataclasses
+import pytest
+from trading.mock_exchange.history import OrderHistory
+from trading.types import Order, OrderEvent, OrderStatus, Symbol, OrderType
+
+
+@pytest.fixture
+def order():
+    return Order(
+        id=0,
+        symbol=Symbol.BTCUSD,
+        price=30000,
+        quantity=1.0,
+        status=OrderStatus.ACTIVE,
+        order_type=OrderType.LIMIT,
+        mts_create=1,
+        mts_update=1
+    )
+
+
+def test_orders_are_immutable(order: Order):
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        order.status = OrderStatus.EXECUTED
+
+
+def test_with_status(order: Order):
+    executed = order.with_status(OrderStatus.EXECUTED, 5)
+
+    assert executed == dataclasses.replace(order, status=OrderStatus.EXECUTED, mts_update=5)
+    assert order.status == OrderStatus.ACTIVE
+
+
+def test_to_dict_matches_asdict(order: Order):
+    assert order.to_dict() == dataclasses.asdict(order)
+
+
+def test_history_records_deltas(order: Order):
+    history = OrderHistory()
+    history.submit(order)
+    canceled = history.record(order.id, OrderStatus.CANCELED, 3)
+
+    assert list(history.iter_events()) == [
+        OrderEvent(order.id, OrderStatus.ACTIVE, 1),
+        OrderEvent(order.id, OrderStatus.CANCELED, 3),
+    ]
+    assert history[0] is order
+    assert history[-1] == canceled
+    assert list(reversed(history)) == [canceled, order]
+    assert len(history) == 2
+
+
+def test_resubmitted_order_keeps_earlier_deltas(order: Order):
+    """Test resubmitting an order id does not rewrite the deltas recorded for the earlier order"""
+    history = OrderHistory()
+    history.submit(order)
+    canceled = history.record(order.id, OrderStatus.CANCELED, 3)
+    replacement = dataclasses.replace(order, symbol=Symbol.ETHUSD, price=2000, quantity=2.0, mts_update=4)
+    history.submit(replacement)
+    executed = history.record(order.id, OrderStatus.EXECUTED, 5)
+
+    assert list(history) == [order, canceled, replacement, executed]
+    assert canceled.price == 30000 and executed.price == 2000
+    assert history.query(order_id=order.id, symbol=Symbol.BTCUSD).orders == [order, canceled]
+    assert history.query(status=OrderStatus.EXECUTED).orders == [executed]
+
+
+@pytest.fixture
+def filled_history():
+    history = OrderHistory(segment_size=4)
+    for id in range(10):
+        symbol = Symbol.BTCUSD if id % 2 == 0 else Symbol.ETHUSD
+        history.submit(Order(id, symbol, id, id, 1.0, OrderType.LIMIT, 100, OrderStatus.ACTIVE))
+    for id in range(0, 10, 3):
+        history.record(id, OrderStatus.EXECUTED, 100 + id)
+    return history
+
+
+def test_query_filters(filled_history: OrderHistory):
+    page = filled_history.query(symbol=Symbol.BTCUSD, status=OrderStatus.EXECUTED)
+
+    assert [order.id for order in page.orders] == [0, 6]
+    assert all(order.status == OrderStatus.EXECUTED for order in page.orders)
+    assert page.next_cursor is None
+
+
+def test_query_time_range(filled_history: OrderHistory):
+    page = filled_history.query(start=3, end=5)
+
+    assert [order.id for order in page.orders] == [3, 4, 5]
+
+
+def test_query_order_id(filled_history: OrderHistory):
+    page = filled_history.query(order_id=3)
+
+    assert [order.status for order in page.orders] == [OrderStatus.ACTIVE, OrderStatus.EXECUTED]
+
+
+def test_query_pagination(filled_history: OrderHistory):
+    seen = []
+    cursor = None
+    while True:
+        page = filled_history.query(cursor=cursor, limit=3)
+        seen.extend(page.seqs)
+        if page.next_cursor is None:
+            break
+        cursor = page.next_cursor
+
+    assert seen == list(range(len(filled_history)))
+
+
+def test_query_descending_pagination(filled_history: OrderHistory):
+    first = filled_history.query(limit=5, ascending=False)
+    second = filled_history.query(limit=5, ascending=False, cursor=first.next_cursor)
+
+    assert first.seqs == [13, 12, 11, 10, 9]
+    assert second.seqs == [8, 7, 6, 5, 4]
+
+
+def test_page_columns(filled_history: OrderHistory):
+    columns = filled_history.query(order_id=0).to_columns()
+
+    assert columns["seq"] == [0, 10]
+    assert columns["status"] == [OrderStatus.ACTIVE, OrderStatus.EXECUTED]
+    assert columns["mts_update"] == [0, 100]
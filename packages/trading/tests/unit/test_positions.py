@@ -0,0 +1,111 @@
+import math
+import pytest
+from trading.mock_exchange.engine import TradeEngine
+from trading.mock_exchange.positions import Position, PositionLedger
+from trading.types import Order, OrderStatus, Symbol, OrderType, BalanceType
+
+
+def test_position_average_entry_and_realized_pnl():
+    position = Position(Symbol.BTCUSD, BalanceType.MARGIN)
+    position.fill(1.0, 100)
+    position.fill(1.0, 110)
+    assert position.avg_price == 105
+
+    position.fill(-1.5, 120)
+    assert position.realized_pnl == pytest.approx(22.5)
+    assert position.quantity == 0.5 and position.avg_price == 105
+
+
+def test_position_flip_opens_remainder_at_fill_price():
+    position = Position(Symbol.BTCUSD, BalanceType.MARGIN)
+    position.fill(-1.0, 100)
+    position.fill(3.0, 90)
+
+    assert position.realized_pnl == 10
+    assert (position.quantity, position.avg_price) == (2.0, 90)
+
+    position.mark(95)
+    assert position.unrealized_pnl == 10
+    assert position.exposure == 190
+
+
+def test_position_ignores_zero_quantity_fill():
+    position = Position(Symbol.BTCUSD, BalanceType.MARGIN)
+    position.fill(0.0, 100)
+    assert (position.quantity, position.avg_price, position.realized_pnl) == (0.0, 0.0, 0.0)
+
+
+def test_ledger_totals_follow_fills_and_marks():
+    ledger = PositionLedger()
+    ledger.fill(Symbol.BTCUSD, BalanceType.MARGIN, 1.0, 100)
+    ledger.fill(Symbol.ETHUSD, BalanceType.EXCHANGE, -2.0, 10)
+
+    ledger.mark(Symbol.BTCUSD, 120)
+    ledger.mark(Symbol.ETHUSD, 8)
+
+    assert ledger.unrealized_pnl == pytest.approx(24)
+    assert ledger.net_exposure == pytest.approx(104)
+    assert ledger.gross_exposure == pytest.approx(136)
+
+    ledger.fill(Symbol.BTCUSD, BalanceType.MARGIN, -1.0, 130)
+    assert ledger.realized_pnl == pytest.approx(30)
+    assert ledger.unrealized_pnl == pytest.approx(4)
+
+
+def test_ledger_totals_do_not_drift():
+    ledger = PositionLedger()
+    symbols = (Symbol.BTCUSD, Symbol.ETHUSD)
+    for i in range(100_000):
+        symbol = symbols[i % 2]
+        ledger.fill(symbol, BalanceType.MARGIN, 0.1 if i % 3 else -0.2, 100 + (i % 7) * 0.1)
+        ledger.mark(symbol, 100 + (i % 11) * 0.3)
+
+    positions = ledger.positions.values()
+    assert ledger.realized_pnl == math.fsum(position.realized_pnl for position in positions)
+    assert ledger.unrealized_pnl == math.fsum(position.unrealized_pnl for position in positions)
+    assert ledger.net_exposure == math.fsum(position.exposure for position in positions)
+    assert ledger.gross_exposure == math.fsum(abs(position.exposure) for position in positions)
+
+
+def test_engine_tracks_positions_from_fills():
+    engine = TradeEngine(initial_margin_balance=100000)
+    engine.price[Symbol.BTCUSD] = 31000
+    engine.add_order(Order(
+        id=0,
+        symbol=Symbol.BTCUSD,
+        price=30000,
+        quantity=1.0,
+        status=OrderStatus.ACTIVE,
+        order_type=OrderType.LIMIT,
+        mts_create=1,
+        mts_update=1
+    ))
+
+    engine.apply_price(Symbol.BTCUSD, 29000, mts=2)
+    engine.apply_price(Symbol.BTCUSD, 32000, mts=3)
+
+    summary = engine.get_positions()
+    assert summary["unrealized_pnl"] == 2000
+    assert summary["positions"][0]["quantity"] == 1.0
+    assert summary["positions"][0]["balance_type"] == BalanceType.MARGIN
+
+
+def test_engine_executes_zero_quantity_order():
+    engine = TradeEngine(initial_margin_balance=100000)
+    engine.price[Symbol.BTCUSD] = 31000
+    engine.add_order(Order(
+        id=0,
+        symbol=Symbol.BTCUSD,
+        price=30000,
+        quantity=0.0,
+        status=OrderStatus.ACTIVE,
+        order_type=OrderType.LIMIT,
+        mts_create=1,
+        mts_update=1
+    ))
+
+    triggered_orders = engine.apply_price(Symbol.BTCUSD, 29000, mts=2)
+
+    assert [order.status for order in triggered_orders] == [OrderStatus.EXECUTED]
+    assert engine.balance[BalanceType.MARGIN] == 100000
+    assert engine.get_positions()["positions"][0]["quantity"] == 0.0
@@ -0,0 +1,113 @@
+import pytest
+from trading.mock_exchange.engine import EngineEventType, TradeEngine
+from trading.mock_exchange.liquidity import LiquidityModel
+from trading.mock_exchange.simulation import Simulation, OrderIntent
+from trading.mock_exchange.utils import create_order_id
+from trading.types import Order, OrderStatus, Symbol, OrderType, BalanceType
+
+
+@pytest.fixture
+def simulation():
+    return Simulation(TradeEngine(initial_exchange_balance=100000, initial_margin_balance=100000))
+
+
+def test_run_fills_crossed_orders(simulation: Simulation):
+    intents = [
+        OrderIntent(mts=1, symbol=Symbol.BTCUSD, amount=1.0, price=30000, order_type=OrderType.LIMIT),
+        OrderIntent(mts=1, symbol=Symbol.BTCUSD, amount=-1.0, price=40000, order_type=OrderType.LIMIT),
+    ]
+    result = simulation.run(
+        mts=[0, 1, 2, 3],
+        symbols=[Symbol.BTCUSD] * 4,
+        prices=[35000, 31000, 29000, 41000],
+        intents=intents
+    )
+
+    assert list(result.fills["mts"]) == [2, 3]
+    assert list(result.fills["order_id"]) == [1, 2]
+    assert list(result.fills["price"]) == [30000, 40000]
+    assert list(result.balances[BalanceType.MARGIN]) == [70030.0, 109990.0]
+    assert simulation.engine.orders == {}
+
+
+def test_first_tick_per_symbol_sets_price(simulation: Simulation):
+    intents = [OrderIntent(mts=0, symbol=Symbol.BTCUSD, amount=1.0, price=30000, order_type=OrderType.LIMIT)]
+    result = simulation.run(
+        mts=[0, 1],
+        symbols=[Symbol.BTCUSD, Symbol.ETHUSD],
+        prices=[30000, 2000],
+        intents=intents
+    )
+
+    assert len(result.fills["mts"]) == 0
+    assert simulation.engine.price == {Symbol.BTCUSD: 30000, Symbol.ETHUSD: 2000}
+
+
+def test_first_tick_reaches_listeners(simulation: Simulation):
+    events = []
+    simulation.engine.add_listener(events.append)
+    simulation.run(mts=[0, 1], symbols=[Symbol.BTCUSD] * 2, prices=[30000, 31000])
+
+    assert [(event.type, event.mts, event.price) for event in events] == [
+        (EngineEventType.PRICE, 0, 30000),
+        (EngineEventType.PRICE, 1, 31000),
+    ]
+
+
+def test_strategy_submits_intents(simulation: Simulation):
+    def strategy(mts, symbol, price, executed):
+        if mts == 0:
+            return [OrderIntent(mts, symbol, 1.0, price - 100, OrderType.EXCHANGE_LIMIT)]
+
+    result = simulation.run(
+        mts=[0, 1],
+        symbols=[Symbol.BTCUSD] * 2,
+        prices=[30000, 29000],
+        strategy=strategy
+    )
+
+    assert list(result.fills["order_type"]) == [OrderType.EXCHANGE_LIMIT]
+    assert result.balances[BalanceType.EXCHANGE][-1] == pytest.approx(100000 - 29900 * 0.999)
+
+
+def test_mismatched_columns_raise(simulation: Simulation):
+    with pytest.raises(ValueError, match="equal lengths"):
+        simulation.run(mts=[0], symbols=[], prices=[1.0])
+
+
+def test_volumes_limit_fills_with_liquidity_model():
+    simulation = Simulation(TradeEngine(initial_margin_balance=100000, liquidity=LiquidityModel(participation=0.5)))
+    intents = [OrderIntent(mts=0, symbol=Symbol.BTCUSD, amount=2.0, price=30000, order_type=OrderType.LIMIT)]
+    result = simulation.run(
+        mts=[0, 1, 2],
+        symbols=[Symbol.BTCUSD] * 3,
+        prices=[31000, 29000, 29000],
+        intents=intents,
+        volumes=[0, 2, 2]
+    )
+
+    assert list(result.fills["mts"]) == [1, 2]
+    assert list(result.fills["quantity"]) == [1.0, 1.0]
+    assert list(result.fills["price"]) == [30000, 29000]
+
+
+def test_engine_with_api_orders():
+    """Test an engine holding orders with 128-bit ids, like the HTTP API creates"""
+    engine = TradeEngine(initial_margin_balance=100000)
+    engine.price[Symbol.BTCUSD] = 35000
+    api_order_id = create_order_id()
+    engine.add_order(Order(
+        id=api_order_id,
+        symbol=Symbol.BTCUSD,
+        mts_create=0,
+        mts_update=0,
+        quantity=1.0,
+        order_type=OrderType.LIMIT,
+        price=30000,
+        status=OrderStatus.ACTIVE
+    ))
+    simulation = Simulation(engine)
+    intents = [OrderIntent(mts=1, symbol=Symbol.BTCUSD, amount=1.0, price=31000, order_type=OrderType.LIMIT)]
+    result = simulation.run(mts=[1, 2], symbols=[Symbol.BTCUSD] * 2, prices=[34000, 29000], intents=intents)
+
+    assert sorted(result.fills["order_id"]) == [api_order_id, api_order_id + 1]
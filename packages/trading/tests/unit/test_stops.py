@@ -0,0 +1,124 @@
+import pytest
+from trading.mock_exchange.engine import EngineEventType, TradeEngine
+from trading.mock_exchange.liquidity import LiquidityModel
+from trading.types import Order, OrderStatus, Symbol, OrderType, BalanceType, Fill
+
+
+@pytest.fixture
+def engine():
+    engine = TradeEngine(initial_exchange_balance=100000, initial_margin_balance=100000)
+    engine.price[Symbol.BTCUSD] = 100
+    return engine
+
+
+@pytest.fixture
+def fills(engine: TradeEngine) -> list[Fill]:
+    return record_fills(engine)
+
+
+def record_fills(engine: TradeEngine) -> list[Fill]:
+    fills = []
+    engine.add_listener(lambda event: fills.append(event.fill) if event.type == EngineEventType.FILL else None)
+    return fills
+
+
+def make_stop(id, price, quantity, order_type=OrderType.STOP, price_aux_limit=None):
+    return Order(
+        id=id,
+        symbol=Symbol.BTCUSD,
+        price=price,
+        quantity=quantity,
+        status=OrderStatus.ACTIVE,
+        order_type=order_type,
+        mts_create=1,
+        mts_update=1,
+        price_aux_limit=price_aux_limit
+    )
+
+
+def test_stops_wait_for_their_trigger(engine: TradeEngine):
+    engine.add_order(make_stop(0, 105, 1.0))
+    engine.add_order(make_stop(1, 95, -1.0))
+
+    assert engine.apply_price(Symbol.BTCUSD, 96, mts=2) == []
+    assert engine.apply_price(Symbol.BTCUSD, 104, mts=3) == []
+    assert 0 in engine.stops and 1 in engine.stops
+    assert 0 not in engine.book
+
+
+def test_stop_executes_at_trigger_as_taker(engine: TradeEngine, fills: list[Fill]):
+    engine.add_order(make_stop(0, 105, 1.0))
+
+    executed = engine.apply_price(Symbol.BTCUSD, 110, mts=2)
+
+    assert [(order.id, order.status) for order in executed] == [(0, OrderStatus.EXECUTED)]
+    assert (fills[0].price, fills[0].taker) == (105, True)
+    assert engine.balance[BalanceType.MARGIN] == pytest.approx(100000 - 105 * (1 - engine.taker_fee))
+    assert engine.orders == {} and 0 not in engine.stops
+
+
+def test_sell_stops_trigger_highest_first(engine: TradeEngine, fills: list[Fill]):
+    engine.add_order(make_stop(0, 90, -1.0))
+    engine.add_order(make_stop(1, 98, -1.0))
+    engine.add_order(make_stop(2, 80, -1.0))
+
+    executed = engine.apply_price(Symbol.BTCUSD, 85, mts=2)
+
+    assert [(order.id, order.mts_update) for order in executed] == [(1, 2), (0, 2)]
+    assert [fill.price for fill in fills] == [98, 90]
+    assert list(engine.orders) == [2]
+
+
+def test_stop_limit_rests_at_limit_after_trigger(engine: TradeEngine, fills: list[Fill]):
+    # the price passes 103 before reaching the 105 trigger, so the limit must not fill on the way up
+    engine.add_order(make_stop(0, 105, 1.0, OrderType.STOP_LIMIT, price_aux_limit=103))
+
+    assert engine.apply_price(Symbol.BTCUSD, 110, mts=2) == []
+    assert 0 in engine.book and 0 not in engine.stops
+
+    executed = engine.apply_price(Symbol.BTCUSD, 101, mts=3)
+    assert [order.id for order in executed] == [0]
+    assert (fills[0].price, fills[0].taker) == (103, False)
+
+
+def test_marketable_stop_limit_fills_at_trigger(engine: TradeEngine, fills: list[Fill]):
+    engine.add_order(make_stop(0, 105, 1.0, OrderType.EXCHANGE_STOP_LIMIT, price_aux_limit=107))
+
+    executed = engine.apply_price(Symbol.BTCUSD, 110, mts=2)
+
+    assert [order.status for order in executed] == [OrderStatus.EXECUTED]
+    assert fills[0].price == 105
+
+
+def test_stop_through_the_market_activates_on_submit(engine: TradeEngine, fills: list[Fill]):
+    order = engine.add_order(make_stop(0, 95, 1.0))
+
+    assert order.status == OrderStatus.EXECUTED
+    assert fills[0].price == 100
+
+
+def test_cancel_pending_stop(engine: TradeEngine):
+    engine.add_order(make_stop(0, 105, 1.0))
+    engine.remove_order(0, mts=2)
+
+    assert 0 not in engine.stops
+    assert engine.apply_price(Symbol.BTCUSD, 110, mts=3) == []
+
+
+def test_stop_limit_requires_aux_limit(engine: TradeEngine):
+    with pytest.raises(ValueError, match="price_aux_limit"):
+        engine.add_order(make_stop(0, 105, 1.0, OrderType.STOP_LIMIT))
+
+
+def test_activated_stop_shares_tick_liquidity():
+    engine = TradeEngine(initial_margin_balance=100000, liquidity=LiquidityModel(participation=0.5))
+    engine.price[Symbol.BTCUSD] = 100
+    fills = record_fills(engine)
+    engine.add_order(make_stop(0, 105, 3.0))
+
+    first = engine.apply_price(Symbol.BTCUSD, 110, mts=2, volume=4)
+    second = engine.apply_price(Symbol.BTCUSD, 111, mts=3, volume=4)
+
+    assert [(order.status, order.filled) for order in first] == [(OrderStatus.PARTIALLY_FILLED, 2.0)]
+    assert [(order.status, order.filled) for order in second] == [(OrderStatus.EXECUTED, 3.0)]
+    assert [fill.price for fill in fills] == [105, 111]
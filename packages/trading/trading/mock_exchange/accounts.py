@@ -0,0 +1,81 @@
+import asyncio
+import time
+from typing import Callable
+from trading.mock_exchange.engine import TradeEngine
+from trading.mock_exchange.notifications import NotificationHub
+from trading.mock_exchange.worker import EngineWorker
+
+
+DEFAULT_ACCOUNT_ID = "default"
+
+
+class Account:
+    """
+    An isolated simulation: its own engine, single-writer worker and notification hub.
+    """
+
+    def __init__(self, account_id: str, engine: TradeEngine, now: float):
+        self.id = account_id
+        self.engine = engine
+        self.hub = NotificationHub()
+        self.engine.add_listener(self.hub.publish)
+        self.worker = EngineWorker(engine)
+        self.last_used = now
+        # open websocket connections, an account is never evicted while one is open
+        self.connections = 0
+
+
+class AccountRegistry:
+    """
+    Creates accounts lazily on first use and evicts them once they have been idle
+    for idle_timeout seconds with no open connections.
+    """
+
+    def __init__(
+        self,
+        engine_factory: Callable[[], TradeEngine] = TradeEngine,
+        idle_timeout: float = 600.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.engine_factory = engine_factory
+        self.idle_timeout = idle_timeout
+        self._clock = clock
+        self.accounts: dict[str, Account] = {}
+
+    def get(self, account_id: str = DEFAULT_ACCOUNT_ID) -> Account:
+        """
+        Get the account for account_id, creating it if needed. Must be called from
+        a running event loop since new accounts start their worker.
+        """
+        account = self.accounts.get(account_id)
+        if account is None:
+            account = Account(account_id, self.engine_factory(), self._clock())
+            account.worker.start()
+            self.accounts[account_id] = account
+        account.last_used = self._clock()
+        return account
+
+    async def evict_idle(self) -> list[str]:
+        """Stop and drop idle accounts, returning their ids."""
+        now = self._clock()
+        idle = [
+            account for account in self.accounts.values()
+            if account.connections == 0 and now - account.last_used >= self.idle_timeout
+        ]
+        for account in idle:
+            del self.accounts[account.id]
+        for account in idle:
+            await account.worker.stop()
+        return [account.id for account in idle]
+
+    async def run_eviction(self, interval: float = 60.0):
+        """Evict idle accounts every interval seconds until cancelled."""
+        while True:
+            await asyncio.sleep(interval)
+            await self.evict_idle()
+
+    async def close(self):
+        accounts = list(self.accounts.values())
+        self.accounts.clear()
+        for account in accounts:
+            await account.worker.stop()
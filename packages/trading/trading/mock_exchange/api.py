@@ -1,22 +1,34 @@
-from fastapi import FastAPI, HTTPException
+import asyncio
+import json
+from typing import Any, Callable, Literal
+from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect, Query, Header, Depends
+from fastapi.encoders import jsonable_encoder
 from fastapi.responses import JSONResponse
 from contextlib import asynccontextmanager
 from starlette.exceptions import HTTPException as StarletteHTTPException
 from trading.mock_exchange.engine import TradeEngine
-from trading.mock_exchange.params import OrderParams, CancelParams, UpdatePriceParams, DepositParams
+from trading.mock_exchange.accounts import Account, AccountRegistry, DEFAULT_ACCOUNT_ID
+from trading.mock_exchange.notifications import Subscription, to_message
+from trading.mock_exchange.params import (
+    OrderParams, CancelParams, UpdatePriceParams, UpdateCandleParams, DepositParams
+)
 from trading.mock_exchange.response import OrderResponse
 from trading.mock_exchange.utils import create_order_id
-from trading.types import Order, OrderStatus, OrderNotifStatus
+from trading.types import Order, OrderStatus, OrderNotifStatus, Symbol
+from trading.mock_exchange.history import HistoryPage
 
 
-trade_engine: TradeEngine | None = None
+account_registry: AccountRegistry | None = None
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    global trade_engine
-    trade_engine = TradeEngine()
+    global account_registry
+    account_registry = AccountRegistry()
+    eviction = asyncio.create_task(account_registry.run_eviction())
     yield
-    trade_engine = None
+    eviction.cancel()
+    await account_registry.close()
+    account_registry = None
 
 
 app = FastAPI(lifespan=lifespan)
@@ -27,30 +39,161 @@ async def http_exception_handler(request, exc):
     return JSONResponse(exc.detail, status_code=exc.status_code)
 
 
+async def get_account(x_account_id: str = Header(default=DEFAULT_ACCOUNT_ID)) -> Account:
+    """
+    Resolve the account named by the X-Account-Id header. Each account has its own
+    engine, created on first use. Requests without the header share the default account.
+    """
+    return account_registry.get(x_account_id)
+
+
 @app.get("/orders")
-def retrieve_orders():
-    return trade_engine.get_orders()
+async def retrieve_orders(account: Account = Depends(get_account)):
+    return await account.worker.call(TradeEngine.get_orders)
 
 
 @app.get("/orders/hist")
-def retrieve_order_history():
-    return trade_engine.get_order_history()
+async def retrieve_order_history(account: Account = Depends(get_account)):
+    return await account.worker.call(TradeEngine.get_order_history)
+
+
+@app.get("/orders/hist/query")
+async def query_order_history(
+    start: int | None = None,
+    end: int | None = None,
+    symbol: Symbol | None = None,
+    status: OrderStatus | None = None,
+    order_id: int | None = None,
+    cursor: int | None = None,
+    limit: int = Query(default=1000, gt=0, le=100_000),
+    ascending: bool = True,
+    format: Literal["rows", "columns"] = "rows",
+    account: Account = Depends(get_account)
+):
+    """
+    Filtered, paginated order history. Pass the returned next_cursor back as
+    cursor to fetch the following page; it is null once the query is exhausted.
+    format=columns returns one list per field instead of one object per order.
+    """
+    page: HistoryPage = await account.worker.call(
+        lambda engine: engine.query_order_history(
+            start=start,
+            end=end,
+            symbol=symbol,
+            status=status,
+            order_id=order_id,
+            cursor=cursor,
+            limit=limit,
+            ascending=ascending
+        )
+    )
+    return {
+        "data": page.to_columns() if format == "columns" else page.orders,
+        "next_cursor": page.next_cursor
+    }
+
+
+def internal_error() -> HTTPException:
+    return HTTPException(
+        status_code=500,
+        detail=OrderResponse(
+            mts=-1,
+            data=[],
+            status=OrderNotifStatus.ERROR,
+            text="There was an internal server error. See server logs for details."
+        ).model_dump()
+    )
+
+
+def create_order(engine: TradeEngine, params: OrderParams) -> Order:
+    order = Order(
+        id=create_order_id(),
+        symbol=params.symbol,
+        mts_create=params.mts,
+        mts_update=params.mts,
+        quantity=params.amount,
+        order_type=params.order_type,
+        price=params.price,
+        status=OrderStatus.ACTIVE,
+        price_aux_limit=params.price_aux_limit
+    )
+    return engine.add_order(order)
+
+
+class BatchError(Exception):
+    """
+    An item of a batch failed. The items before it were applied and their results
+    are in results, the items after it were not applied.
+    """
+
+    def __init__(self, index: int, error: Exception, results: list):
+        super().__init__(f"Item {index} of the batch failed: {error}")
+        self.index = index
+        self.error = error
+        self.results = results
+
+
+def apply_batch(fn: Callable[[Any], Any], params_list: list) -> list:
+    """Apply fn to each params in order, stopping at the first failure with a BatchError."""
+    results = []
+    for index, params in enumerate(params_list):
+        try:
+            results.append(fn(params))
+        except Exception as e:
+            raise BatchError(index, e, results) from e
+    return results
+
+
+def batch_error(error: BatchError) -> HTTPException:
+    return HTTPException(
+        status_code=400,
+        detail={
+            "index": error.index,
+            "error": str(error.error),
+            "results": jsonable_encoder(error.results)
+        }
+    )
+
+
+def create_orders(engine: TradeEngine, params_list: list[OrderParams]) -> list[Order]:
+    return apply_batch(lambda params: create_order(engine, params), params_list)
+
+
+def cancel_orders(engine: TradeEngine, params_list: list[CancelParams]) -> OrderResponse:
+    canceled_orders = []
+    missing_ids = []
+    for params in params_list:
+        canceled_order = engine.remove_order(params.id, params.mts)
+        if canceled_order is None:
+            missing_ids.append(params.id)
+        else:
+            canceled_orders.append(canceled_order)
+    return OrderResponse(
+        mts=params_list[-1].mts if params_list else -1,
+        data=canceled_orders,
+        status=OrderNotifStatus.FAILURE if missing_ids else OrderNotifStatus.SUCCESS,
+        text=f"Orders not found: {missing_ids}" if missing_ids else ""
+    )
+
+
+def update_prices(engine: TradeEngine, params_list: list[UpdatePriceParams]) -> list[dict]:
+    return apply_batch(
+        lambda params: engine.update_price(params.symbol, params.price, params.mts, params.volume),
+        params_list
+    )
+
+
+def update_candles(engine: TradeEngine, params_list: list[UpdateCandleParams]) -> list[dict]:
+    return apply_batch(
+        lambda params: engine.update_candle(params.symbol, params, params.volume, params.path),
+        params_list
+    )
 
 
 @app.post("/order/submit")
-def submit_order(params: OrderParams):
+async def submit_order(params: OrderParams, account: Account = Depends(get_account)):
     try:
-        order = Order(
-            id=create_order_id(),
-            symbol=params.symbol,
-            mts_create=params.mts,
-            mts_update=params.mts,
-            quantity=params.amount,
-            order_type=params.order_type,
-            price=params.price,
-            status=OrderStatus.ACTIVE
-        )
-        trade_engine.add_order(order)
+        order = await account.worker.call(create_order, params)
         return OrderResponse(
             mts=order.mts_create,
             data=[order],
@@ -58,21 +201,34 @@ def submit_order(params: OrderParams):
             text=""
             )
     except:
-        raise HTTPException(
-            status_code=500,
-            detail=OrderResponse(
-                mts=-1,
-                data=[],
-                status=OrderNotifStatus.ERROR,
-                text="There was an internal server error. See server logs for details."
-            ).model_dump()
-        )
+        raise internal_error()
+
+
+@app.post("/order/submit/batch")
+async def submit_order_batch(params_list: list[OrderParams], account: Account = Depends(get_account)):
+    """
+    Submit several orders in one request, in the given order. If an order fails,
+    the orders after it are not submitted and the response is a 400 whose detail
+    has the index of the failed order, its error, and the orders submitted before it.
+    """
+    try:
+        orders = await account.worker.call(create_orders, params_list)
+    except BatchError as e:
+        raise batch_error(e)
+    except:
+        raise internal_error()
+    return OrderResponse(
+        mts=orders[-1].mts_create if orders else -1,
+        data=orders,
+        status=OrderNotifStatus.SUCCESS,
+        text=""
+    )
 
 
 @app.post("/orders/cancel")
-def cancel_order(params: CancelParams):
+async def cancel_order(params: CancelParams, account: Account = Depends(get_account)):
     try:
-        canceled_order = trade_engine.remove_order(params.id, params.mts)
+        canceled_order = await account.worker.call(TradeEngine.remove_order, params.id, params.mts)
         return OrderResponse(
             mts=params.mts,
             data=[canceled_order],
@@ -80,27 +236,198 @@ def cancel_order(params: CancelParams):
             text=""
         )
     except:
-        raise HTTPException(
-            status_code=500,
-            detail=OrderResponse(
-                mts=-1,
-                data=[],
-                status=OrderNotifStatus.ERROR,
-                text="There was an internal server error. See server logs for details."
-            ).model_dump()
-        )
+        raise internal_error()
+
+
+@app.post("/orders/cancel/batch")
+async def cancel_order_batch(params_list: list[CancelParams], account: Account = Depends(get_account)):
+    """
+    Cancel several orders in one request. Ids without a resting order are
+    reported in the response text with a FAILURE status.
+    """
+    try:
+        return await account.worker.call(cancel_orders, params_list)
+    except:
+        raise internal_error()
 
 
 @app.post("/price/update")
-def update_price(params: UpdatePriceParams):
-    return trade_engine.update_price(params.symbol, params.price, params.mts)
+async def update_price(params: UpdatePriceParams, account: Account = Depends(get_account)):
+    return await account.worker.call(
+        TradeEngine.update_price, params.symbol, params.price, params.mts, params.volume
+    )
+
+
+@app.post("/price/update/batch")
+async def update_price_batch(params_list: list[UpdatePriceParams], account: Account = Depends(get_account)):
+    """
+    Apply a sequence of price updates in order. Returns one update result per
+    price, each with the orders that price triggered. A failed update stops the
+    batch with a 400 shaped like the one of /order/submit/batch.
+    """
+    try:
+        return await account.worker.call(update_prices, params_list)
+    except BatchError as e:
+        raise batch_error(e)
+
+
+@app.post("/candle/update")
+async def update_candle(params: UpdateCandleParams, account: Account = Depends(get_account)):
+    """
+    Move the price through a whole OHLC candle in one call, triggering every order
+    inside its range. Returns the same shape as /price/update with the close as price.
+    """
+    return await account.worker.call(
+        TradeEngine.update_candle, params.symbol, params, params.volume, params.path
+    )
+
+
+@app.post("/candle/update/batch")
+async def update_candle_batch(params_list: list[UpdateCandleParams], account: Account = Depends(get_account)):
+    """
+    Apply a sequence of candles in order, one update result per candle. A failed
+    candle stops the batch like in /price/update/batch.
+    """
+    try:
+        return await account.worker.call(update_candles, params_list)
+    except BatchError as e:
+        raise batch_error(e)
+
+
+STREAM_OPERATIONS = {
+    "order.submit": (OrderParams, lambda engine, params: OrderResponse(
+        mts=params.mts,
+        data=[create_order(engine, params)],
+        status=OrderNotifStatus.SUCCESS,
+        text=""
+    )),
+    "order.cancel": (CancelParams, lambda engine, params: cancel_orders(engine, [params])),
+    "price.update": (UpdatePriceParams, lambda engine, params: engine.update_price(
+        params.symbol, params.price, params.mts, params.volume
+    )),
+    "candle.update": (UpdateCandleParams, lambda engine, params: engine.update_candle(
+        params.symbol, params, params.volume, params.path
+    )),
+}
+
+
+def parse_message(text: str) -> tuple[dict | None, str | None]:
+    """Parse a websocket message that must be a JSON object, returning it or an error."""
+    try:
+        message = json.loads(text)
+    except ValueError as e:
+        return None, f"Message is not valid JSON: {e}"
+    if not isinstance(message, dict):
+        return None, f"Message must be a JSON object. Received {text}."
+    return message, None
+
+
+@app.websocket("/stream")
+async def stream(websocket: WebSocket, account: Account = Depends(get_account)):
+    """
+    Pipelined access to the engine over a websocket.
+
+    Each message is {"op": "order.submit" | "order.cancel" | "price.update" | "candle.update",
+    "params": {...}}
+    with params shaped like the matching HTTP endpoint. Messages are applied in the
+    order received and each gets exactly one reply, {"op": ..., "result": ...} or
+    {"op": ..., "error": ...}, so clients can keep sending without waiting. Messages
+    that are not a JSON object get an error reply with a null op.
+    """
+    await websocket.accept()
+    account.connections += 1
+    try:
+        while True:
+            message, error = parse_message(await websocket.receive_text())
+            if error is not None:
+                await websocket.send_json({"op": None, "error": error})
+                continue
+            op = message.get("op")
+            if not isinstance(op, str) or op not in STREAM_OPERATIONS:
+                await websocket.send_json({"op": op, "error": f"Unknown op '{op}'"})
+                continue
+            params_model, handler = STREAM_OPERATIONS[op]
+            try:
+                params = params_model.model_validate(message.get("params", {}))
+                result = await account.worker.call(handler, params)
+            except Exception as e:
+                await websocket.send_json({"op": op, "error": str(e)})
+                continue
+            await websocket.send_json({"op": op, "result": jsonable_encoder(result)})
+    except WebSocketDisconnect:
+        pass
+    finally:
+        account.connections -= 1
+
+
+def deposit(engine: TradeEngine, params: DepositParams) -> dict:
+    return dict(engine.add_balance(params.amount, params.balance_type))
 
 
 @app.get("/balance")
-def get_balance():
-    return trade_engine.balance
+async def get_balance(account: Account = Depends(get_account)):
+    return await account.worker.call(lambda engine: dict(engine.balance))
+
+
+@app.get("/positions")
+async def get_positions(account: Account = Depends(get_account)):
+    """
+    Positions with average entry price, realized and unrealized PnL (before fees)
+    and exposure, plus totals across all positions.
+    """
+    return await account.worker.call(TradeEngine.get_positions)
 
 
 @app.post("/balance/deposit")
-def deposit_balance(params: DepositParams):
-    return trade_engine.add_balance(params.amount)
+async def deposit_balance(params: DepositParams, account: Account = Depends(get_account)):
+    return await account.worker.call(deposit, params)
+
+
+async def send_notifications(websocket: WebSocket, subscription: Subscription):
+    while True:
+        event = await subscription.queue.get()
+        if subscription.overflowed:
+            await websocket.close(code=1013, reason="Subscriber fell too far behind.")
+            return
+        await websocket.send_json(to_message(event))
+
+
+@app.websocket("/notifications")
+async def notifications(
+    websocket: WebSocket,
+    symbols: str | None = None,
+    account: Account = Depends(get_account)
+):
+    """
+    Push feed of order (submit, cancel, execute), fill and price events.
+
+    Pass ?symbols=BTCUSD,ETHUSD to only receive those symbols (default is all).
+    The filter can be changed later by sending {"subscribe": [...]} or
+    {"unsubscribe": [...]}.
+    """
+    await websocket.accept()
+    try:
+        symbol_filter = {Symbol(symbol) for symbol in symbols.split(",")} if symbols else set()
+    except ValueError as e:
+        await websocket.close(code=1003, reason=str(e))
+        return
+    subscription = account.hub.subscribe(symbol_filter)
+    account.connections += 1
+    sender = asyncio.create_task(send_notifications(websocket, subscription))
+    try:
+        while True:
+            message, error = parse_message(await websocket.receive_text())
+            if error is not None:
+                await websocket.send_json({"error": error})
+                continue
+            try:
+                subscription.symbols.update(Symbol(symbol) for symbol in message.get("subscribe", ()))
+                subscription.symbols.difference_update(Symbol(symbol) for symbol in message.get("unsubscribe", ()))
+            except (TypeError, ValueError) as e:
+                await websocket.send_json({"error": str(e)})
+    except WebSocketDisconnect:
+        pass
+    finally:
+        sender.cancel()
+        account.connections -= 1
+        account.hub.unsubscribe(subscription)
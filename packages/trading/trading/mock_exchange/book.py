@@ -0,0 +1,98 @@
+from bisect import bisect_left, bisect_right, insort
+from itertools import count
+from typing import Iterator
+from trading.types import Order, Symbol
+
+
+class OrderBook:
+    """
+    Index of resting orders kept sorted by price, per symbol and side.
+
+    Each entry is a (price, seq, order_id) key, where seq records insertion order.
+    Finding the orders inside a price band is a pair of binary searches, so a price
+    update only touches the orders it actually crosses.
+    """
+
+    def __init__(self):
+        self._sides: dict[tuple[Symbol, bool], list[tuple[float, int, int]]] = {}
+        self._keys: dict[int, tuple[list, tuple[float, int, int]]] = {}
+        self._seq = count()
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __contains__(self, order_id: int):
+        return order_id in self._keys
+
+    def add(self, order: Order, price: float | None = None):
+        """
+        Add a resting order, keyed by its own price unless another price is given.
+        """
+        side = self._sides.setdefault((order.symbol, order.quantity > 0), [])
+        key = (order.price if price is None else price, next(self._seq), order.id)
+        insort(side, key)
+        self._keys[order.id] = (side, key)
+
+    def remove(self, order_id: int):
+        side, key = self._keys.pop(order_id)
+        del side[bisect_left(side, key)]
+
+    def crossed(self, symbol: Symbol, low: float, high: float) -> list[int]:
+        """
+        Get the ids of orders for symbol priced within [low, high], in insertion order.
+        """
+        keys = []
+        for is_buy in (True, False):
+            side = self._sides.get((symbol, is_buy))
+            if side:
+                lo = bisect_left(side, (low,))
+                hi = bisect_right(side, (high, float("inf")))
+                keys.extend(side[lo:hi])
+        keys.sort(key=lambda key: key[1])
+        return [key[2] for key in keys]
+
+    def marketable(self, symbol: Symbol, is_buy: bool, limit: float) -> Iterator[int]:
+        """
+        Lazily yield the ids of orders on one side of symbol that would trade at limit
+        (buys priced at or above it, sells at or below it), best price first and in
+        insertion order within a price.
+
+        The book must not be modified while the iterator is in use.
+        """
+        side = self._sides.get((symbol, is_buy))
+        if not side:
+            return
+        if is_buy:
+            for key in _descending(side, bisect_left(side, (limit,))):
+                yield key[2]
+        else:
+            for key in side[:bisect_right(side, (limit, float("inf")))]:
+                yield key[2]
+
+    def reached(self, symbol: Symbol, is_buy: bool, price: float) -> list[tuple[float, int]]:
+        """
+        Get (price, order_id) of the entries on one side of symbol that a move to price
+        has reached, used when the book indexes stop triggers: buys priced at or below
+        price, lowest first, and sells priced at or above it, highest first. Entries
+        with equal prices are in insertion order.
+        """
+        side = self._sides.get((symbol, is_buy))
+        if not side:
+            return []
+        if is_buy:
+            keys = side[:bisect_right(side, (price, float("inf")))]
+        else:
+            keys = _descending(side, bisect_left(side, (price,)))
+        return [(key[0], key[2]) for key in keys]
+
+
+def _descending(side: list[tuple[float, int, int]], stop: int) -> Iterator[tuple[float, int, int]]:
+    """
+    Yield the keys of side from the end down to index stop, highest price first but
+    in insertion order within a price.
+    """
+    end = len(side)
+    while end > stop:
+        start = bisect_left(side, (side[end - 1][0],), stop, end)
+        yield from side[start:end]
+        end = start
@@ -1,18 +1,97 @@
-from dataclasses import asdict
-from copy import deepcopy
-from trading.types import Order, OrderStatus, Symbol, BalanceType, OrderType
+import dataclasses
+import math
+from dataclasses import dataclass
+from enum import Enum
+from fractions import Fraction
+from typing import Callable, Iterable
+from trading.types import Order, OrderStatus, Symbol, BalanceType, OrderType, Fill, FixedPoint
+from trading.mock_exchange.book import OrderBook
+from trading.mock_exchange.history import OrderHistory, HistoryPage
+from trading.mock_exchange.liquidity import LiquidityModel
+from trading.mock_exchange.positions import PositionLedger
+from trading.mock_exchange.intrabar import CandleLike, IntrabarPath, intrabar_prices
+
+
+BALANCE_TYPES = {
+    OrderType.LIMIT: BalanceType.MARGIN,
+    OrderType.MARKET: BalanceType.MARGIN,
+    OrderType.STOP_LIMIT: BalanceType.MARGIN,
+    OrderType.STOP: BalanceType.MARGIN,
+    OrderType.EXCHANGE_LIMIT: BalanceType.EXCHANGE,
+    OrderType.EXCHANGE_MARKET: BalanceType.EXCHANGE,
+    OrderType.EXCHANGE_STOP: BalanceType.EXCHANGE,
+    OrderType.EXCHANGE_STOP_LIMIT: BalanceType.EXCHANGE,
+}
+TAKER_TYPES = {OrderType.MARKET, OrderType.STOP, OrderType.EXCHANGE_MARKET, OrderType.EXCHANGE_STOP}
+LIMIT_TYPES = {OrderType.LIMIT, OrderType.EXCHANGE_LIMIT}
+STOP_LIMIT_TYPES = {OrderType.STOP_LIMIT, OrderType.EXCHANGE_STOP_LIMIT}
+STOP_TYPES = {OrderType.STOP, OrderType.EXCHANGE_STOP} | STOP_LIMIT_TYPES
+
+
+class EngineEventType(str, Enum):
+    SUBMIT = "submit"
+    CANCEL = "cancel"
+    EXECUTE = "execute"
+    FILL = "fill"
+    PRICE = "price"
+
+    def __str__(self):
+        return self.value
+
+
+@dataclass(frozen=True, slots=True)
+class EngineEvent:
+    """
+    Dataclass representing a change in the engine, passed to engine listeners.
+    Fill events carry the Fill, emitted as it happens and before the execute event
+    of its order.
+    """
+    type: EngineEventType
+    mts: int
+    symbol: Symbol
+    orders: tuple[Order, ...] = ()
+    price: float | None = None
+    fill: Fill | None = None
 
 
 class TradeEngine:
+    """
+    In memory matching engine of the mock exchange.
+
+    By default every order crossed by a price move executes in full at its own price.
+    Given a LiquidityModel, the engine matches more like a real venue: each tick only
+    has a limited quantity to fill, so orders can be partially filled across ticks,
+    best priced first. Market orders and limit orders priced through the market
+    execute on submission as takers, at the current price.
+
+    Stop orders wait in a separate trigger index until the price reaches their price,
+    buy stops from below and sell stops from above. A price move is split at every
+    trigger it reaches, so each stop activates at its trigger price, as a market order
+    or, for stop limits, as a limit order at price_aux_limit. Activated stops take
+    what they can at the trigger price right away and rest the remainder in the book.
+
+    Given a FixedPoint, the engine runs in fixed-point mode: prices, quantities and
+    balances are integers in its units, and matching, triggering and settlement use
+    integer arithmetic only, with fees applied as exact fractions and rounded to the
+    nearest balance unit. Use the FixedPoint to convert at the boundaries. Positions
+    and PnL are still reported as floats.
+    """
+
     def __init__(
         self,
         initial_exchange_balance: float = 0,
         initial_margin_balance: float = 0,
         maker_fee: float = 0.001,
-        taker_fee: float = 0.002
+        taker_fee: float = 0.002,
+        liquidity: LiquidityModel | None = None,
+        intrabar_path: IntrabarPath = IntrabarPath.NEAREST,
+        fixed_point: FixedPoint | None = None
     ):
         self.orders: dict[str, Order] = {}
-        self.order_history: list[Order] = []
+        self.book = OrderBook()
+        # pending stop orders keyed by their trigger price
+        self.stops = OrderBook()
+        self.order_history = OrderHistory()
         self.price: dict[Symbol, float] = {}
         self.balance = {
             BalanceType.EXCHANGE: initial_exchange_balance,
@@ -20,43 +99,330 @@ class TradeEngine:
         }
         self.maker_fee = maker_fee
         self.taker_fee = taker_fee
+        self.fixed_point = fixed_point
+        if fixed_point is not None:
+            self._check_integers("Balances", initial_exchange_balance, initial_margin_balance)
+            # decimal fee rates as exact fractions, e.g. 0.001 as 1/1000
+            self._fees = {False: Fraction(str(maker_fee)), True: Fraction(str(taker_fee))}
+        self.liquidity = liquidity
+        self.intrabar_path = intrabar_path
+        # quantity left to fill on the latest tick of each symbol, liquidity mode only
+        self._available: dict[Symbol, float] = {}
+        self.positions = PositionLedger()
+        self._listeners: list[Callable[[EngineEvent], None]] = []
+
+    def add_listener(self, listener: Callable[[EngineEvent], None]):
+        """
+        Add a listener called with an EngineEvent whenever an order is submitted,
+        canceled, filled or executed, and whenever a price is updated. The engine
+        does not keep its fills, listen for fill events to record them.
+        """
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[EngineEvent], None]):
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def _emit(self, event: EngineEvent):
+        for listener in self._listeners:
+            listener(event)
     
-    def add_order(self, order: Order):
+    def add_order(self, order: Order) -> Order:
+        """
+        Submit an order and return its latest state, which differs from order when
+        it executed on submission.
+        """
+        if order.order_type in STOP_LIMIT_TYPES and order.price_aux_limit is None:
+            raise ValueError(f"Stop limit order {order.id} requires price_aux_limit.")
+        if self.fixed_point is not None:
+            self._check_integers(
+                "Order prices and quantity", order.price, order.quantity,
+                *(() if order.price_aux_limit is None else (order.price_aux_limit,))
+            )
+            if not isinstance(order.filled, int):
+                # the default filled is a float zero
+                if not float(order.filled).is_integer():
+                    raise ValueError(f"Filled quantity must be an integer in fixed-point mode. Received {order.filled}.")
+                order = dataclasses.replace(order, filled=int(order.filled))
+        self._unindex(order.id)
         self.orders[order.id] = order
-        self.order_history.append(order)
+        self.order_history.submit(order)
+        if self._listeners:
+            self._emit(EngineEvent(EngineEventType.SUBMIT, order.mts_create, order.symbol, (order,)))
+        if order.order_type in STOP_TYPES and not self._stop_reached(order):
+            self.stops.add(order)
+            return order
+        filled_order = self._place(order, order.mts_create)
+        if filled_order is None:
+            return order
+        if self._listeners:
+            self._emit(EngineEvent(EngineEventType.EXECUTE, order.mts_create, order.symbol, (filled_order,)))
+        return filled_order
+
+    @staticmethod
+    def _check_integers(name: str, *values):
+        if not all(isinstance(value, int) for value in values):
+            raise ValueError(f"{name} must be integers in fixed-point mode. Received {values}.")
+
+    def _clip(self, remaining: float, available: float) -> float:
+        """
+        remaining limited to available in size, with the sign of remaining. Fixed-point
+        engines only fill whole units.
+        """
+        size = abs(remaining)
+        if available < size:
+            size = available if self.fixed_point is None else math.floor(available)
+        return size if remaining > 0 else -size
+
+    def _unindex(self, order_id: int):
+        if order_id in self.book:
+            self.book.remove(order_id)
+        elif order_id in self.stops:
+            self.stops.remove(order_id)
+
+    def _stop_reached(self, order: Order) -> bool:
+        price = self.price.get(order.symbol)
+        if price is None:
+            return False
+        return price >= order.price if order.quantity > 0 else price <= order.price
+
+    def _limit_price(self, order: Order) -> float | None:
+        """
+        Price an active order trades at, None for orders that trade at any price.
+        """
+        if order.order_type in STOP_LIMIT_TYPES:
+            return order.price_aux_limit
+        if order.order_type in TAKER_TYPES:
+            return None
+        return order.price
+
+    def _is_marketable(self, order: Order) -> bool:
+        price = self.price.get(order.symbol)
+        if price is None:
+            return False
+        limit = self._limit_price(order)
+        if limit is None:
+            return True
+        return limit >= price if order.quantity > 0 else limit <= price
+
+    def _place(self, order: Order, mts: int) -> Order | None:
+        """
+        Put an active order to work. A marketable order first fills what it can at
+        the current price, then any remainder rests in the book. Without a liquidity
+        model only activated stops fill right away. Returns the filled snapshot, if any.
+        """
+        filled_order = None
+        if (self.liquidity is not None or order.order_type in STOP_TYPES) and self._is_marketable(order):
+            filled_order = self._take(order, mts)
+            if filled_order is not None:
+                if filled_order.status == OrderStatus.EXECUTED:
+                    return filled_order
+                order = filled_order
+        limit = self._limit_price(order)
+        if limit is None and self.liquidity is not None:
+            # market orders rest ahead of every limit so their remainder keeps filling
+            limit = math.inf if order.quantity > 0 else -math.inf
+        self.book.add(order, limit)
+        return filled_order
+
+    def _take(self, order: Order, mts: int) -> Order | None:
+        """
+        Fill an order as a taker at the current price, as far as liquidity allows.
+        """
+        symbol = order.symbol
+        if self.liquidity is None:
+            available = math.inf
+        else:
+            available = self._available.get(symbol)
+            if available is None:
+                available = self.liquidity.budget(symbol)
+        if available <= 0:
+            return None
+        quantity = self._clip(order.quantity - order.filled, available)
+        if quantity == 0:
+            return None
+        if self.liquidity is not None:
+            self._available[symbol] = available - abs(quantity)
+        filled_order = self._fill(order, quantity, self.price[symbol], mts, taker=True)
+        self.order_history.record(order.id, filled_order.status, mts, filled_order.filled)
+        if filled_order.status == OrderStatus.EXECUTED:
+            self.orders.pop(order.id)
+        else:
+            self.orders[order.id] = filled_order
+        return filled_order
 
     def get_orders(self):
-        return [asdict(order) for order in self.orders.values()]
+        return [order.to_dict() for order in self.orders.values()]
     
+    def get_positions(self) -> dict:
+        """
+        Open positions per symbol and balance type with their PnL, plus account totals.
+        """
+        return self.positions.summary()
+
     def get_order_history(self, ascending: bool = True):
         if ascending:
-            return self.order_history
+            return list(self.order_history)
         else:
-            return reversed(self.order_history)
+            return list(reversed(self.order_history))
+
+    def query_order_history(self, **filters) -> HistoryPage:
+        """
+        Query the order history, see OrderHistory.query for the accepted filters.
+        """
+        return self.order_history.query(**filters)
 
     def remove_order(self, order_id: int, mts: int):
         if order_id in self.orders:
-            canceled_order = deepcopy(self.orders[order_id])
-            canceled_order.mts_update = mts
-            canceled_order.status = OrderStatus.CANCELED
             self.orders.pop(order_id)
-            self.order_history.append(canceled_order)
+            self._unindex(order_id)
+            canceled_order = self.order_history.record(order_id, OrderStatus.CANCELED, mts)
+            if self._listeners:
+                self._emit(EngineEvent(EngineEventType.CANCEL, mts, canceled_order.symbol, (canceled_order,)))
             return canceled_order
 
-    def update_price(self, symbol: Symbol, price: float, mts: int):
-        if len(self.orders) > 0:
-            triggered_orders = self._trigger_orders(symbol, price, mts)
-        else:
-            triggered_orders = []
-        self.price[symbol] = price
+    def update_price(self, symbol: Symbol, price: float, mts: int, volume: float | None = None):
+        triggered_orders = self.apply_price(symbol, price, mts, volume)
         return {
             "mts": mts,
             "symbol": symbol,
             "price": price,
-            "triggered_orders": [asdict(order) for order in triggered_orders]
+            "triggered_orders": [order.to_dict() for order in triggered_orders]
         }
 
-    def _trigger_orders(self, symbol: Symbol, price: float, mts: int):
+    def set_price(self, symbol: Symbol, price: float, mts: int):
+        """
+        Set the price of symbol without triggering any order, e.g. the opening price of
+        a symbol that has no price yet. Positions are marked and listeners see a price
+        event, as for any other price update.
+        """
+        if self.fixed_point is not None:
+            self._check_integers("Prices", price)
+        self.price[symbol] = price
+        self.positions.mark(symbol, price)
+        if self._listeners:
+            self._emit(EngineEvent(EngineEventType.PRICE, mts, symbol, price=price))
+
+    def apply_price(self, symbol: Symbol, price: float, mts: int, volume: float | None = None) -> list[Order]:
+        """
+        Move the price of symbol and return the orders it executed or partially filled.
+        volume is the traded volume behind the tick, used by the liquidity model.
+        """
+        if self.fixed_point is not None:
+            self._check_integers("Prices", price)
+        self._reset_budget(symbol, volume)
+        triggered_orders = self._move_price(symbol, price, mts)
+        if self._listeners:
+            if triggered_orders:
+                self._emit(EngineEvent(EngineEventType.EXECUTE, mts, symbol, tuple(triggered_orders)))
+            self._emit(EngineEvent(EngineEventType.PRICE, mts, symbol, price=price))
+        return triggered_orders
+
+    def update_candle(
+        self,
+        symbol: Symbol,
+        candle: CandleLike,
+        volume: float | None = None,
+        path: IntrabarPath | None = None
+    ):
+        """
+        Move the price of symbol through a candle in one step and return the same
+        shape as update_price, with the close as price.
+
+        The price travels from the open to the close through the high and low, in the
+        order given by path (the engine's intrabar_path by default), so every order
+        the candle's range reaches is triggered. In liquidity mode the candle's volume
+        is shared by the whole path. The first candle of a symbol starts at its open.
+        """
+        triggered_orders = self.apply_candle(symbol, candle, volume, path)
+        return {
+            "mts": candle.timestamp,
+            "symbol": symbol,
+            "price": candle.close,
+            "triggered_orders": [order.to_dict() for order in triggered_orders]
+        }
+
+    def update_candles(
+        self,
+        symbol: Symbol,
+        candles: Iterable[CandleLike],
+        volumes: Iterable[float] | None = None,
+        path: IntrabarPath | None = None
+    ) -> list[dict]:
+        """
+        Apply a sequence of candles of symbol in order, see update_candle.
+        """
+        if volumes is None:
+            return [self.update_candle(symbol, candle, None, path) for candle in candles]
+        return [
+            self.update_candle(symbol, candle, volume, path)
+            for candle, volume in zip(candles, volumes, strict=True)
+        ]
+
+    def apply_candle(
+        self,
+        symbol: Symbol,
+        candle: CandleLike,
+        volume: float | None = None,
+        path: IntrabarPath | None = None
+    ) -> list[Order]:
+        """
+        Move the price of symbol through a candle and return the orders it executed or
+        partially filled. Listeners see one execute event and one price event at the close.
+        """
+        mts = candle.timestamp
+        if self.fixed_point is not None:
+            self._check_integers("Candle prices", candle.open, candle.high, candle.low, candle.close)
+        prices = intrabar_prices(candle, self.intrabar_path if path is None else path)
+        if symbol not in self.price:
+            self.price[symbol] = prices.pop(0)
+        self._reset_budget(symbol, volume)
+        triggered_orders = []
+        for price in prices:
+            triggered_orders.extend(self._move_price(symbol, price, mts))
+        if self._listeners:
+            if triggered_orders:
+                self._emit(EngineEvent(EngineEventType.EXECUTE, mts, symbol, tuple(triggered_orders)))
+            self._emit(EngineEvent(EngineEventType.PRICE, mts, symbol, price=candle.close))
+        return triggered_orders
+
+    def _reset_budget(self, symbol: Symbol, volume: float | None):
+        if self.liquidity is not None:
+            self._available[symbol] = self.liquidity.budget(symbol, volume)
+
+    def _move_price(self, symbol: Symbol, price: float, mts: int) -> list[Order]:
+        """
+        Move the price of symbol without notifying listeners, stopping at every stop
+        trigger on the way.
+        """
+        if len(self.orders) == 0:
+            self.price[symbol] = price
+            self.positions.mark(symbol, price)
+            return []
+        prev_price = self._previous_price(symbol, price)
+        triggered_orders = []
+        if price != prev_price:
+            for trigger, order_id in self.stops.reached(symbol, price > prev_price, price):
+                # stops the price had already passed activate where it is now
+                if (trigger - self.price[symbol]) * (price - prev_price) > 0:
+                    triggered_orders.extend(self._cross(symbol, trigger, mts))
+                self.stops.remove(order_id)
+                filled_order = self._place(self.orders[order_id], mts)
+                if filled_order is not None:
+                    triggered_orders.append(filled_order)
+        triggered_orders.extend(self._cross(symbol, price, mts))
+        self.positions.mark(symbol, price)
+        return triggered_orders
+
+    def _cross(self, symbol: Symbol, price: float, mts: int) -> list[Order]:
+        if self.liquidity is None:
+            triggered_orders = self._trigger_orders(symbol, price, mts)
+        else:
+            triggered_orders = self._match_orders(symbol, price, mts)
+        self.price[symbol] = price
+        return triggered_orders
+
+    def _previous_price(self, symbol: Symbol, price: float) -> float:
         prev_price = self.price.get(symbol)
         if prev_price == None:
             raise RuntimeError(
@@ -65,46 +431,106 @@ class TradeEngine:
                 f"symbol={symbol} and price={price}, but previous price was None. "
                 ""
             )
+        return prev_price
+
+    def _trigger_orders(self, symbol: Symbol, price: float, mts: int):
+        prev_price = self._previous_price(symbol, price)
         triggered_orders = []
-        for order in self.orders.values():
-            # TODO: this currently does not consider scenario where limit buy order
-            # is set above the current price (this should execute immediately as a market buy order)
-            if order.symbol == symbol and (
-                prev_price <= order.price <= price
-                or price <= order.price <= prev_price
-            ):
-                executed_order = self._execute_order(order.id, mts)
-                triggered_orders.append(executed_order)
+        # limit orders priced through the market only execute immediately in liquidity mode
+        low, high = (prev_price, price) if prev_price <= price else (price, prev_price)
+        for order_id in self.book.crossed(symbol, low, high):
+            executed_order = self._execute_order(order_id, mts)
+            triggered_orders.append(executed_order)
         for order in triggered_orders:
             self.orders.pop(order.id)
-            self.order_history.append(order)
+            self.book.remove(order.id)
+            self.order_history.record(order.id, order.status, order.mts_update, order.filled)
         return triggered_orders
-    
+
+    def _match_orders(self, symbol: Symbol, price: float, mts: int):
+        """
+        Liquidity mode matching. Orders the move crossed fill as makers at their own
+        price, orders already through the market before the move fill as takers at the
+        new price. Buys and sells fill best price first until the tick's budget is spent.
+        """
+        prev_price = self._previous_price(symbol, price)
+        low, high = (prev_price, price) if prev_price <= price else (price, prev_price)
+        available = self._available[symbol]
+        buys = self.book.marketable(symbol, True, low)
+        sells = self.book.marketable(symbol, False, high)
+        touched_orders = []
+        for order_ids in ((buys, sells) if price <= prev_price else (sells, buys)):
+            for order_id in order_ids:
+                if available <= 0:
+                    break
+                order = self.orders[order_id]
+                limit = self._limit_price(order)
+                maker = limit is not None and low <= limit <= high
+                quantity = self._clip(order.quantity - order.filled, available)
+                if quantity == 0:
+                    break
+                available -= abs(quantity)
+                touched_orders.append(
+                    self._fill(order, quantity, limit if maker else price, mts, taker=not maker)
+                )
+        self._available[symbol] = max(available, 0)
+        for order in touched_orders:
+            if order.status == OrderStatus.EXECUTED:
+                self.orders.pop(order.id)
+                self.book.remove(order.id)
+            else:
+                self.orders[order.id] = order
+            self.order_history.record(order.id, order.status, mts, order.filled)
+        return touched_orders
+
     def _execute_order(self, order_id: int, mts: int):
-        executed_order = deepcopy(self.orders[order_id])
-        executed_order.mts_update = mts
-        executed_order.status = OrderStatus.EXECUTED
-        self.update_balance_with_order(executed_order)
-        return executed_order
+        order = self.orders[order_id]
+        limit = self._limit_price(order)
+        return self._fill(
+            order,
+            order.quantity - order.filled,
+            order.price if limit is None else limit,
+            mts,
+            taker=order.order_type in TAKER_TYPES
+        )
+
+    def _fill(self, order: Order, quantity: float, price: float, mts: int, taker: bool) -> Order:
+        """
+        Fill quantity of order at price, settle it and return the new order snapshot.
+        Filling the whole remaining quantity executes the order.
+        """
+        remaining = order.quantity - order.filled
+        if abs(quantity) >= abs(remaining):
+            quantity = remaining
+            filled, status = order.quantity, OrderStatus.EXECUTED
+        else:
+            filled, status = order.filled + quantity, OrderStatus.PARTIALLY_FILLED
+        self._settle(order.order_type, quantity, price, taker)
+        self.positions.fill(order.symbol, BALANCE_TYPES[order.order_type], quantity, price)
+        if self._listeners:
+            fill = Fill(order.id, order.symbol, order.order_type, mts, quantity, price, taker)
+            self._emit(EngineEvent(EngineEventType.FILL, mts, order.symbol, fill=fill))
+        return order.with_status(status, mts, filled)
     
     def add_balance(self, amount: float, balance_type: BalanceType):
+        if self.fixed_point is not None:
+            self._check_integers("Balance amounts", amount)
         self.balance[balance_type] += amount
         if self.balance[balance_type] < 0:
             raise RuntimeError(f"Balance went below zero, balance = {self.balance[balance_type]}.")
         return self.balance
     
     def update_balance_with_order(self, order: Order):
-        if order.order_type in (OrderType.LIMIT, OrderType.STOP_LIMIT):
-            amount = (-1) * order.price * order.quantity * (1 - self.maker_fee)
-            self.add_balance(amount, BalanceType.MARGIN)
-        elif order.order_type in (OrderType.MARKET, OrderType.STOP):
-            amount = (-1) * order.price * order.quantity * (1 - self.taker_fee)
-            self.add_balance(amount, BalanceType.MARGIN)
-        elif order.order_type in (OrderType.EXCHANGE_LIMIT, OrderType.EXCHANGE_STOP_LIMIT):
-            amount = (-1) * order.price * order.quantity * (1 - self.maker_fee)
-            self.add_balance(amount, BalanceType.EXCHANGE)
-        elif order.order_type in (OrderType.EXCHANGE_MARKET, OrderType.EXCHANGE_STOP):
-            amount = (-1) * order.price * order.quantity * (1 - self.taker_fee)
-            self.add_balance(amount, BalanceType.EXCHANGE)
+        self._settle(order.order_type, order.quantity, order.price, order.order_type in TAKER_TYPES)
+
+    def _settle(self, order_type: OrderType, quantity: float, price: float, taker: bool):
+        balance_type = BALANCE_TYPES.get(order_type)
+        if balance_type is None:
+            raise ValueError(f"Unkown order type '{order_type}'")
+        if self.fixed_point is None:
+            fee = self.taker_fee if taker else self.maker_fee
+            amount = (-1) * price * quantity * (1 - fee)
         else:
-            raise ValueError(f"Unkown order type '{order.order_type}'")
+            notional = price * quantity
+            amount = -notional + round(notional * self._fees[taker])
+        self.add_balance(amount, balance_type)
@@ -0,0 +1,229 @@
+from bisect import bisect_right
+from typing import Iterator
+from trading.types import Order, OrderEvent, OrderStatus, Symbol
+
+
+SEGMENT_SIZE = 4096
+
+
+class HistorySegment:
+    """
+    A fixed size block of consecutive history events, with summaries used to skip
+    the whole block when it cannot match a query.
+    """
+
+    __slots__ = ("start_seq", "events", "mts_min", "mts_max", "symbols", "statuses")
+
+    def __init__(self, start_seq: int):
+        self.start_seq = start_seq
+        self.events: list[OrderEvent] = []
+        self.mts_min: int | None = None
+        self.mts_max: int | None = None
+        self.symbols: set[Symbol] = set()
+        self.statuses: set[OrderStatus] = set()
+
+    def append(self, event: OrderEvent, symbol: Symbol):
+        self.events.append(event)
+        if self.mts_min is None or event.mts < self.mts_min:
+            self.mts_min = event.mts
+        if self.mts_max is None or event.mts > self.mts_max:
+            self.mts_max = event.mts
+        self.symbols.add(symbol)
+        self.statuses.add(event.status)
+
+    def may_contain(
+        self,
+        start: int | None,
+        end: int | None,
+        symbol: Symbol | None,
+        status: OrderStatus | None
+    ) -> bool:
+        return not (
+            (start is not None and self.mts_max < start)
+            or (end is not None and self.mts_min > end)
+            or (symbol is not None and symbol not in self.symbols)
+            or (status is not None and status not in self.statuses)
+        )
+
+
+class HistoryPage:
+    """
+    One page of history query results. next_cursor is None once the query is exhausted.
+    """
+
+    def __init__(self, seqs: list[int], orders: list[Order], next_cursor: int | None):
+        self.seqs = seqs
+        self.orders = orders
+        self.next_cursor = next_cursor
+
+    def to_columns(self) -> dict[str, list]:
+        """
+        Compact columnar form of the page: one list per Order field plus the event seq.
+        """
+        columns = {"seq": self.seqs}
+        for field in Order.__slots__:
+            columns[field] = [getattr(order, field) for order in self.orders]
+        return columns
+
+
+class OrderHistory:
+    """
+    Append-only log of order state changes.
+
+    Each submitted order is stored once, keyed by the sequence number of its submission,
+    and every later state change is recorded as a small OrderEvent delta. Resubmitting
+    an order id stores a new base order, so earlier deltas still apply to the order
+    they were recorded for. Events live in fixed size append-only segments and each
+    one has a sequence number (its position in the log). Reading the history
+    materializes full Order snapshots on demand, so it still behaves like a
+    sequence of orders.
+    """
+
+    def __init__(self, segment_size: int = SEGMENT_SIZE):
+        self.segment_size = segment_size
+        self.segments: list[HistorySegment] = []
+        self._bases: dict[int, Order] = {}
+        # sequence numbers of each order's submissions, its base orders are in _bases
+        self._submit_seqs: dict[int, list[int]] = {}
+        self._seqs_by_order: dict[int, list[int]] = {}
+        self._length = 0
+
+    def _append(self, event: OrderEvent, symbol: Symbol) -> int:
+        seq = self._length
+        if not self.segments or len(self.segments[-1].events) == self.segment_size:
+            self.segments.append(HistorySegment(seq))
+        self.segments[-1].append(event, symbol)
+        self._seqs_by_order.setdefault(event.order_id, []).append(seq)
+        self._length += 1
+        return seq
+
+    def submit(self, order: Order):
+        seq = self._append(OrderEvent(order.id, order.status, order.mts_update, order.filled), order.symbol)
+        self._bases[seq] = order
+        self._submit_seqs.setdefault(order.id, []).append(seq)
+
+    def record(self, order_id: int, status: OrderStatus, mts: int, filled: float | None = None) -> Order:
+        """
+        Record a state change for a submitted order and return the resulting snapshot.
+        filled defaults to the filled quantity of the order's previous event.
+        """
+        if filled is None:
+            filled = self.event(self._seqs_by_order[order_id][-1]).filled
+        event = OrderEvent(order_id, status, mts, filled)
+        seq = self._append(event, self._bases[self._submit_seqs[order_id][-1]].symbol)
+        return self._materialize(seq)
+
+    def _base(self, seq: int) -> Order:
+        """The order as submitted by the latest submission at or before seq."""
+        submit_seqs = self._submit_seqs[self.event(seq).order_id]
+        return self._bases[submit_seqs[bisect_right(submit_seqs, seq) - 1]]
+
+    def _materialize(self, seq: int) -> Order:
+        event = self.event(seq)
+        order = self._base(seq)
+        if order.status == event.status and order.mts_update == event.mts and order.filled == event.filled:
+            return order
+        return order.with_status(event.status, event.mts, event.filled)
+
+    def event(self, seq: int) -> OrderEvent:
+        return self.segments[seq // self.segment_size].events[seq % self.segment_size]
+
+    def iter_events(self) -> Iterator[OrderEvent]:
+        for segment in self.segments:
+            yield from segment.events
+
+    def query(
+        self,
+        start: int | None = None,
+        end: int | None = None,
+        symbol: Symbol | None = None,
+        status: OrderStatus | None = None,
+        order_id: int | None = None,
+        cursor: int | None = None,
+        limit: int = 1000,
+        ascending: bool = True
+    ) -> HistoryPage:
+        """
+        Find history events matching every given filter, one page at a time.
+
+        Queries by order_id go straight to that order's events. Other queries walk
+        the segments in order, skipping any segment whose mts range, symbols or
+        statuses rule it out.
+
+        Args:
+            start (int | None): Minimum event mts (inclusive).
+            end (int | None): Maximum event mts (inclusive).
+            symbol (Symbol | None): Only events for this symbol.
+            status (OrderStatus | None): Only events moving an order into this status.
+            order_id (int | None): Only events for this order.
+            cursor (int | None): next_cursor of the previous page, None for the first page.
+            limit (int): Maximum number of events in the page.
+            ascending (bool): Oldest first when True, newest first otherwise.
+
+        Returns:
+            HistoryPage: The matching orders and their sequence numbers.
+        """
+        if limit <= 0:
+            raise ValueError(f"limit must be greater than zero. Received {limit}.")
+
+        def matches(seq: int) -> bool:
+            event = self.event(seq)
+            return (
+                (start is None or event.mts >= start)
+                and (end is None or event.mts <= end)
+                and (status is None or event.status == status)
+                and (symbol is None or self._base(seq).symbol == symbol)
+                and (order_id is None or event.order_id == order_id)
+            )
+
+        seqs = []
+        for seq in self._candidate_seqs(start, end, symbol, status, order_id, cursor, ascending):
+            if matches(seq):
+                if len(seqs) == limit:
+                    return HistoryPage(seqs, [self._materialize(s) for s in seqs], seq)
+                seqs.append(seq)
+        return HistoryPage(seqs, [self._materialize(s) for s in seqs], None)
+
+    def _candidate_seqs(self, start, end, symbol, status, order_id, cursor, ascending) -> Iterator[int]:
+        if order_id is not None:
+            seqs = self._seqs_by_order.get(order_id, [])
+            if ascending:
+                yield from (seq for seq in seqs if cursor is None or seq >= cursor)
+            else:
+                yield from (seq for seq in reversed(seqs) if cursor is None or seq <= cursor)
+            return
+
+        segments = self.segments if ascending else reversed(self.segments)
+        for segment in segments:
+            segment_end = segment.start_seq + len(segment.events)
+            if cursor is not None and (
+                (ascending and segment_end <= cursor)
+                or (not ascending and segment.start_seq > cursor)
+            ):
+                continue
+            if not segment.may_contain(start, end, symbol, status):
+                continue
+            if ascending:
+                first = max(segment.start_seq, cursor) if cursor is not None else segment.start_seq
+                yield from range(first, segment_end)
+            else:
+                last = min(segment_end - 1, cursor) if cursor is not None else segment_end - 1
+                yield from range(last, segment.start_seq - 1, -1)
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._materialize(seq) for seq in range(*index.indices(self._length))]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("order history index out of range")
+        return self._materialize(index)
+
+    def __iter__(self) -> Iterator[Order]:
+        return (self._materialize(seq) for seq in range(self._length))
+
+    def __reversed__(self) -> Iterator[Order]:
+        return (self._materialize(seq) for seq in range(self._length - 1, -1, -1))
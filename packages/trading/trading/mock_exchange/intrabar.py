@@ -0,0 +1,51 @@
+from enum import Enum
+from typing import Protocol
+
+
+class CandleLike(Protocol):
+    """
+    Anything shaped like candles.types.Candle.
+    """
+    timestamp: int
+    open: float
+    high: float
+    low: float
+    close: float
+
+
+class IntrabarPath(str, Enum):
+    """
+    Enum representing the assumed order of the high and low within a candle.
+
+    OHLC visits the high first, OLHC the low first. NEAREST visits whichever extreme
+    is closer to the open first, breaking ties by the direction of the candle.
+    """
+    OHLC = "OHLC"
+    OLHC = "OLHC"
+    NEAREST = "NEAREST"
+
+    def __str__(self):
+        return self.value
+
+
+def intrabar_prices(candle: CandleLike, path: IntrabarPath = IntrabarPath.NEAREST) -> list[float]:
+    """
+    Get the prices a candle is assumed to move through, from its open to its close.
+    Consecutive duplicates are dropped.
+    """
+    open, high, low, close = candle.open, candle.high, candle.low, candle.close
+    if path == IntrabarPath.OHLC:
+        high_first = True
+    elif path == IntrabarPath.OLHC:
+        high_first = False
+    elif path == IntrabarPath.NEAREST:
+        to_high, to_low = high - open, open - low
+        high_first = to_high < to_low or (to_high == to_low and close < open)
+    else:
+        raise ValueError(f"Unknown intrabar path '{path}'")
+    points = (open, high, low, close) if high_first else (open, low, high, close)
+    prices = [open]
+    for price in points[1:]:
+        if price != prices[-1]:
+            prices.append(price)
+    return prices
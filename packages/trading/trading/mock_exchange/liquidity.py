@@ -0,0 +1,31 @@
+import math
+from trading.types import Symbol
+
+
+class LiquidityModel:
+    """
+    Synthetic liquidity for the TradeEngine's matching.
+
+    Each price tick makes participation * volume of its symbol available to fill, where
+    volume is the traded volume behind the tick (e.g. the candle volume). Orders on
+    both sides share that budget. Ticks without a volume use default_volume, and the
+    default of infinity fills every matched order in full.
+    """
+
+    def __init__(self, participation: float = 0.1, default_volume: float = math.inf):
+        if not 0 < participation <= 1:
+            raise ValueError(
+                f"participation must be in (0, 1]. Received {participation}."
+            )
+        if default_volume < 0:
+            raise ValueError(
+                f"default_volume must be greater than or equal to zero. Received {default_volume}."
+            )
+        self.participation = participation
+        self.default_volume = default_volume
+
+    def budget(self, symbol: Symbol, volume: float | None = None) -> float:
+        """
+        Quantity that orders for symbol can fill on a tick with the given volume.
+        """
+        return self.participation * (self.default_volume if volume is None else volume)
@@ -0,0 +1,77 @@
+import asyncio
+from fastapi.encoders import jsonable_encoder
+from trading.mock_exchange.engine import EngineEvent, EngineEventType
+from trading.mock_exchange.response import OrderResponse
+from trading.types import Symbol, OrderNotifStatus
+
+
+class Subscription:
+    """
+    A single client's queue of engine events, filtered by symbol. An empty
+    symbol filter receives every symbol.
+    """
+
+    def __init__(self, symbols: set[Symbol] | None = None, max_pending: int = 10_000):
+        self.symbols: set[Symbol] = set(symbols or ())
+        self.queue: asyncio.Queue[EngineEvent] = asyncio.Queue(maxsize=max_pending)
+        self.overflowed = False
+
+    def accepts(self, event: EngineEvent) -> bool:
+        return not self.symbols or event.symbol in self.symbols
+
+    def push(self, event: EngineEvent):
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+
+class NotificationHub:
+    """
+    Fans engine events out to subscribed clients.
+
+    publish is registered as a TradeEngine listener and only enqueues events, so the
+    engine never waits on slow clients. Subscribers that fall more than max_pending
+    events behind are flagged as overflowed and should be disconnected.
+    """
+
+    def __init__(self):
+        self.subscriptions: list[Subscription] = []
+
+    def subscribe(self, symbols: set[Symbol] | None = None, max_pending: int = 10_000) -> Subscription:
+        subscription = Subscription(symbols, max_pending)
+        self.subscriptions.append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        if subscription in self.subscriptions:
+            self.subscriptions.remove(subscription)
+
+    def publish(self, event: EngineEvent):
+        for subscription in self.subscriptions:
+            if subscription.accepts(event):
+                subscription.push(event)
+
+
+def to_message(event: EngineEvent) -> dict:
+    """
+    Convert an event to its notification message. Order events carry an
+    OrderResponse, fill events the fields of the Fill and price events the same
+    fields as a price update.
+    """
+    if event.type == EngineEventType.FILL:
+        return {"type": str(event.type), "data": jsonable_encoder(event.fill)}
+    if event.type == EngineEventType.PRICE:
+        return {
+            "type": str(event.type),
+            "data": {"mts": event.mts, "symbol": event.symbol, "price": event.price}
+        }
+    return {
+        "type": str(event.type),
+        "data": OrderResponse(
+            mts=event.mts,
+            data=list(event.orders),
+            status=OrderNotifStatus.SUCCESS,
+            text=""
+        ).model_dump(mode="json")
+    }
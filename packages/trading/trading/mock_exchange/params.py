@@ -1,5 +1,6 @@
 from pydantic import BaseModel, model_validator
 from trading.types import Symbol, OrderType, BalanceType
+from trading.mock_exchange.intrabar import IntrabarPath
 
 
 class OrderParams(BaseModel):
@@ -8,6 +9,17 @@ class OrderParams(BaseModel):
     price: float
     order_type: OrderType
     mts: int = 0
+    # limit price of stop limit orders, price is their trigger
+    price_aux_limit: float | None = None
+
+    @model_validator(mode="after")
+    def stop_limit_has_aux_limit(self):
+        if (
+            self.order_type in (OrderType.STOP_LIMIT, OrderType.EXCHANGE_STOP_LIMIT)
+            and self.price_aux_limit is None
+        ):
+            raise ValueError(f"price_aux_limit is required for {self.order_type.value} orders.")
+        return self
 
 
 class CancelParams(BaseModel):
@@ -18,6 +30,33 @@ class UpdatePriceParams(BaseModel):
     symbol: Symbol
     price: float
     mts: int = 0
+    # traded volume behind the price, only used by engines with a liquidity model
+    volume: float | None = None
+
+
+class UpdateCandleParams(BaseModel):
+    symbol: Symbol
+    open: float
+    high: float
+    low: float
+    close: float
+    mts: int = 0
+    volume: float | None = None
+    # intrabar path override, the engine default is used when omitted
+    path: IntrabarPath | None = None
+
+    @property
+    def timestamp(self) -> int:
+        return self.mts
+
+    @model_validator(mode="after")
+    def high_and_low_bound_the_candle(self):
+        if not self.low <= min(self.open, self.close) <= max(self.open, self.close) <= self.high:
+            raise ValueError(
+                f"Candle must satisfy low <= open, close <= high. Received open={self.open}, "
+                f"high={self.high}, low={self.low}, close={self.close}."
+            )
+        return self
 
 
 class DepositParams(BaseModel):
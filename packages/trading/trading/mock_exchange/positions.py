@@ -0,0 +1,112 @@
+import math
+from trading.types import Symbol, BalanceType
+
+
+class Position:
+    """
+    Open quantity of one symbol on one balance, with its average entry price and PnL.
+    PnL is measured before fees, which are settled on the balances.
+    """
+
+    __slots__ = (
+        "symbol", "balance_type", "quantity", "avg_price", "mark_price", "realized_pnl", "unrealized_pnl"
+    )
+
+    def __init__(self, symbol: Symbol, balance_type: BalanceType):
+        self.symbol = symbol
+        self.balance_type = balance_type
+        self.quantity = 0.0
+        self.avg_price = 0.0
+        self.mark_price = 0.0
+        self.realized_pnl = 0.0
+        self.unrealized_pnl = 0.0
+
+    @property
+    def exposure(self) -> float:
+        """Signed value of the position at the mark price."""
+        return self.quantity * self.mark_price
+
+    def fill(self, quantity: float, price: float):
+        """
+        Apply a fill of quantity (positive buys, negative sells) at price. Reducing the
+        position realizes PnL against the average entry price, increasing it moves the
+        average entry price. A fill that flips the position opens the rest at price.
+        A zero quantity fill, e.g. of a zero quantity order, changes nothing.
+        """
+        if quantity == 0:
+            return
+        position = self.quantity
+        if position == 0 or (position > 0) == (quantity > 0):
+            self.avg_price = (self.avg_price * position + price * quantity) / (position + quantity)
+        else:
+            closed = min(abs(quantity), abs(position))
+            self.realized_pnl += (price - self.avg_price) * closed * (1 if position > 0 else -1)
+            if abs(quantity) > abs(position):
+                self.avg_price = price
+            elif abs(quantity) == abs(position):
+                self.avg_price = 0.0
+        self.quantity = position + quantity
+        self.mark(price)
+
+    def mark(self, price: float):
+        self.mark_price = price
+        self.unrealized_pnl = (price - self.avg_price) * self.quantity
+
+    def to_dict(self) -> dict:
+        return {field: getattr(self, field) for field in self.__slots__} | {"exposure": self.exposure}
+
+
+class PositionLedger:
+    """
+    Positions per symbol and balance type, kept up to date fill by fill and tick by tick.
+
+    Every fill or mark only updates the positions it touches. Totals are summed from
+    the positions with math.fsum when read, so they cost one pass over the positions,
+    never over the fills, and do not drift from the positions however long the run.
+    """
+
+    def __init__(self):
+        self.positions: dict[tuple[Symbol, BalanceType], Position] = {}
+        self._by_symbol: dict[Symbol, list[Position]] = {}
+
+    def get(self, symbol: Symbol, balance_type: BalanceType) -> Position:
+        """Get the position, creating a flat one if needed."""
+        position = self.positions.get((symbol, balance_type))
+        if position is None:
+            position = Position(symbol, balance_type)
+            self.positions[(symbol, balance_type)] = position
+            self._by_symbol.setdefault(symbol, []).append(position)
+        return position
+
+    def fill(self, symbol: Symbol, balance_type: BalanceType, quantity: float, price: float):
+        self.get(symbol, balance_type).fill(quantity, price)
+
+    def mark(self, symbol: Symbol, price: float):
+        """Mark every position of symbol to price."""
+        for position in self._by_symbol.get(symbol, ()):
+            position.mark(price)
+
+    @property
+    def realized_pnl(self) -> float:
+        return math.fsum(position.realized_pnl for position in self.positions.values())
+
+    @property
+    def unrealized_pnl(self) -> float:
+        return math.fsum(position.unrealized_pnl for position in self.positions.values())
+
+    @property
+    def net_exposure(self) -> float:
+        return math.fsum(position.exposure for position in self.positions.values())
+
+    @property
+    def gross_exposure(self) -> float:
+        return math.fsum(abs(position.exposure) for position in self.positions.values())
+
+    def summary(self) -> dict:
+        return {
+            "positions": [position.to_dict() for position in self.positions.values()],
+            "realized_pnl": self.realized_pnl,
+            "unrealized_pnl": self.unrealized_pnl,
+            "net_exposure": self.net_exposure,
+            "gross_exposure": self.gross_exposure,
+        }
@@ -0,0 +1,173 @@
+from array import array
+from dataclasses import dataclass
+from itertools import count
+from typing import Callable, Iterable, Sequence
+from trading.mock_exchange.engine import EngineEvent, EngineEventType, TradeEngine
+from trading.types import Order, OrderStatus, OrderType, Symbol, BalanceType, Fill
+
+
+@dataclass(frozen=True, slots=True)
+class OrderIntent:
+    """
+    Dataclass representing an order to submit during a simulation. The order
+    becomes active before the first price tick with a timestamp >= mts.
+    """
+    mts: int
+    symbol: Symbol
+    amount: float
+    price: float
+    order_type: OrderType
+    price_aux_limit: float | None = None
+
+
+class SimulationResult:
+    """
+    Columnar results of a simulation run.
+
+    fills holds one row per fill, so a partially filled order can have several rows.
+    Order ids are kept in a list, since engines shared with the HTTP API use ids that
+    do not fit in 64 bits.
+    balances holds one row per tick that filled at least one order, with the balances
+    after that tick. Runs of a fixed-point engine record quantities, prices and
+    balances as integer columns in the engine's units.
+    """
+
+    def __init__(self, fixed: bool = False):
+        values = "q" if fixed else "d"
+        self.fills = {
+            "mts": array("q"),
+            "order_id": [],
+            "symbol": [],
+            "order_type": [],
+            "quantity": array(values),
+            "price": array(values),
+        }
+        self.balances = {
+            "mts": array("q"),
+            BalanceType.EXCHANGE: array(values),
+            BalanceType.MARGIN: array(values),
+        }
+
+    def _record(self, mts: int, new_fills: list[Fill], balance: dict):
+        fills = self.fills
+        for fill in new_fills:
+            fills["mts"].append(fill.mts)
+            fills["order_id"].append(fill.order_id)
+            fills["symbol"].append(fill.symbol)
+            fills["order_type"].append(fill.order_type)
+            fills["quantity"].append(fill.quantity)
+            fills["price"].append(fill.price)
+        self.balances["mts"].append(mts)
+        self.balances[BalanceType.EXCHANGE].append(balance[BalanceType.EXCHANGE])
+        self.balances[BalanceType.MARGIN].append(balance[BalanceType.MARGIN])
+
+
+Strategy = Callable[[int, Symbol, float, list[Order]], Iterable[OrderIntent] | None]
+
+
+class Simulation:
+    """
+    Drives a TradeEngine in process, without the HTTP layer of the mock exchange.
+
+    Order ids are assigned sequentially so runs are reproducible. They start after the
+    largest integer id among the engine's orders, so an engine that already holds
+    orders, e.g. one shared with the HTTP API, never has them replaced.
+    """
+
+    def __init__(self, engine: TradeEngine | None = None):
+        self.engine = engine or TradeEngine()
+        ids = [order_id for order_id in self.engine.orders if isinstance(order_id, int)]
+        self._order_ids = count(max(ids, default=0) + 1)
+
+    def submit(self, intent: OrderIntent) -> Order:
+        order = Order(
+            id=next(self._order_ids),
+            symbol=intent.symbol,
+            mts_create=intent.mts,
+            mts_update=intent.mts,
+            quantity=intent.amount,
+            order_type=intent.order_type,
+            price=intent.price,
+            status=OrderStatus.ACTIVE,
+            price_aux_limit=intent.price_aux_limit
+        )
+        self.engine.add_order(order)
+        return order
+
+    def run(
+        self,
+        mts: Sequence[int],
+        symbols: Sequence[Symbol],
+        prices: Sequence[float],
+        intents: Iterable[OrderIntent] = (),
+        strategy: Strategy | None = None,
+        volumes: Sequence[float] | None = None
+    ) -> SimulationResult:
+        """
+        Replay a price stream through the engine.
+
+        The stream is given as three equal length columns, ordered by mts. The first
+        tick of a symbol only sets its price, later ticks trigger the orders they cross.
+        With a fixed-point engine, prices and intents are in its integer units; convert
+        float columns with its FixedPoint, e.g. engine.fixed_point.prices(prices).
+
+        Args:
+            mts (Sequence[int]): Tick timestamps.
+            symbols (Sequence[Symbol]): Tick symbols.
+            prices (Sequence[float]): Tick prices.
+            intents (Iterable[OrderIntent]): Orders to submit as the stream reaches their mts.
+            strategy (Strategy | None): Optional callback invoked after every tick with
+                (mts, symbol, price, executed_orders). Intents it returns are submitted
+                immediately.
+            volumes (Sequence[float] | None): Optional traded volume of every tick, the
+                source of liquidity when the engine has a LiquidityModel.
+
+        Returns:
+            SimulationResult: Fills and balances as columns.
+        """
+        if not len(mts) == len(symbols) == len(prices):
+            raise ValueError(
+                f"Price stream columns must have equal lengths. Received "
+                f"mts={len(mts)}, symbols={len(symbols)}, prices={len(prices)}."
+            )
+        if volumes is not None and len(volumes) != len(mts):
+            raise ValueError(
+                f"volumes must have the same length as the price stream. Received "
+                f"volumes={len(volumes)}, mts={len(mts)}."
+            )
+        engine = self.engine
+        result = SimulationResult(fixed=engine.fixed_point is not None)
+        pending = sorted(intents, key=lambda intent: intent.mts)
+        next_intent = 0
+        fills: list[Fill] = []
+
+        def record_fill(event: EngineEvent):
+            if event.type == EngineEventType.FILL:
+                fills.append(event.fill)
+
+        engine.add_listener(record_fill)
+        try:
+            for i, (tick_mts, symbol, price) in enumerate(zip(mts, symbols, prices)):
+                while next_intent < len(pending) and pending[next_intent].mts <= tick_mts:
+                    self.submit(pending[next_intent])
+                    next_intent += 1
+
+                if symbol in engine.price:
+                    executed = engine.apply_price(
+                        symbol, price, tick_mts, None if volumes is None else volumes[i]
+                    )
+                else:
+                    engine.set_price(symbol, price, tick_mts)
+                    executed = []
+
+                if strategy is not None:
+                    for intent in strategy(tick_mts, symbol, price, executed) or ():
+                        self.submit(intent)
+
+                if fills:
+                    result._record(tick_mts, fills, engine.balance)
+                    fills.clear()
+        finally:
+            engine.remove_listener(record_fill)
+
+        return result
@@ -0,0 +1,64 @@
+import asyncio
+from typing import Any, Callable
+from trading.mock_exchange.engine import TradeEngine
+
+
+class EngineWorker:
+    """
+    Single writer for a TradeEngine.
+
+    Every read and write is queued as an operation fn(engine, *args) and applied
+    one at a time by a single asyncio task, in the order it was queued. Callers
+    await the result, so concurrent requests see linearizable engine state without
+    any locking inside the engine.
+    """
+
+    def __init__(self, engine: TradeEngine):
+        self.engine = engine
+        self._queue: asyncio.Queue | None = None
+        self._task: asyncio.Task | None = None
+        self._stopping = False
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done() and not self._stopping
+
+    def start(self):
+        if self.running:
+            raise RuntimeError("EngineWorker is already running.")
+        self._queue = asyncio.Queue()
+        self._stopping = False
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Apply every operation queued so far, then stop the worker."""
+        if not self.running:
+            return
+        # calls made after this point are rejected, so nothing is queued behind the sentinel
+        self._stopping = True
+        await self._queue.put(None)
+        await self._task
+        self._task = None
+
+    async def call(self, fn: Callable[..., Any], *args) -> Any:
+        """Queue fn(engine, *args) and wait for its result."""
+        if not self.running:
+            raise RuntimeError("EngineWorker is not running.")
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((fn, args, future))
+        return await future
+
+    async def _run(self):
+        while True:
+            item = await self._queue.get()
+            if item is None:
+                return
+            fn, args, future = item
+            if future.cancelled():
+                continue
+            try:
+                result = fn(self.engine, *args)
+            except Exception as e:
+                future.set_exception(e)
+            else:
+                future.set_result(result)
@@ -1,5 +1,8 @@
+from array import array
 from enum import Enum
 from dataclasses import dataclass
+from typing import Iterable
+from candles.fixed import from_ticks, to_ticks
 
 
 class OrderType(str, Enum):
@@ -54,10 +57,10 @@ class BalanceType(str, Enum):
         return self.value
     
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Order:
     """
-    Dataclass representing an order.
+    Dataclass representing an order. Orders are immutable, state changes produce a new Order.
     """
     id: int
     symbol: Symbol
@@ -67,5 +70,111 @@ class Order:
     order_type: OrderType
     price: float
     status: OrderStatus
+    # filled part of quantity, with the same sign
+    filled: float = 0.0
+    # limit price of stop limit orders, price is their trigger
+    price_aux_limit: float | None = None
+
+    def with_status(self, status: OrderStatus, mts: int, filled: float | None = None) -> "Order":
+        """
+        Return a copy of the order moved to a new status at mts, optionally with a
+        new filled quantity.
+        """
+        return Order(
+            self.id,
+            self.symbol,
+            self.mts_create,
+            mts,
+            self.quantity,
+            self.order_type,
+            self.price,
+            status,
+            self.filled if filled is None else filled,
+            self.price_aux_limit
+        )
+
+    def to_dict(self) -> dict:
+        """
+        Shallow equivalent of dataclasses.asdict, all fields are flat values.
+        """
+        return {field: getattr(self, field) for field in self.__slots__}
+
+
+@dataclass(frozen=True, slots=True)
+class OrderEvent:
+    """
+    Dataclass representing a change of an order's status at a point in time.
+    """
+    order_id: int
+    status: OrderStatus
+    mts: int
+    filled: float = 0.0
+
+
+@dataclass(frozen=True, slots=True)
+class Fill:
+    """
+    Dataclass representing one execution of part or all of an order. quantity has
+    the sign of the order, taker is False when the order provided the liquidity.
+    """
+    order_id: int
+    symbol: Symbol
+    order_type: OrderType
+    mts: int
+    quantity: float
+    price: float
+    taker: bool
+
+
+@dataclass(frozen=True, slots=True)
+class FixedPoint:
+    """
+    Integer units of a TradeEngine in fixed-point mode: prices in ticks of
+    10^-price_decimals, quantities in units of 10^-quantity_decimals, and balances in
+    units of their product, 10^-(price_decimals + quantity_decimals), so the notional
+    of a fill is exactly price * quantity.
+
+    The plural methods convert whole columns at the boundaries of the engine. Prices
+    and quantities must lie on their grid, balances are rounded to the nearest unit.
+    """
+    price_decimals: int
+    quantity_decimals: int
+
+    def __post_init__(self):
+        if self.price_decimals < 0 or self.quantity_decimals < 0:
+            raise ValueError(
+                f"Decimals must be at least 0. Received price_decimals={self.price_decimals}, "
+                f"quantity_decimals={self.quantity_decimals}."
+            )
+
+    @property
+    def balance_decimals(self) -> int:
+        return self.price_decimals + self.quantity_decimals
+
+    def prices(self, values: Iterable[float]) -> array:
+        return to_ticks(values, self.price_decimals)
+
+    def quantities(self, values: Iterable[float]) -> array:
+        return to_ticks(values, self.quantity_decimals)
+
+    def balances(self, values: Iterable[float]) -> array:
+        return to_ticks(values, self.balance_decimals, exact=False)
+
+    def to_prices(self, units: Iterable[int]) -> array:
+        return from_ticks(units, self.price_decimals)
+
+    def to_quantities(self, units: Iterable[int]) -> array:
+        return from_ticks(units, self.quantity_decimals)
+
+    def to_balances(self, units: Iterable[int]) -> array:
+        return from_ticks(units, self.balance_decimals)
+
+    def price(self, value: float) -> int:
+        return self.prices((value,))[0]
+
+    def quantity(self, value: float) -> int:
+        return self.quantities((value,))[0]
+
+    def balance(self, value: float) -> int:
+        return self.balances((value,))[0]
 
-    
\ No newline at end of file